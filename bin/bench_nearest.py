@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+'''
+Compares nearest siren lookups through the in-process grid index against
+PostgreSQL.
+
+The SQL path uses a temporary table with a GiST index on the same point
+expression as ix_siren_locations_satellite_point, ordered by haversine
+distance among the candidates of a k-nearest-neighbour index scan. It is
+skipped when no database URL is given.
+
+Usage: python bin/bench_nearest.py [points] [queries] [database_url]
+'''
+import sys
+import time
+
+import numpy as np
+
+from sirendb.lib.spatial.grid import GridIndex
+
+K = 10
+# Candidates fetched through the index before sorting by real distance.
+SQL_CANDIDATES = 100
+
+SQL_NEAREST = '''
+SELECT id, siren_id FROM (
+    SELECT id, siren_id, latitude, longitude
+    FROM bench_locations
+    ORDER BY point(longitude, latitude) <-> point(%(longitude)s, %(latitude)s)
+    LIMIT %(candidates)s
+) AS candidates
+ORDER BY 2 * 6371.0088 * asin(sqrt(least(1,
+    power(sin(radians(latitude - %(latitude)s) / 2), 2) +
+    cos(radians(latitude)) * cos(radians(%(latitude)s)) *
+    power(sin(radians(longitude - %(longitude)s) / 2), 2)
+)))
+LIMIT %(k)s
+'''
+
+
+def _make_points(count: int):
+    # Roughly the contiguous United States, where most sirens are.
+    rng = np.random.default_rng(0)
+    latitudes = rng.uniform(24.5, 49.5, count)
+    longitudes = rng.uniform(-124.8, -66.9, count)
+    return np.arange(count), latitudes, longitudes
+
+
+def _make_queries(count: int):
+    rng = np.random.default_rng(1)
+    return list(zip(rng.uniform(24.5, 49.5, count), rng.uniform(-124.8, -66.9, count)))
+
+
+def _bench_grid(location_ids, latitudes, longitudes, queries):
+    started_at = time.perf_counter()
+    grid = GridIndex(location_ids, location_ids, latitudes, longitudes)
+    built_in = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for latitude, longitude in queries:
+        grid.nearest(latitude, longitude, K)
+    elapsed = (time.perf_counter() - started_at) / len(queries)
+
+    print(f'grid       built in {built_in:6.2f} s, {elapsed * 1000:8.3f} ms/query')
+
+
+def _bench_sql(database_url, location_ids, latitudes, longitudes, queries):
+    import io
+
+    import psycopg2
+
+    connection = psycopg2.connect(database_url)
+    cursor = connection.cursor()
+    cursor.execute(
+        'CREATE TEMPORARY TABLE bench_locations ('
+        'id integer PRIMARY KEY, siren_id integer, latitude double precision, longitude double precision)'
+    )
+
+    rows = io.StringIO()
+    for location_id, latitude, longitude in zip(location_ids, latitudes, longitudes):
+        rows.write(f'{location_id}\t{location_id}\t{latitude}\t{longitude}\n')
+    rows.seek(0)
+    cursor.copy_from(rows, 'bench_locations')
+
+    started_at = time.perf_counter()
+    cursor.execute('CREATE INDEX ON bench_locations USING gist (point(longitude, latitude))')
+    cursor.execute('ANALYZE bench_locations')
+    built_in = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for latitude, longitude in queries:
+        cursor.execute(SQL_NEAREST, {
+            'latitude': float(latitude),
+            'longitude': float(longitude),
+            'candidates': SQL_CANDIDATES,
+            'k': K,
+        })
+        cursor.fetchall()
+    elapsed = (time.perf_counter() - started_at) / len(queries)
+
+    print(f'postgresql built in {built_in:6.2f} s, {elapsed * 1000:8.3f} ms/query')
+    connection.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    database_url = sys.argv[3] if len(sys.argv) > 3 else None
+
+    location_ids, latitudes, longitudes = _make_points(count)
+    queries = _make_queries(query_count)
+
+    print(f'{count} points, {query_count} queries, k={K}')
+    _bench_grid(location_ids, latitudes, longitudes, queries)
+
+    if database_url:
+        _bench_sql(database_url, location_ids, latitudes, longitudes, queries)
+
+
+if __name__ == '__main__':
+    main()
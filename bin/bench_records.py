@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+'''
+Compares executing a query resolving rows in to GraphQL dataclasses
+against records, from plan resolution through executor serialization.
+
+Usage: python bin/bench_records.py [rows] [rounds]
+'''
+import gc
+import sys
+import time
+import tracemalloc
+from typing import List
+
+import strawberry
+from strawberry.types.info import Info
+from strawberry.utils.str_converters import to_camel_case
+
+import sirendb.v1  # noqa
+from sirendb.core.strawberry.type_ import (
+    _compile_plan,
+    SchemaTypeMeta,
+)
+from sirendb.models.siren_location import SirenLocation
+from sirendb.v1.types.siren_location import SirenLocationNode
+
+FIELDS = [
+    'id',
+    'satellite_latitude',
+    'satellite_longitude',
+    'satellite_zoom',
+    'street_latitude',
+    'street_longitude',
+    'street_heading',
+    'street_pitch',
+    'street_zoom',
+    'installation_timestamp',
+    'removal_timestamp',
+]
+
+QUERY = '''
+query {
+    sirenLocations {
+        %s
+    }
+}
+''' % '\n        '.join(to_camel_case(field) for field in FIELDS)
+
+
+def _make_rows(count: int):
+    return [
+        SirenLocation(
+            id=index,
+            satellite_latitude=33.9379329,
+            satellite_longitude=-117.275838,
+            satellite_zoom=142.0,
+            street_latitude=40.432241,
+            street_longitude=-96.9300097,
+            street_heading=93.0,
+            street_pitch=43.145,
+            street_zoom=41.4,
+            siren_id=index,
+        )
+        for index in range(count)
+    ]
+
+
+def _make_schema(rows):
+    @strawberry.type
+    class Query:
+        @strawberry.field
+        def siren_locations(self, info: Info) -> List[SirenLocationNode]:
+            return SirenLocationNode.from_sqlalchemy_model(rows, info, FIELDS)
+
+    return strawberry.Schema(query=Query)
+
+
+def _execute(schema):
+    result = schema.execute_sync(QUERY)
+    if result.errors:
+        raise result.errors[0]
+    return result
+
+
+def _measure(schema, records: bool, rounds: int):
+    # Plans are compiled with the mode of their type.
+    SirenLocationNode.Meta.records = records
+    _compile_plan.cache_clear()
+    _execute(schema)
+
+    gc.collect()
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        _execute(schema)
+    elapsed = (time.perf_counter() - started_at) / rounds
+
+    tracemalloc.start()
+    result = _execute(schema)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return elapsed, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    SchemaTypeMeta.resolve_lambdas()
+    schema = _make_schema(_make_rows(count))
+
+    for name, records in (('dataclass', False), ('records', True)):
+        elapsed, peak = _measure(schema, records, rounds)
+        print(f'{name:<10} {elapsed * 1000:8.2f} ms/query {peak / 1024:10.1f} KiB peak ({count} rows)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+from .imaging import (
+    imaging_worker,
+    recapture_missing_media,
+)
+from .indexes import check_indexes
+from .locations import backfill_current_locations
+
+commands = (
+    backfill_current_locations,
+    check_indexes,
+    imaging_worker,
+    recapture_missing_media,
+)
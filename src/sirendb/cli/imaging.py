@@ -0,0 +1,87 @@
+import math
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+import sqlalchemy as sa
+
+from sirendb.core.rq import rq
+from sirendb.jobs.imaging import (
+    CaptureRequest,
+    enqueue_captures,
+)
+from sirendb.models.siren_location import SirenLocation
+from sirendb.models.siren_media import (
+    SirenMedia,
+    SirenMediaType,
+)
+
+
+def _missing_media(media_type: SirenMediaType):
+    return ~sa.exists().where(
+        SirenMedia.location_id == SirenLocation.id,
+        SirenMedia.media_type == media_type,
+    )
+
+
+def missing_captures():
+    '''
+    Yields a CaptureRequest for every image missing from a location that
+    has the coordinates to capture it.
+    '''
+    locations = SirenLocation.query.filter(sa.or_(
+        _missing_media(SirenMediaType.SATELLITE_IMAGE),
+        _missing_media(SirenMediaType.STREET_IMAGE),
+    )).options(
+        sa.orm.selectinload(SirenLocation.media)
+    ).order_by(SirenLocation.id).yield_per(1000)
+
+    for location in locations:
+        media_types = {media.media_type for media in location.media}
+        if location.satellite_coordinates and SirenMediaType.SATELLITE_IMAGE not in media_types:
+            yield CaptureRequest(location.id, SirenMediaType.SATELLITE_IMAGE, location.satellite_coordinates)
+        if location.street_coordinates and SirenMediaType.STREET_IMAGE not in media_types:
+            yield CaptureRequest(location.id, SirenMediaType.STREET_IMAGE, location.street_coordinates)
+
+
+@click.command('recapture-missing-media')
+@click.option('--batch-size', default=32, show_default=True, help='Images captured by each job.')
+@click.option('--queue', default='imaging_bulk', show_default=True, help='Queue to enqueue the jobs on.')
+@with_appcontext
+def recapture_missing_media(batch_size: int, queue: str):
+    '''
+    Enqueues batch capture jobs for every image missing from a location.
+    '''
+    rq_queue = rq.get_queue(queue)
+    requests = list(missing_captures())
+
+    for start in range(0, len(requests), batch_size):
+        batch = requests[start:start + batch_size]
+        enqueue_captures(
+            rq_queue,
+            batch,
+            job_timeout=max(300, 30 * len(batch)),
+            description=f'capture {len(batch)} missing image(s)',
+        )
+
+    click.echo(f'enqueued {len(requests)} capture(s) in {math.ceil(len(requests) / batch_size)} job(s)')
+
+
+# Queues of the imaging worker, in the order they are worked on.
+IMAGING_QUEUES = ('imaging_for_api', 'imaging_bulk')
+
+
+@click.command('imaging-worker')
+@click.option('--burst', is_flag=True, help='Quit once the queues are empty.')
+@click.argument('queues', nargs=-1)
+@with_appcontext
+def imaging_worker(burst: bool, queues: tuple):
+    '''
+    Runs an rq worker for the imaging queues.
+
+    The worker is a SimpleWorker whatever RQ_WORKER_CLASS says, so jobs run
+    in the worker process and the Chrome pool is kept between them.
+    '''
+    rq.worker_class = current_app.config['RQ_WORKER_CLASS'] = 'rq.worker.SimpleWorker'
+    worker = rq.get_worker(*(queues or IMAGING_QUEUES))
+    worker.work(burst=burst)
@@ -0,0 +1,44 @@
+import sys
+
+import click
+from flask.cli import with_appcontext
+
+from sirendb.core.db import db
+from sirendb.core.strawberry.indexes import uncovered_columns
+
+# Sortable or filterable columns deliberately left without an index, or
+# without a B-tree index to sort by, as table.column patterns. Every index
+# slows down writes to its table, so only add to this list when a
+# sequential scan is known to be fine.
+UNINDEXED_COLUMNS = (
+    # Curated catalogs of a few thousand rows at most.
+    'siren_manufacturers.*',
+    'siren_models.*',
+    'siren_systems.*',
+    # Audit timestamps, only sorted by when reviewing recent edits.
+    'sirens.created_timestamp',
+    'sirens.updated_timestamp',
+    'siren_locations.created_timestamp',
+    'siren_locations.updated_timestamp',
+)
+
+
+@click.command('check-indexes')
+@with_appcontext
+def check_indexes():
+    '''
+    Reports sortable or filterable columns that are not covered by an index,
+    other than those in UNINDEXED_COLUMNS.
+    '''
+    with db.engine.connect() as connection:
+        columns = uncovered_columns(connection, allowed=UNINDEXED_COLUMNS)
+
+    if not columns:
+        click.echo('every sortable and filterable column is indexed')
+        return
+
+    for column in columns:
+        click.echo(f'{column.table}.{column.column}: {", ".join(column.usages)}')
+
+    click.echo(f'{len(columns)} column(s) are not covered by an index', err=True)
+    sys.exit(1)
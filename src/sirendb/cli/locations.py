@@ -0,0 +1,16 @@
+import click
+from flask.cli import with_appcontext
+
+from sirendb.core.db import db
+from sirendb.models.siren import update_current_locations
+
+
+@click.command('backfill-current-locations')
+@with_appcontext
+def backfill_current_locations():
+    '''
+    Points every siren at its current location.
+    '''
+    result = db.session.execute(update_current_locations())
+    db.session.commit()
+    click.echo(f'updated {result.rowcount} siren(s)')
@@ -0,0 +1,101 @@
+import hashlib
+from logging import getLogger
+from typing import Optional
+
+from flask import current_app
+import sqlalchemy as sa
+
+from sirendb.core.redis import redis
+
+log = getLogger('sirendb.core.strawberry.count')
+
+# Supported values for PAGINATE_TOTAL_COUNT:
+#   exact:    always run SELECT count(*) (default)
+#   cached:   exact count, cached in redis for PAGINATE_TOTAL_COUNT_TTL seconds
+#   estimate: use the planner's row estimate when it is at least
+#             PAGINATE_ESTIMATE_THRESHOLD rows, otherwise a cached count
+COUNT_MODES = ('exact', 'cached', 'estimate')
+
+
+def _config(key: str, default):
+    return current_app.config.get(key, default)
+
+
+def _estimate_table_rows(query: sa.orm.query.Query, table_name: str) -> Optional[int]:
+    result = query.session.execute(
+        sa.text('SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)'),
+        {'table_name': table_name},
+    ).scalar()
+
+    # reltuples is -1 (or 0 on older servers) for tables that were
+    # never vacuumed or analyzed.
+    if result is None or result <= 0:
+        return None
+    return int(result)
+
+
+def _estimate_query_rows(query: sa.orm.query.Query) -> Optional[int]:
+    connection = query.session.connection()
+    compiled = query.statement.compile(dialect=connection.dialect)
+    result = connection.exec_driver_sql(
+        'EXPLAIN (FORMAT JSON) ' + str(compiled),
+        compiled.params,
+    ).scalar()
+
+    try:
+        return int(result[0]['Plan']['Plan Rows'])
+    except (IndexError, KeyError, TypeError):
+        return None
+
+
+def _cache_key(query: sa.orm.query.Query) -> str:
+    compiled = query.statement.compile(dialect=query.session.connection().dialect)
+    digest = hashlib.sha1(
+        (str(compiled) + repr(sorted(compiled.params.items()))).encode('utf-8')
+    ).hexdigest()
+    return 'paginate_count:' + digest
+
+
+def cached_count(query: sa.orm.query.Query) -> int:
+    key = _cache_key(query)
+    cached = redis.get(key)
+    if cached is not None:
+        return int(cached)
+
+    total = query.count()
+    redis.set(key, total, ex=_config('PAGINATE_TOTAL_COUNT_TTL', 30))
+    return total
+
+
+def estimated_count(query: sa.orm.query.Query, table_name: str) -> Optional[int]:
+    '''
+    Returns the planner's row estimate for query.
+
+    Unfiltered queries use the table statistics directly, anything else
+    is run through EXPLAIN.
+    '''
+    if query.whereclause is None:
+        return _estimate_table_rows(query, table_name)
+    return _estimate_query_rows(query)
+
+
+def count_mode() -> str:
+    mode = _config('PAGINATE_TOTAL_COUNT', 'exact')
+    if mode not in COUNT_MODES:
+        raise RuntimeError(f'PAGINATE_TOTAL_COUNT must be one of {COUNT_MODES}, got {mode!r}')
+    return mode
+
+
+def count_query(query: sa.orm.query.Query, table_name: str) -> int:
+    mode = count_mode()
+
+    if mode == 'exact':
+        return query.count()
+
+    if mode == 'estimate':
+        estimate = estimated_count(query, table_name)
+        if estimate is not None and estimate >= _config('PAGINATE_ESTIMATE_THRESHOLD', 100000):
+            log.debug(f'using estimated count {estimate} for {table_name}')
+            return estimate
+
+    return cached_count(query)
@@ -0,0 +1,135 @@
+import base64
+import binascii
+from datetime import datetime
+from enum import Enum
+import json
+from typing import (
+    Any,
+    Tuple,
+)
+
+from graphql.error.graphql_error import GraphQLError
+import sqlalchemy as sa
+from sqlalchemy.sql.schema import Column
+
+# Integer types by how many bits PostgreSQL stores them in.
+INTEGER_BITS = (
+    (sa.SmallInteger, 16),
+    (sa.BigInteger, 64),
+    (sa.Integer, 32),
+)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+
+def _decode_value(column: Column, value: Any) -> Any:
+    '''
+    Coerces a decoded cursor value to the Python type of its column so that
+    crafted cursors fail here instead of within PostgreSQL.
+    '''
+    if value is None:
+        return None
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    if issubclass(python_type, datetime):
+        return datetime.fromisoformat(value)
+    if issubclass(python_type, Enum):
+        return python_type[value]
+
+    # JSON only has strings, numbers and booleans, and bool is an int.
+    if isinstance(value, bool) != issubclass(python_type, bool):
+        raise ValueError(f'{value!r} is not a {python_type.__name__}')
+    if issubclass(python_type, str):
+        if not isinstance(value, str):
+            raise ValueError(f'{value!r} is not a {python_type.__name__}')
+        return value
+    if not isinstance(value, (int, float, str)):
+        raise ValueError(f'{value!r} is not a {python_type.__name__}')
+    value = python_type(value)
+
+    for integer_type, bits in INTEGER_BITS:
+        if isinstance(column.type, integer_type):
+            if not -2 ** (bits - 1) <= value < 2 ** (bits - 1):
+                raise ValueError(f'{value} is out of range for a {bits} bit integer')
+            break
+
+    return value
+
+
+def encode_cursor(sort_key: str, value: Any, primary_key: Any) -> str:
+    '''
+    Creates an opaque cursor pointing at a row within a sorted collection.
+
+    The cursor keeps the sort it was created for, the value of the sorted
+    column and the row's primary key so that the next page can be found
+    with an index range scan instead of an OFFSET.
+    '''
+    payload = json.dumps([sort_key, _encode_value(value), primary_key], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str, sort_key: str, column: Column, primary_key: Column) -> Tuple[Any, Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        cursor_sort_key, value, primary_key_value = payload
+        value = _decode_value(column, value)
+        primary_key_value = _decode_value(primary_key, primary_key_value)
+    except (binascii.Error, KeyError, TypeError, UnicodeError, ValueError, ArithmeticError):
+        raise GraphQLError('invalid cursor')
+
+    if primary_key_value is None:
+        raise GraphQLError('invalid cursor')
+
+    if cursor_sort_key != sort_key:
+        raise GraphQLError('cursor was created for a different sort order')
+
+    return value, primary_key_value
+
+
+def keyset_predicate(
+    column: Column,
+    primary_key: Column,
+    direction: str,
+    value: Any,
+    primary_key_value: Any,
+    after: bool,
+):
+    '''
+    Filters the rows that sort after (or before) the given cursor position.
+
+    Rows are ordered by (column, primary_key) in the same direction, which
+    lets PostgreSQL compare both with a single row value comparison.
+    PostgreSQL sorts NULL as larger than any other value, so nullable
+    columns need an extra branch for them.
+    '''
+    greater = after == (direction == 'asc')
+
+    if column is primary_key:
+        return primary_key > primary_key_value if greater else primary_key < primary_key_value
+
+    row_value = sa.tuple_(column, primary_key)
+    cursor_value = sa.tuple_(value, primary_key_value)
+
+    if value is None:
+        if greater:
+            return sa.and_(column.is_(None), primary_key > primary_key_value)
+        return sa.or_(
+            column.isnot(None),
+            sa.and_(column.is_(None), primary_key < primary_key_value),
+        )
+
+    if greater:
+        if column.nullable:
+            return sa.or_(row_value > cursor_value, column.is_(None))
+        return row_value > cursor_value
+    return row_value < cursor_value
@@ -7,6 +7,7 @@ from typing import (
     Dict,
     Iterator,
     Optional,
+    Tuple,
     Type,
 )
 
@@ -24,6 +25,17 @@ from .scalars import (
     LimitedStringScalar,
     StringLimitExceeded,
 )
+from .search import (
+    column_operators,
+    FilterOperator,
+    OPERATOR_DESCRIPTIONS,
+    operator_type,
+    trigram_index,
+)
+
+
+# Arguments every paginated field accepts, resolvers may declare more.
+PAGINATED_ARGUMENTS = ('info', 'paginate', 'filter', 'sort')
 
 
 @strawberry.type
@@ -57,7 +69,7 @@ def decl_enum(node: GraphQLField) -> SortingEnum:
     return sorter
 
 
-def make_filters(node: GraphQLField) -> Dict[str, StrawberryField]:
+def make_filters(node: GraphQLField) -> Dict[str, Tuple[StrawberryField, FilterOperator]]:
     filters = {}
 
     sqlalchemy_only_fields = getattr(node.Meta, 'sqlalchemy_only_fields', [])
@@ -67,9 +79,16 @@ def make_filters(node: GraphQLField) -> Dict[str, StrawberryField]:
             if sqlalchemy_only_fields and column.key not in sqlalchemy_only_fields:
                 continue
 
-            if column.type.python_type not in (str, LimitedStringScalar, bool, int):
+            operators = column_operators(column)
+            equality = column.type.python_type in (str, LimitedStringScalar, bool, int)
+            if not equality and not operators:
                 continue
 
+            # String filters accept wildcards anywhere in the expression,
+            # which only a trigram index can serve.
+            if column.type.python_type is str:
+                trigram_index(column)
+
             type_ = column.type.python_type
             description = column.doc
             if description is not None:
@@ -92,14 +111,26 @@ def make_filters(node: GraphQLField) -> Dict[str, StrawberryField]:
                         raise StringLimitExceeded
                     return value
 
-            filters[column.key] = StrawberryField(**{
-                'python_name': column.key,
-                'graphql_name': column.key,
-                'type_': type_,
-                'is_optional': True,
-                'default_value': None,
-                'description': description,
-            })
+            if equality:
+                filters[column.key] = (StrawberryField(**{
+                    'python_name': column.key,
+                    'graphql_name': column.key,
+                    'type_': type_,
+                    'is_optional': True,
+                    'default_value': None,
+                    'description': description,
+                }), FilterOperator(column))
+
+            for operator in operators:
+                field_name = f'{column.key}_{operator}'
+                filters[field_name] = (StrawberryField(**{
+                    'python_name': field_name,
+                    'graphql_name': field_name,
+                    'type_': operator_type(operator, type_),
+                    'is_optional': True,
+                    'default_value': None,
+                    'description': OPERATOR_DESCRIPTIONS[operator].format(column.key),
+                }), FilterOperator(column, operator))
 
     return filters
 
@@ -108,10 +139,12 @@ def make_filter(node: GraphQLField):
     fields = make_filters(node)
     cls_namespce = {
         '__annotations__': {},
+        '__filter_operators__': {},
     }
 
-    for field_name, field_value in fields.items():
+    for field_name, (field_value, filter_operator) in fields.items():
         cls_namespce['__annotations__'][field_name] = field_value.type
+        cls_namespce['__filter_operators__'][field_name] = filter_operator
         cls_namespce[field_name] = field_value
 
     name = node.Meta.name + 'Filter'
@@ -158,6 +191,11 @@ class SchemaFieldRegistry(type):
                 'Make sure you add __endpoints__.'
             )
 
+        # Keep the paginated fields around for introspection, such as
+        # checking that their sort and filter columns are indexed.
+        paginated_fields = {}
+        namespace['__paginated_fields__'] = paginated_fields
+
         for key, value in namespace.items():
             if key.startswith('_'):
                 continue
@@ -172,6 +210,10 @@ class SchemaFieldRegistry(type):
                 # Generate search fields
                 filter_type = make_filter(value.node)
 
+                value.sorter = sorting_enum
+                value.filter_type = filter_type
+                paginated_fields[value.method_name] = value
+
                 # Since Strawberry does not have any support for relays,
                 # we have to implement pagination ourselves. To make things
                 # simple to implement, we override the resolver's annotations
@@ -179,6 +221,13 @@ class SchemaFieldRegistry(type):
                 # dynamically created sorters via enums.
                 def paginated_request(*args, **kwargs):
                     query = value.method(*args, **kwargs)
+
+                    # Any other argument is the resolver's own business.
+                    kwargs = {
+                        key: kwarg
+                        for key, kwarg in kwargs.items()
+                        if key in PAGINATED_ARGUMENTS
+                    }
                     if 'filter' in kwargs:
                         kwargs['filter_'] = kwargs['filter']
                         del kwargs['filter']
@@ -194,6 +243,11 @@ class SchemaFieldRegistry(type):
                 # Make the wrapper impersonate the actual resolver
                 paginated_request.__name__ = value.method_name
                 paginated_request.__annotations__ = {
+                    **{
+                        key: annotation
+                        for key, annotation in value.method.__annotations__.items()
+                        if key not in PAGINATED_ARGUMENTS and key != 'return'
+                    },
                     'info': strawberry.types.info.Info,
                     'paginate': Optional[Paginate],
                     'filter': Optional[filter_type],
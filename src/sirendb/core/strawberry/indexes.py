@@ -0,0 +1,108 @@
+from fnmatch import fnmatchcase
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Set,
+    Tuple,
+)
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.schema import Column
+
+from .field import SchemaFieldRegistry
+
+
+class UncoveredColumn(NamedTuple):
+    table: str
+    column: str
+    # GraphQL fields and whether they sort or filter by the column,
+    # e.g. ('sirenSystems sort', 'sirenSystems filter').
+    usages: Tuple[str, ...]
+
+
+def searchable_columns() -> Iterator[Tuple[Column, str, bool]]:
+    '''
+    Yields every column a paginated field can sort or filter by along with
+    a short description of where it is used and whether it is sorted by.
+    '''
+    for classes in SchemaFieldRegistry.registry.values():
+        for endpoint_classes in classes.values():
+            for cls in endpoint_classes:
+                for field_name, field in getattr(cls, '__paginated_fields__', {}).items():
+                    if field.sorter is not None:
+                        for sort in field.sorter.enum_to_column.values():
+                            yield sort['column'], f'{field_name} sort', True
+
+                    if field.filter_type is not None:
+                        for filter_operator in field.filter_type.__filter_operators__.values():
+                            yield filter_operator.column, f'{field_name} filter', False
+
+
+def leading_index_columns(connection: Connection, sortable: bool = False) -> Dict[str, Set[str]]:
+    '''
+    Maps each table to the columns that lead an index, primary key or
+    unique constraint in the database.
+
+    With sortable, only B-tree indexes are considered since the others,
+    such as GIN trigram indexes, can find rows but not order them.
+    '''
+    inspector = sa.inspect(connection)
+    covered = {}
+
+    for table_name in inspector.get_table_names():
+        columns = covered.setdefault(table_name, set())
+
+        primary_key = inspector.get_pk_constraint(table_name)
+        if primary_key['constrained_columns']:
+            columns.add(primary_key['constrained_columns'][0])
+
+        for constraint in inspector.get_unique_constraints(table_name):
+            if constraint['column_names']:
+                columns.add(constraint['column_names'][0])
+
+        for index in inspector.get_indexes(table_name):
+            if not index['column_names'] or index['column_names'][0] is None:
+                continue
+            # PostgreSQL only reports the access method when it isn't btree.
+            if sortable and index.get('dialect_options', {}).get('postgresql_using', 'btree') != 'btree':
+                continue
+            columns.add(index['column_names'][0])
+
+    return covered
+
+
+def uncovered_columns(connection: Connection, allowed: Iterable[str] = ()) -> List[UncoveredColumn]:
+    '''
+    Lists the sortable or filterable columns that no index leads with, or
+    no B-tree index when sorting by them.
+
+    Boolean columns are skipped since PostgreSQL won't use an index to
+    find half of a table anyway. So are the columns matching one of the
+    allowed ``table.column`` patterns, such as ``siren_systems.*``.
+    '''
+    covered = leading_index_columns(connection)
+    sort_covered = leading_index_columns(connection, sortable=True)
+    allowed = tuple(allowed)
+    usages = {}
+
+    for column, usage, sorted_by in searchable_columns():
+        if column.type.python_type is bool:
+            continue
+        if column.name in (sort_covered if sorted_by else covered).get(column.table.name, ()):
+            continue
+        if any(fnmatchcase(f'{column.table.name}.{column.name}', pattern) for pattern in allowed):
+            continue
+
+        key = (column.table.name, column.name)
+        usages.setdefault(key, [])
+        if usage not in usages[key]:
+            usages[key].append(usage)
+
+    return [
+        UncoveredColumn(table=table, column=column, usages=tuple(usage))
+        for (table, column), usage in sorted(usages.items())
+    ]
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging import getLogger
+import typing
+
+from flask_sqlalchemy import Model
+from sqlalchemy import inspect as sql_inspect
+from sqlalchemy.orm import object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.interfaces import (
+    MANYTOONE,
+    ONETOMANY,
+)
+from sqlalchemy.orm.relationships import RelationshipProperty
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BooleanClauseList
+from sqlalchemy.sql.util import find_tables
+from strawberry.ast import LabelMap
+
+from .selection import (
+    SelectionTree,
+    selection_tree,
+)
+
+log = getLogger('sirendb.core.strawberry.loader')
+
+# Relationships using these strategies are either queried by their
+# resolvers (dynamic) or were explicitly marked to never be loaded.
+SKIPPED_LAZY_STRATEGIES = ('dynamic', 'noload', 'raise', 'raise_on_sql')
+
+_active_loader: ContextVar[typing.Optional[RelationshipLoader]] = ContextVar(
+    'sirendb_relationship_loader', default=None
+)
+
+
+def active_loader() -> typing.Optional[RelationshipLoader]:
+    return _active_loader.get()
+
+
+def batch_load(
+    name: str,
+    row: Model,
+    fetch: typing.Callable[[typing.List[Model]], typing.List[typing.Any]],
+    selection: typing.Optional[SelectionTree] = None,
+) -> typing.Any:
+    '''
+    Resolves row through the active loader's batch, or on its own when
+    nothing is being loaded.
+
+    When the results are rows, selection is what will be resolved from
+    them, and it is loaded for every fetched row at once.
+    '''
+    loader = active_loader()
+    if loader is None:
+        return fetch([row])[0]
+    return loader.batch(name, row, fetch, selection)
+
+
+def _target_criteria(relationship: RelationshipProperty) -> typing.Optional[typing.List[typing.Any]]:
+    '''
+    Returns the conditions of a relationship's join besides its key pair,
+    such as filtering out some of the targets. None is returned when any of
+    them involves the parent's table, these can't be batched by key.
+    '''
+    local_column, remote_column = relationship.local_remote_pairs[0]
+    primaryjoin = relationship.primaryjoin
+
+    clauses = [primaryjoin]
+    if isinstance(primaryjoin, BooleanClauseList) and primaryjoin.operator is operators.and_:
+        clauses = list(primaryjoin.clauses)
+
+    criteria = []
+    for clause in clauses:
+        if clause.compare(local_column == remote_column) or clause.compare(remote_column == local_column):
+            continue
+        if relationship.parent.local_table in find_tables(clause, check_columns=True):
+            return None
+        criteria.append(clause)
+    return criteria
+
+
+class RelationshipLoader:
+    '''
+    Batches relationship loading for a set of rows.
+
+    Instead of letting every row lazy load its relationships one SELECT at
+    a time, the loader collects the keys of every row that has not loaded
+    the requested relationship yet and fetches the targets with a single
+    ``IN (...)`` query. The results are stored on the rows as if SQLAlchemy
+    had loaded them, so later attribute access does not hit the database.
+    '''
+    def __init__(self):
+        self.queries = 0
+        # Every row the loader has seen, by model, so resolvers can batch
+        # their own queries across all of them.
+        self.rows: typing.Dict[type, typing.Dict[int, Model]] = {}
+        self.batches: typing.Dict[typing.Tuple[type, str], typing.Dict[int, typing.Any]] = {}
+
+    @contextmanager
+    def activate(self) -> typing.Iterator[RelationshipLoader]:
+        token = _active_loader.set(self)
+        try:
+            yield self
+        finally:
+            _active_loader.reset(token)
+
+    def prime(self, rows: typing.List[Model], request_document: LabelMap) -> None:
+        self.prime_selection(rows, selection_tree(request_document))
+
+    def prime_selection(self, rows: typing.List[Model], tree: SelectionTree) -> None:
+        for row in rows:
+            if row is not None:
+                self.rows.setdefault(type(row), {})[id(row)] = row
+
+        if not tree:
+            return
+
+        rows_by_model = {}
+        for row in rows:
+            if row is not None:
+                rows_by_model.setdefault(type(row), []).append(row)
+
+        for model, model_rows in rows_by_model.items():
+            mapper = sql_inspect(model, raiseerr=False)
+            if mapper is None:
+                continue
+
+            for key, subtree in tree.items():
+                relationship = mapper.relationships.get(key)
+                if relationship is None or relationship.lazy in SKIPPED_LAZY_STRATEGIES:
+                    continue
+
+                children = self.load(model_rows, relationship)
+                if subtree:
+                    self.prime_selection(children, subtree)
+
+    def batch(
+        self,
+        name: str,
+        row: Model,
+        fetch: typing.Callable[[typing.List[Model]], typing.List[typing.Any]],
+        selection: typing.Optional[SelectionTree] = None,
+    ) -> typing.Any:
+        '''
+        Returns fetch's result for row.
+
+        The first call for a name runs fetch once for every row of the same
+        model the loader has seen and remembers the results, fetch has to
+        return one result per row in the same order. Results may be rows or
+        lists of rows, the selection is then primed for all of them.
+        '''
+        results = self.batches.setdefault((type(row), name), {})
+        if id(row) not in results:
+            rows = [
+                seen
+                for key, seen in self.rows.get(type(row), {}).items()
+                if key not in results
+            ]
+            if not any(seen is row for seen in rows):
+                rows.append(row)
+
+            log.debug(f'batch resolving {type(row).__name__}.{name} for {len(rows)} rows')
+            self.queries += 1
+            fetched = []
+            for seen, result in zip(rows, fetch(rows)):
+                results[id(seen)] = result
+                fetched.extend(result if isinstance(result, list) else [result])
+
+            if selection is not None:
+                self.prime_selection([result for result in fetched if isinstance(result, Model)], selection)
+
+        return results[id(row)]
+
+    def load(self, rows: typing.List[Model], relationship: RelationshipProperty) -> typing.List[Model]:
+        '''
+        Loads relationship for every row then returns the loaded targets.
+        '''
+        pending = []
+        for row in rows:
+            state = sql_inspect(row)
+            if state.persistent and relationship.key in state.unloaded:
+                pending.append(row)
+
+        # Composite keys, association tables and joins on anything but the
+        # key besides conditions on the target fall back to lazy loading.
+        criteria = None
+        if relationship.secondary is None and len(relationship.local_remote_pairs) == 1:
+            criteria = _target_criteria(relationship)
+        if pending and criteria is not None:
+            if relationship.direction is MANYTOONE and not criteria:
+                self._load_many_to_one(pending, relationship)
+            elif relationship.direction is ONETOMANY:
+                self._load_one_to_many(pending, relationship, criteria)
+
+        children = {}
+        for row in rows:
+            value = getattr(row, relationship.key)
+            if value is None:
+                continue
+            for child in (value if isinstance(value, list) else [value]):
+                children[id(child)] = child
+        return list(children.values())
+
+    def _load_many_to_one(self, rows: typing.List[Model], relationship: RelationshipProperty) -> None:
+        local_column, remote_column = relationship.local_remote_pairs[0]
+        local_key = relationship.parent.get_property_by_column(local_column).key
+        target = relationship.mapper
+        remote_key = target.get_property_by_column(remote_column).key
+
+        values = {getattr(row, local_key) for row in rows}
+        values.discard(None)
+
+        session = object_session(rows[0])
+        found = {}
+
+        # Targets already sitting in the identity map do not need a query.
+        if list(target.primary_key) == [remote_column]:
+            for value in list(values):
+                identity_key = target.identity_key_from_primary_key([value])
+                obj = session.identity_map.get(identity_key)
+                if obj is not None and not sql_inspect(obj).expired:
+                    found[value] = obj
+                    values.discard(value)
+
+        if values:
+            log.debug(f'batch loading {relationship} for {len(values)} keys')
+            self.queries += 1
+            query = session.query(target.class_).filter(
+                getattr(target.class_, remote_key).in_(values)
+            )
+            for obj in query:
+                found[getattr(obj, remote_key)] = obj
+
+        for row in rows:
+            set_committed_value(row, relationship.key, found.get(getattr(row, local_key)))
+
+    def _load_one_to_many(
+        self,
+        rows: typing.List[Model],
+        relationship: RelationshipProperty,
+        criteria: typing.Sequence[typing.Any] = (),
+    ) -> None:
+        local_column, remote_column = relationship.local_remote_pairs[0]
+        local_key = relationship.parent.get_property_by_column(local_column).key
+        target = relationship.mapper
+        remote_key = target.get_property_by_column(remote_column).key
+
+        values = {getattr(row, local_key) for row in rows}
+        values.discard(None)
+
+        found = {}
+        if values:
+            log.debug(f'batch loading {relationship} for {len(values)} keys')
+            self.queries += 1
+            session = object_session(rows[0])
+            query = session.query(target.class_).filter(
+                getattr(target.class_, remote_key).in_(values),
+                *criteria,
+            )
+            if relationship.order_by:
+                query = query.order_by(*relationship.order_by)
+            for obj in query:
+                found.setdefault(getattr(obj, remote_key), []).append(obj)
+
+        for row in rows:
+            children = found.get(getattr(row, local_key), [])
+            if relationship.uselist:
+                set_committed_value(row, relationship.key, children)
+            else:
+                set_committed_value(row, relationship.key, children[0] if children else None)
@@ -1,6 +1,5 @@
 from enum import Enum
 import functools
-import re
 from typing import (
     Any,
     Generic,
@@ -16,7 +15,22 @@ from strawberry.field import StrawberryField
 from strawberry.types.info import Info
 import sqlalchemy as sa
 
+from .count import (
+    count_mode,
+    count_query,
+)
+from .cursor import (
+    decode_cursor,
+    encode_cursor,
+    keyset_predicate,
+)
+from .planner import plan_loader_options
 from .scalars import LimitedStringScalar
+from .search import (
+    operator_predicate,
+    search_predicate,
+)
+from .selection import selection_tree
 from .type_ import GraphQLType
 
 
@@ -25,6 +39,9 @@ class PaginatedField:
         self.method = method
         self.method_name = method.__name__
         self.node = node
+        # Set once the field has been registered with a schema.
+        self.sorter = None
+        self.filter_type = None
 
 
 def paginated_field(func=None, node=None):
@@ -39,6 +56,8 @@ def paginated_field(func=None, node=None):
 @strawberry.type
 class PageInfo:
     has_next: bool
+    has_previous: bool
+    first_cursor: Optional[str]
     last_cursor: Optional[str]
 
 
@@ -113,35 +132,6 @@ class SortingEnum:
         return self.enum_to_column['ID_ASC']
 
 
-def wildcard_to_sql(value: str):
-    # TODO: tests tests tests
-    new_str = ''
-
-    for index, char in enumerate(value):
-        if index + 1 < len(value):
-            next_char = value[index + 1]
-        else:
-            next_char = None
-
-        if char == '*':
-            if next_char in ('*', '?'):
-                raise GraphQLError('invalid search expression')
-            new_str += '%'
-            continue
-
-        if char == '?' and next_char == '?':
-            raise GraphQLError('invalid search expression')
-
-        if re.compile(r'[^a-zA-Z0-9\%\*]').search(value):
-            raise GraphQLError('invalid search expression')
-        elif not re.compile(r'[a-zA-Z0-9]').search(value):
-            raise GraphQLError('invalid search expression')
-
-        new_str += char
-
-    return new_str
-
-
 def get_column_by_key(query, name: str):
     for column in query._raw_columns[0].columns:
         if column.key == name:
@@ -156,15 +146,13 @@ class SearchType:
         self.match_one = False
 
     @classmethod
-    def filter_by(self, query, name: str, value: Any, type_: type):
-        if type_ in (LimitedStringScalar, str):
-            expression = wildcard_to_sql(value)
-            if '%' in expression or '?' in expression:
-                column = get_column_by_key(query, name)
-                return query.filter(column.ilike(value))
-            else:
-                return query.filter_by(**{name: value})
-            assert False
+    def filter_by(self, query, name: str, value: Any, type_: type, operator: Optional[str] = None):
+        if operator is not None:
+            column = get_column_by_key(query, name)
+            return query.filter(operator_predicate(column, operator, value))
+        elif type_ in (LimitedStringScalar, str):
+            column = get_column_by_key(query, name)
+            return query.filter(search_predicate(column, value))
         elif isinstance(type_, bool):
             column = get_column_by_key(query, name)
             return query.filter(column.is_(value))
@@ -220,40 +208,121 @@ class Paginated(Generic[T]):
         # query = query.distinct()
 
         if filter_:
+            filter_operators = getattr(filter_type, '__filter_operators__', {})
             for field_name, field_type in filter_.__annotations__.items():
                 field_value = filter_.__dict__[field_name]
-                if field_value is not None:
+                if field_value is None:
+                    continue
+
+                filter_operator = filter_operators.get(field_name)
+                if filter_operator is not None and filter_operator.operator is not None:
+                    query = SearchType.filter_by(
+                        query,
+                        filter_operator.column.key,
+                        field_value,
+                        field_type,
+                        operator=filter_operator.operator,
+                    )
+                else:
                     query = SearchType.filter_by(query, field_name, field_value, field_type)
 
-        if sorting_enum:
-            order_by = getattr(sorting_enum['column'], sorting_enum['direction'])()
-            query = query.order_by(order_by)
+        mapper = sa.inspect(_node.Meta.sqlalchemy_model)
+        primary_key = mapper.primary_key[0]
+        sort_column = sorting_enum['column']
+        direction = sorting_enum['direction']
 
-        total = query.count()
+        ast = ast_from_info(info)
+        field_document = ast.document_python_names[0][1]
+        selection = selection_tree(field_document)
+
+        # Counting the whole filtered set is frequently more expensive than
+        # fetching the page itself, so only do it when somebody needs it.
+        # Without a cursor the filtered set is exactly what the page query
+        # scans, so the count can ride along as a window function.
+        total = None
+        window_total = False
+        if 'total_count' in selection:
+            if count_mode() == 'exact' and not paginate.after and not paginate.before:
+                window_total = True
+            else:
+                total = count_query(query, _node.Meta.sqlalchemy_model.__table__.name)
+
+        # Cursors point at (sort column, primary key) so the next page is
+        # found with a range scan instead of skipping over previous rows.
+        for cursor, after in ((paginate.after, True), (paginate.before, False)):
+            if cursor:
+                value, primary_key_value = decode_cursor(
+                    cursor, sorting_enum['enum_value'], sort_column, primary_key
+                )
+                query = query.filter(keyset_predicate(
+                    column=sort_column,
+                    primary_key=primary_key,
+                    direction=direction,
+                    value=value,
+                    primary_key_value=primary_key_value,
+                    after=after,
+                ))
+
+        # last returns the final items before the cursor, so walk the index
+        # backwards and restore the requested order afterwards.
+        reverse = paginate.last is not None
+        if reverse:
+            direction = 'desc' if direction == 'asc' else 'asc'
+
+        order_by = [getattr(sort_column, direction)()]
+        if sort_column is not primary_key:
+            order_by.append(getattr(primary_key, direction)())
+        query = query.order_by(*order_by)
 
         if paginate.first is not None:
-            query = query.limit(paginate.first)
+            limit = paginate.first
+        elif paginate.last is not None:
+            limit = paginate.last
         else:
-            assert paginate.last is not None
-            query = query.limit(paginate.last)
+            limit = 10
 
-        ast = ast_from_info(info)
-        request_document = ast.document_python_names[0][1]
-        request_document = request_document[request_document.index('items') + 1]
-        data = _node.from_sqlalchemy_model(query.all(), info, request_document)
+        # The extra row tells us whether there is another page.
+        query = query.limit(limit + 1)
+        if window_total:
+            query = query.add_columns(sa.func.count().over().label('total_count'))
 
-        if data:
-            last_data = data[-1]
-            last_cursor = last_data.id
+        if 'items' in selection:
+            request_document = field_document[field_document.index('items') + 1]
+        else:
+            request_document = []
+
+        sort_key = mapper.get_property_by_column(sort_column).key
+        query = query.options(*plan_loader_options(_node, request_document, columns=(sort_key,)))
+        rows = query.all()
+        if window_total:
+            total = rows[0][1] if rows else 0
+            rows = [row for row, _ in rows]
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if reverse:
+            rows.reverse()
+
+        if request_document:
+            data = _node.from_sqlalchemy_model(rows, info, request_document)
         else:
-            last_cursor = None
+            data = []
+
+        def row_cursor(row):
+            return encode_cursor(
+                sorting_enum['enum_value'],
+                getattr(row, sort_key),
+                sa.inspect(row).identity[0],
+            )
 
         return cls(
             items=data,
-            count=len(data),
+            count=len(rows),
             total_count=total,
             page_info=PageInfo(
-                has_next=len(data) > 0 and total > len(data),
-                last_cursor=last_cursor,
+                has_next=bool(paginate.before) if reverse else len(rows) > 0 and has_more,
+                has_previous=has_more if reverse else bool(paginate.after),
+                first_cursor=row_cursor(rows[0]) if rows else None,
+                last_cursor=row_cursor(rows[-1]) if rows else None,
             )
         )
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from logging import getLogger
+import typing
+
+from sqlalchemy import inspect as sql_inspect
+from sqlalchemy.orm import (
+    joinedload,
+    load_only,
+    selectinload,
+)
+from sqlalchemy.orm.strategy_options import Load
+from strawberry.ast import LabelMap
+
+from .loader import SKIPPED_LAZY_STRATEGIES
+from .selection import (
+    SelectionTree,
+    selection_tree,
+)
+from .type_ import (
+    _sqlalchemy_column_required,
+    GraphQLType,
+    table_to_type,
+    type_info_map,
+)
+
+log = getLogger('sirendb.core.strawberry.planner')
+
+
+def plan_loader_options(
+    cls: GraphQLType,
+    request_document: LabelMap,
+    columns: typing.Iterable[str] = (),
+) -> typing.List[Load]:
+    '''
+    Maps a request document onto SQLAlchemy loader options.
+
+    Many-to-one relationships are joined in to the parent's query while
+    collections are fetched with a single SELECT ... IN per relationship.
+    Each level only loads the columns that were requested or that are
+    required to build the GraphQL type, including the columns resolvers
+    declare in Meta.resolver_columns. Additional root columns, such as
+    the ones needed to build cursors, may be passed with columns.
+    '''
+    return _plan(cls, selection_tree(request_document), path=None, seen=(cls,), extra_columns=columns)
+
+
+def _plan(
+    cls: GraphQLType,
+    tree: SelectionTree,
+    path: typing.Optional[Load],
+    seen: typing.Tuple[GraphQLType, ...],
+    extra_columns: typing.Iterable[str] = (),
+) -> typing.List[Load]:
+    model = cls.Meta.sqlalchemy_model
+    mapper = sql_inspect(model)
+    type_info = type_info_map[model.__table__.name]
+
+    options = []
+    columns = {
+        mapper.get_property_by_column(column).key
+        for column in mapper.primary_key
+    }
+    columns.update(extra_columns)
+
+    # Resolvers that run whether or not they were requested still need the
+    # columns they read, types declare those with Meta.resolver_columns.
+    resolver_columns = getattr(cls.Meta, 'resolver_columns', {})
+    for field_name in type_info['with_resolver']:
+        if field_name in tree or _sqlalchemy_column_required(cls, field_name):
+            columns.update(resolver_columns.get(field_name, ()))
+
+    field_names = [key for key, _ in type_info['without_default']]
+    field_names.extend(type_info['with_default'].keys())
+
+    for field_name in field_names:
+        if field_name in type_info['with_resolver']:
+            continue
+
+        requested = field_name in tree
+        if not requested and not _sqlalchemy_column_required(cls, field_name):
+            continue
+
+        if field_name in mapper.column_attrs:
+            columns.add(field_name)
+            continue
+
+        relationship = mapper.relationships.get(field_name)
+        if relationship is None or relationship.lazy in SKIPPED_LAZY_STRATEGIES:
+            continue
+
+        child_cls = table_to_type.get(relationship.target.name)
+        if not requested and child_cls in seen:
+            continue
+
+        for column in relationship.local_columns:
+            columns.add(mapper.get_property_by_column(column).key)
+
+        strategy = selectinload if relationship.uselist else joinedload
+        attribute = getattr(model, field_name)
+        if path is None:
+            child_path = strategy(attribute)
+        else:
+            child_path = getattr(path, strategy.__name__)(attribute)
+
+        if child_cls is None:
+            options.append(child_path)
+            continue
+
+        options.extend(_plan(
+            cls=child_cls,
+            tree=tree.get(field_name) or {},
+            path=child_path,
+            seen=seen + (child_cls,),
+        ))
+
+    # Resolvers may read any column from the row, so only restrict the
+    # columns when none of them were requested.
+    if any(field_name in type_info['with_resolver'] for field_name in tree):
+        if path is not None:
+            options.append(path)
+        return options
+
+    attributes = [getattr(model, column) for column in sorted(columns)]
+    if path is None:
+        options.append(load_only(*attributes))
+    else:
+        options.append(path.load_only(*attributes))
+
+    log.debug(f'planned {cls.Meta.name} columns={sorted(columns)}')
+    return options
@@ -0,0 +1,152 @@
+from datetime import datetime
+import functools
+import re
+from typing import (
+    Any,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from graphql.error.graphql_error import GraphQLError
+import sqlalchemy as sa
+from sqlalchemy.sql.schema import (
+    Column,
+    Index,
+)
+
+WILDCARD_CACHE_SIZE = 1024
+
+# Operators generated in addition to the equality filter, by column type.
+RANGE_OPERATORS = ('gt', 'lt', 'in', 'between', 'is_null')
+STRING_OPERATORS = ('prefix',)
+RANGE_TYPES = (int, float, datetime)
+
+OPERATOR_DESCRIPTIONS = {
+    'gt': 'Only include items where {} is greater than the given value.',
+    'lt': 'Only include items where {} is less than the given value.',
+    'in': 'Only include items where {} is one of the given values.',
+    'between': 'Only include items where {} is within the two given values, inclusive.',
+    'is_null': 'Only include items where {} is (true) or is not (false) null.',
+    'prefix': 'Only include items where {} starts with the given value.',
+}
+
+_INVALID_CHARACTERS = re.compile(r'[^a-zA-Z0-9\%\*]')
+_SEARCHABLE_CHARACTERS = re.compile(r'[a-zA-Z0-9]')
+
+# Required by every gin_trgm_ops index. Migrations create it explicitly,
+# this covers databases built with metadata.create_all().
+CREATE_TRIGRAM_EXTENSION = sa.DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+
+
+@functools.lru_cache(maxsize=WILDCARD_CACHE_SIZE)
+def wildcard_to_sql(value: str) -> str:
+    '''
+    Converts a search expression in to a LIKE pattern.
+
+    ``*`` matches any number of characters. Expressions may otherwise only
+    contain letters and digits, and at least one of them.
+    '''
+    if '**' in value:
+        raise GraphQLError('invalid search expression')
+
+    if value.strip('*'):
+        if _INVALID_CHARACTERS.search(value) or not _SEARCHABLE_CHARACTERS.search(value):
+            raise GraphQLError('invalid search expression')
+
+    return value.replace('*', '%')
+
+
+def search_predicate(column: Column, value: str):
+    '''
+    Builds the filter for a string column.
+
+    Plain values are compared for equality, patterns use ILIKE which
+    PostgreSQL can answer from the column's trigram index regardless of
+    where the wildcards are.
+    '''
+    expression = wildcard_to_sql(value)
+    if '%' in expression:
+        return column.ilike(expression)
+    return column == value
+
+
+class FilterOperator(NamedTuple):
+    column: Column
+    # None for the plain equality / wildcard filter.
+    operator: Optional[str] = None
+
+
+def column_operators(column: Column) -> Tuple[str, ...]:
+    python_type = column.type.python_type
+
+    if python_type in RANGE_TYPES:
+        if column.nullable:
+            return RANGE_OPERATORS
+        return tuple(operator for operator in RANGE_OPERATORS if operator != 'is_null')
+
+    if python_type is str:
+        return STRING_OPERATORS
+
+    return ()
+
+
+def operator_type(operator: str, type_: type) -> type:
+    if operator in ('in', 'between'):
+        return List[type_]
+    if operator == 'is_null':
+        return bool
+    if operator == 'prefix':
+        return str
+    return type_
+
+
+def operator_predicate(column: Column, operator: str, value: Any):
+    '''
+    Compiles a generated filter operator in to a SQL expression.
+    '''
+    if operator == 'gt':
+        return column > value
+    if operator == 'lt':
+        return column < value
+    if operator == 'in':
+        return column.in_(value)
+    if operator == 'between':
+        if len(value) != 2:
+            raise GraphQLError(f'{column.key}_between expects exactly two values')
+        return column.between(*value)
+    if operator == 'is_null':
+        return column.is_(None) if value else column.isnot(None)
+    if operator == 'prefix':
+        return column.startswith(value, autoescape=True)
+    raise RuntimeError(f'unknown filter operator {operator!r}')
+
+
+def trigram_index_name(column: Column) -> str:
+    return f'ix_{column.table.name}_{column.name}_trgm'
+
+
+def trigram_index(column: Column) -> Index:
+    '''
+    Declares a pg_trgm GIN index on a searchable string column.
+
+    The index is attached to the column's table, so it is created alongside
+    it and known to Alembic's autogenerate. Calling this more than once for
+    the same column returns the existing index.
+    '''
+    name = trigram_index_name(column)
+    for index in column.table.indexes:
+        if index.name == name:
+            return index
+
+    metadata = column.table.metadata
+    if not sa.event.contains(metadata, 'before_create', CREATE_TRIGRAM_EXTENSION):
+        sa.event.listen(metadata, 'before_create', CREATE_TRIGRAM_EXTENSION)
+
+    return Index(
+        name,
+        column,
+        postgresql_using='gin',
+        postgresql_ops={column.key: 'gin_trgm_ops'},
+    )
@@ -0,0 +1,35 @@
+from typing import (
+    Any,
+    Dict,
+    Optional,
+)
+
+from strawberry.ast import LabelMap
+
+SelectionTree = Dict[str, Optional['SelectionTree']]
+
+
+def selection_tree(request_document: Optional[LabelMap]) -> SelectionTree:
+    '''
+    Converts a request document into a nested dictionary.
+
+    Request documents list a field's sub-selection either directly after
+    the field's name (``['model', ['name']]`` within the parent list) or
+    as a ``[name, [...]]`` pair. Fields without a sub-selection map to None.
+    '''
+    tree: Dict[str, Any] = {}
+    last_name = None
+
+    for field in request_document or ():
+        if isinstance(field, (list, tuple)):
+            if last_name is not None:
+                tree[last_name] = selection_tree(field)
+                last_name = None
+            elif len(field) > 1 and isinstance(field[0], str) and isinstance(field[1], (list, tuple)):
+                tree[field[0]] = selection_tree(field[1])
+            continue
+
+        tree.setdefault(field, None)
+        last_name = field
+
+    return tree
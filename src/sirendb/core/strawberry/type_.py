@@ -20,10 +20,15 @@ from strawberry.types.info import Info
 from strawberry.types.types import TypeDefinition
 from strawberry.utils.str_converters import to_camel_case
 
+from .loader import (
+    active_loader,
+    RelationshipLoader,
+)
 from .scalars import (
     LimitedStringScalar,
     StringLimitExceeded,
 )
+from .selection import selection_tree
 
 # TODO: move this to sqlalchemy.py
 table_to_type = {}
@@ -184,136 +189,255 @@ def _sqlalchemy_column_required(
     return datafield_required
 
 
-def _resolve_sqlalchemy_result(
-    cls: GraphQLType,
-    type_info: dict,
-    row: Model,
-    request_document: LabelMap,
-):
-    namespace = {}
-
-    columns = [
-        (key, value)
-        for key, value in type_info['without_default']
-    ]
-    columns.extend([
-        (key, value)
-        for key, value in type_info['with_default'].items()
-    ])
+# Upper bound of compiled resolution plans kept around. Plans are keyed
+# by the GraphQL type and the shape of the request document, so this only
+# needs to cover the distinct queries clients actually send.
+RESOLUTION_PLAN_CACHE_SIZE = 512
+
+
+class ResolutionStep(typing.NamedTuple):
+    attribute: str
+    child_plan: typing.Optional[ResolutionPlan]
+    default: typing.Any
+
+
+class ResolverStep(typing.NamedTuple):
+    attribute: str
+    method: typing.Callable
+    return_type: typing.Any
+    type_info: typing.Optional[dict]
+    request_document: LabelMap
+
+
+class ResolutionPlan:
+    '''
+    Precomputed steps for turning rows in to a GraphQL type.
+
+    Everything that only depends on the GraphQL type and the request
+    document is worked out once by _compile_plan so that resolving a
+    page of rows is a tight loop without any introspection.
+
+    Types opt in to records with Meta.records. Their rows are returned as
+    instances of the GraphQL type whose __dict__ is the resolved namespace,
+    skipping the dataclass __init__. Strawberry reads them exactly like
+    regular instances. Child plans follow their own type's Meta.
+    '''
+    __slots__ = (
+        'cls',
+        'selection',
+        'column_steps',
+        'resolver_steps',
+        'default_steps',
+        'argument_order',
+        'missing_field',
+        'records',
+    )
+
+    def __init__(
+        self,
+        cls,
+        selection,
+        column_steps,
+        resolver_steps,
+        default_steps,
+        argument_order,
+        missing_field,
+        records,
+    ):
+        self.cls = cls
+        self.selection = selection
+        self.column_steps = column_steps
+        self.resolver_steps = resolver_steps
+        self.default_steps = default_steps
+        self.argument_order = argument_order
+        self.missing_field = missing_field
+        self.records = records
+
+    def resolve(self, row: Model):
+        if self.missing_field is not None:
+            raise MissingFieldError(
+                f'{self.cls.Meta.name}.{self.missing_field} is required but was not provided by {row}'
+            )
+
+        namespace = {}
+
+        for attribute, child_plan, _ in self.column_steps:
+            value = getattr(row, attribute)
+            if value and child_plan is not None:
+                if isinstance(value, list):
+                    value = [child_plan.resolve(sub_row) for sub_row in value]
+                else:
+                    value = child_plan.resolve(value)
+            namespace[attribute] = value
+
+        for attribute, method, return_type, type_info, request_document in self.resolver_steps:
+            namespace[attribute] = method(
+                cls=return_type,
+                type_info=type_info,
+                row=row,
+                request_document=request_document,
+            )
 
+        for attribute, _, default in self.default_steps:
+            namespace[attribute] = [] if isinstance(default, list) else default
+
+        if self.records:
+            record = self.cls.__new__(self.cls)
+            record.__dict__ = namespace
+            return record
+
+        return self.cls(*[namespace[key] for key in self.argument_order])
+
+
+def _freeze_document(request_document: LabelMap) -> tuple:
+    return tuple(
+        _freeze_document(field) if isinstance(field, (list, tuple)) else field
+        for field in request_document or ()
+    )
+
+
+def _column_request_document(request_document: tuple, column_name: str) -> typing.Optional[tuple]:
+    '''
+    Returns the sub-selection of a field, listed either directly after the
+    field's name or as a (name, (...)) pair, or (column_name,) when the
+    field is selected without one. Returns None when it isn't selected.
+    '''
+    column_request_document = None
+    for index, field in enumerate(request_document):
+        if isinstance(field, tuple) and len(field) > 1:
+            if field[0] == column_name and isinstance(field[1], tuple):
+                column_request_document = field[1]
+        elif field == column_name:
+            column_request_document = (column_name,)
+            if index + 1 < len(request_document):
+                if isinstance(request_document[index + 1], tuple):
+                    column_request_document = request_document[index + 1]
+    return column_request_document
+
+
+def _relationship_type(cls: GraphQLType, column_name: str) -> typing.Optional[GraphQLType]:
+    relationship = sql_inspect(cls.Meta.sqlalchemy_model).relationships.get(column_name)
+    if relationship is None:
+        return None
+    return table_to_type.get(relationship.target.name)
+
+
+@functools.lru_cache(maxsize=RESOLUTION_PLAN_CACHE_SIZE)
+def _compile_plan(cls: GraphQLType, request_document: tuple) -> ResolutionPlan:
+    type_info = type_info_map[cls.Meta.sqlalchemy_model.__table__.name]
+    log.debug(f'compiling resolution plan for {cls.Meta.name}')
+
+    columns = list(type_info['without_default'])
+    columns.extend(type_info['with_default'].items())
+
+    column_steps = []
     for column_name, field_cls in columns:
         if column_name in type_info['with_resolver']:
             continue
 
         datafield_required = _sqlalchemy_column_required(cls, column_name)
-
-        column_request_document = None
-        for field in request_document:
-            if isinstance(field, list) and len(field) > 1:
-                if field[0] == column_name and isinstance(field[1], list):
-                    column_request_document = field[1]
-            elif field == column_name:
-                column_request_document = [column_name]
+        column_request_document = _column_request_document(request_document, column_name)
 
         if not datafield_required and column_request_document is None:
-            log.debug(f'SKIP: {column_name}')
             continue
 
-        value = getattr(row, column_name)
-        if not value:
-            namespace[column_name] = value
-            continue
+        child_plan = None
+        if column_request_document and column_request_document != (column_name,):
+            child_cls = _relationship_type(cls, column_name)
+            if child_cls is not None:
+                child_plan = _compile_plan(child_cls, column_request_document)
 
-        if column_request_document and column_request_document != [column_name]:
-            assert isinstance(request_document, list)
-
-            log.debug(f'TYPE: {column_name} = {value} ... resolving')
-            if isinstance(value, list):
-                namespace[column_name] = []
-                sub_table_name = value[0].__table__.name
-                for sub_row in value:
-                    namespace[column_name].append(_resolve_sqlalchemy_result(
-                        cls=table_to_type[sub_table_name],
-                        type_info=type_info_map[sub_table_name],
-                        row=sub_row,
-                        request_document=column_request_document,
-                    ))
-            else:
-                sub_table_name = value.__table__.name
-                namespace[column_name] = _resolve_sqlalchemy_result(
-                    cls=table_to_type[sub_table_name],
-                    type_info=type_info_map[sub_table_name],
-                    row=value,
-                    request_document=column_request_document,
-                )
-
-            log.debug(f'TYPE: {column_name} = {namespace[column_name]}')
-        else:
-            namespace[column_name] = value
-            log.debug(f'SCALAR: {column_name} = {value}')
+        column_steps.append(ResolutionStep(
+            attribute=column_name,
+            child_plan=child_plan,
+            default=None,
+        ))
 
-    for column_name, (field_value, missing_default) in type_info['with_resolver'].items():
+    resolver_steps = []
+    for column_name in type_info['with_resolver'].keys():
         datafield_required = _sqlalchemy_column_required(cls, column_name)
-
-        column_request_document = None
-        for index, field in enumerate(request_document):
-            if isinstance(field, list) and len(field) > 1:
-                if field[0] == column_name and isinstance(field[1], list):
-                    column_request_document = field[1]
-            elif field == column_name:
-                column_request_document = [column_name]
-                if index + 1 < len(request_document):
-                    if isinstance(request_document[index + 1], list):
-                        column_request_document = request_document[index + 1]
+        column_request_document = _column_request_document(request_document, column_name)
 
         if not datafield_required and column_request_document is None:
-            log.debug(f'SKIP: {column_name}')
             continue
 
-        resolver_name = 'resolve_' + column_name
-        method = getattr(cls, resolver_name)
+        method = getattr(cls, 'resolve_' + column_name)
 
         return_type = method.__annotations__['return']
         if hasattr(return_type, '__origin__'):
             return_type, *_ = typing.get_args(method.__annotations__['return'])
 
-        log.debug(f'RESOLVE: {column_name} = {row} ... resolving')
+        return_type_info = None
         if hasattr(return_type, 'Meta'):
             return_type_info = type_info_map[return_type.Meta.sqlalchemy_model.__table__.name]
-            namespace[column_name] = method(
-                cls=return_type,
-                type_info=return_type_info,
-                row=row,
-                request_document=column_request_document or request_document,
-            )
-        else:
-            namespace[column_name] = method(
-                cls=return_type,
-                type_info=None,
-                row=row,
-                request_document=column_request_document or request_document,
-            )
-        log.debug(f'RESOLVE: {column_name} = {namespace[column_name]}')
 
+        resolver_steps.append(ResolverStep(
+            attribute=column_name,
+            method=method,
+            return_type=return_type,
+            type_info=return_type_info,
+            request_document=column_request_document or request_document,
+        ))
+
+    provided = {step.attribute for step in column_steps}
+    provided.update(step.attribute for step in resolver_steps)
+
+    default_steps = []
+    missing_field = None
     ordered_keys = inspect.getfullargspec(cls.__dict__['__init__']).args
-    for index, key in enumerate(ordered_keys):
-        if index > 0 and key not in namespace:
-            field = type_info['with_default'].get(key)
-            datafield_required = _sqlalchemy_column_required(cls, key)
-
-            if not field and datafield_required:
-                raise MissingFieldError(
-                    f'{cls.Meta.name}.{key} is required but was not provided by {row} {namespace.keys()}'
-                )
+    for key in ordered_keys[1:]:
+        if key in provided:
+            continue
 
-            if field and hasattr(field.type, '__origin__'):
-                namespace[key] = []
-            else:
-                namespace[key] = None
+        field = type_info['with_default'].get(key)
+        datafield_required = _sqlalchemy_column_required(cls, key)
+
+        if not field and datafield_required and missing_field is None:
+            missing_field = key
+
+        if field and hasattr(field.type, '__origin__'):
+            default = []
+        else:
+            default = None
+
+        default_steps.append(ResolutionStep(
+            attribute=key,
+            child_plan=None,
+            default=default,
+        ))
+
+    return ResolutionPlan(
+        cls=cls,
+        selection=selection_tree(request_document),
+        column_steps=tuple(column_steps),
+        resolver_steps=tuple(resolver_steps),
+        default_steps=tuple(default_steps),
+        argument_order=tuple(cls.__annotations__.keys()),
+        missing_field=missing_field,
+        records=bool(getattr(cls.Meta, 'records', False)),
+    )
 
-            log.debug(f'DEFAULT: {key} = {namespace[key]}')
 
-    return cls.ordered_args(namespace)
+def compile_plan(cls: GraphQLType, request_document: LabelMap) -> ResolutionPlan:
+    return _compile_plan(cls, _freeze_document(request_document))
+
+
+def _resolve_sqlalchemy_result(
+    cls: GraphQLType,
+    type_info: dict,
+    row: Model,
+    request_document: LabelMap,
+):
+    plan = compile_plan(cls, request_document)
+
+    # Rows handed over by resolvers have not been seen by the loader yet,
+    # unless the resolver fetched them through batch_load with the plan's
+    # selection, which loads the selection for the whole batch at once.
+    loader = active_loader()
+    if loader is not None:
+        loader.prime_selection([row], plan.selection)
+
+    return plan.resolve(row)
 
 
 def is_valid_field(item) -> bool:
@@ -574,14 +698,17 @@ def _ordered_args(cls, result: typing.Dict[str, typing.Any]):
     return cls(*args)
 
 
-def _from_sqlalchemy_model(cls, result, info: Info, request_document: LabelMap = None):
+def _from_sqlalchemy_model(
+    cls,
+    result,
+    info: Info,
+    request_document: LabelMap = None,
+):
     if result == []:
         return []
     elif not result:
         return None
 
-    table_name = cls.Meta.sqlalchemy_model.__table__.name
-    type_info = type_info_map[table_name]
     this_field_name = camel_to_snake(cls.Meta.name)
 
     if not request_document:
@@ -595,23 +722,19 @@ def _from_sqlalchemy_model(cls, result, info: Info, request_document: LabelMap =
         request_document = request_document[this_field_index + 1]
 
     log.debug(f'from_sqlalchemy_model {cls.Meta.name} {type(result).__name__}')
-    if isinstance(result, list):
-        return [
-            _resolve_sqlalchemy_result(
-                cls=cls,
-                type_info=type_info,
-                row=resolved_row,
-                request_document=request_document,
-            )
-            for resolved_row in result
-        ]
 
-    return _resolve_sqlalchemy_result(
-        cls=cls,
-        type_info=type_info,
-        row=result,
-        request_document=request_document,
-    )
+    plan = compile_plan(cls, request_document)
+
+    # Load the requested relationships for every row up front so that
+    # resolving the page costs a fixed number of queries per nesting level.
+    loader = active_loader() or RelationshipLoader()
+    loader.prime_selection(result if isinstance(result, list) else [result], plan.selection)
+
+    with loader.activate():
+        if isinstance(result, list):
+            return [plan.resolve(resolved_row) for resolved_row in result]
+
+        return plan.resolve(result)
 
 
 class GraphQLType(metaclass=SchemaTypeMeta):
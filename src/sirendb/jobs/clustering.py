@@ -0,0 +1,47 @@
+import logging
+from typing import Optional
+
+from rq.job import Job
+
+from sirendb.core.redis import redis
+from sirendb.core.rq import rq
+from sirendb.lib.spatial import store_clusters
+
+log = logging.getLogger('sirendb.clustering')
+
+# Set while a rebuild is queued but has not started yet. Rebuilds read
+# every current location once they start, so any number of writes before
+# that only need the one rebuild. The TTL recovers from rebuilds lost
+# before they got to run.
+REBUILD_PENDING_KEY = 'siren_clusters:rebuild_pending'
+REBUILD_PENDING_TTL = 60 * 60
+
+
+@rq.job
+def rebuild_clusters() -> None:
+    # Writes from here on need a rebuild of their own.
+    redis.delete(REBUILD_PENDING_KEY)
+
+    log.info('rebuilding siren clusters')
+    store_clusters()
+
+
+def enqueue_rebuild_clusters(**kwargs) -> Optional[Job]:
+    '''
+    Enqueues rebuild_clusters on the clustering queue unless a rebuild is
+    already waiting to start, in which case None is returned.
+    '''
+    if not redis.set(REBUILD_PENDING_KEY, 1, nx=True, ex=REBUILD_PENDING_TTL):
+        log.debug('siren clusters rebuild is already pending')
+        return None
+
+    try:
+        return rq.get_queue('clustering').enqueue(
+            rebuild_clusters,
+            job_timeout=600,
+            description='rebuild siren clusters',
+            **kwargs,
+        )
+    except BaseException:
+        redis.delete(REBUILD_PENDING_KEY)
+        raise
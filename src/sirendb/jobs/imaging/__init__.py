@@ -1,4 +1,7 @@
 from . capture import (
+    CaptureRequest,
+    capture_images,
     capture_satellite_image,
     capture_streetview_image,
 )
+from . enqueue import enqueue_captures
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from flask import current_app
+import sqlalchemy as sa
+
+from sirendb.core.db import db
+from sirendb.lib.storage import storage
+from sirendb.models.siren_media import (
+    SirenMedia,
+    SirenMediaType,
+)
+
+from .static import geo_build_version
+
+log = logging.getLogger('sirendb.imaging.cache')
+
+# Coordinates are rounded before hashing so near-duplicate locations, such
+# as the same point re-imported with more digits, share their images.
+# Six decimals of a degree are about 10cm.
+COORDINATE_DECIMALS = {
+    'latitude': 6,
+    'longitude': 6,
+    'zoom': 2,
+    'heading': 1,
+    'pitch': 1,
+}
+
+# Files left without any media pointing at them, deleted once the
+# transaction that released them commits.
+RELEASED_FILES = 'sirendb.released_files'
+
+
+def _hash(document) -> str:
+    return hashlib.sha256(json.dumps(document, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _normalized(media_type: SirenMediaType, coordinates: NamedTuple) -> list:
+    return [
+        media_type.name,
+        {
+            field: round(float(value), COORDINATE_DECIMALS.get(field, 6))
+            for field, value in coordinates._asdict().items()
+        },
+    ]
+
+
+def coordinates_key(media_type: SirenMediaType, coordinates: NamedTuple) -> str:
+    '''
+    Hashes the kind of image and its normalized coordinates.
+    '''
+    return _hash(_normalized(media_type, coordinates))
+
+
+def capture_key(media_type: SirenMediaType, coordinates: NamedTuple, settings: NamedTuple) -> str:
+    '''
+    Hashes everything that determines what a capture looks like: the kind
+    of image, its normalized coordinates, the capture settings and the geo
+    app build.
+    '''
+    return _hash([
+        *_normalized(media_type, coordinates),
+        settings._asdict(),
+        geo_build_version(current_app.config.get('GEO_BUILD_DIR')),
+    ])
+
+
+def find_captures(keys: Iterable[str]) -> Dict[str, SirenMedia]:
+    '''
+    Returns the earliest original media captured for each of the keys.
+    '''
+    captures = {}
+    for media in SirenMedia.query.filter(
+        SirenMedia.capture_key.in_(list(keys)),
+        SirenMedia.variant_of_id.is_(None),
+    ).options(
+        sa.orm.selectinload(SirenMedia.variants)
+    ).order_by(SirenMedia.id):
+        captures.setdefault(media.capture_key, media)
+    return captures
+
+
+def reuse_capture(location_id: int, cached: SirenMedia) -> SirenMedia:
+    '''
+    Gives a location media sharing the files of a cached capture and of
+    its variants.
+    '''
+    def copy(source: SirenMedia, variant_of: Optional[SirenMedia]) -> SirenMedia:
+        media = SirenMedia(
+            media_type=source.media_type,
+            filename=source.filename,
+            filesystem_uri=source.filesystem_uri,
+            mimetype=source.mimetype,
+            kilobytes=source.kilobytes,
+            width=source.width,
+            height=source.height,
+            capture_key=source.capture_key,
+            location_id=location_id,
+            variant_of=variant_of,
+        )
+        db.session.add(media)
+        return media
+
+    media = copy(cached, None)
+    for variant in cached.variants:
+        copy(variant, media)
+    return media
+
+
+def _file_references(connection, filesystem_uri: str) -> int:
+    table = SirenMedia.__table__
+    return connection.execute(
+        sa.select(sa.func.count()).where(table.c.filesystem_uri == filesystem_uri)
+    ).scalar()
+
+
+@sa.event.listens_for(SirenMedia, 'after_delete')
+def _media_deleted(mapper, connection, target: SirenMedia):
+    # Captures are shared between media, only delete the file once nothing
+    # points at it anymore.
+    if not target.filesystem_uri or _file_references(connection, target.filesystem_uri):
+        return
+
+    session = sa.orm.object_session(target)
+    if session is not None:
+        session.info.setdefault(RELEASED_FILES, set()).add(target.filesystem_uri)
+
+
+@sa.event.listens_for(sa.orm.Session, 'after_commit')
+def _session_committed(session):
+    released: List[str] = sorted(session.info.pop(RELEASED_FILES, ()))
+    for filesystem_uri in released:
+        log.debug(f'deleting unreferenced file {filesystem_uri}')
+        storage.delete(filesystem_uri)
+
+
+@sa.event.listens_for(sa.orm.Session, 'after_rollback')
+def _session_rolled_back(session):
+    session.info.pop(RELEASED_FILES, None)
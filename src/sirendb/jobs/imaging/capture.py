@@ -1,9 +1,17 @@
 import logging
-from typing import Optional
+from typing import (
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
 
 from flask import current_app
 
 from sirendb.core.db import db
+from sirendb.core.redis import redis
 from sirendb.core.rq import rq
 from sirendb.models.siren_location import (
     SatelliteCoordinates,
@@ -15,92 +23,246 @@ from sirendb.models.siren_media import (
 )
 from sirendb.lib.storage import storage
 
-from .chrome import Chrome
-from .nginx import Nginx
+from .cache import (
+    capture_key,
+    coordinates_key,
+    find_captures,
+    reuse_capture,
+)
+from .chrome import (
+    CAPTURE_FORMATS,
+    CaptureSettings,
+    chrome_pool,
+)
+from .static import geo_server
+from .variants import (
+    image_size,
+    make_variants,
+)
 
 log = logging.getLogger('sirendb.imaging.capture')
 
+# Redis key holding the coordinates most recently enqueued for capture of
+# one kind of image of a location. Anything else is superseded.
+LATEST_CAPTURE_KEY = 'latest_capture:{location_id}:{media_type}'
+LATEST_CAPTURE_TTL = 7 * 24 * 60 * 60
 
-def _capture_image(http_path: str) -> Optional[bytes]:
-    bin_dir = current_app.config.get('BIN_DIR')
-    if not bin_dir:
-        log.error('_capture_image failed: missing BIN_DIR')
-        return None
+# Config namespaces of the CaptureSettings of every kind of image, such as
+# IMAGING_SATELLITE_CAPTURE_FORMAT or IMAGING_STREET_CAPTURE_WIDTH.
+CAPTURE_CONFIG_NAMESPACES = {
+    SirenMediaType.SATELLITE_IMAGE: 'IMAGING_SATELLITE_CAPTURE_',
+    SirenMediaType.STREET_IMAGE: 'IMAGING_STREET_CAPTURE_',
+}
 
-    geo_dir = current_app.config.get('GEO_BUILD_DIR')
-    if not geo_dir:
-        log.error('_capture_image failed: missing GEO_BUILD_DIR')
-        return None
 
-    with Nginx(bin_dir=bin_dir, geo_dir=geo_dir) as netloc:
-        if not netloc:
-            return None
+class CaptureRequest(NamedTuple):
+    location_id: int
+    media_type: SirenMediaType
+    coordinates: Union[SatelliteCoordinates, StreetCoordinates]
 
-        with Chrome(bin_dir=bin_dir) as chrome:
-            local_url = f'http://{netloc}/{http_path}'
-            screenshot = chrome.capture_screenshot(local_url)
-            log.debug('captured screenshot, stopping chrome...')
 
-        log.debug('stopped chrome, stopping nginx...')
+def latest_capture_key(request: CaptureRequest) -> str:
+    return LATEST_CAPTURE_KEY.format(location_id=request.location_id, media_type=request.media_type.name)
 
-    log.debug('stopped nginx')
 
-    return screenshot
+def superseded(requests: Sequence[CaptureRequest]) -> List[bool]:
+    '''
+    Tells which requests were superseded by a later request to capture the
+    same kind of image of the same location at other coordinates.
+    '''
+    if not requests:
+        return []
 
+    latest = redis.mget([latest_capture_key(request) for request in requests])
+    return [
+        value is not None and value.decode() != coordinates_key(request.media_type, request.coordinates)
+        for request, value in zip(requests, latest)
+    ]
 
-@rq.job
-def capture_satellite_image(location_id: int, coordinates: SatelliteCoordinates) -> None:
-    http_path = 'sat?lat={lat}&lng={lng}&zoom={zoom}'.format(
-        lat=coordinates.latitude,
-        lng=coordinates.longitude,
-        zoom=coordinates.zoom,
-    )
-    log.info(f'capturing screenshot for {location_id}')
-    screenshot = _capture_image(http_path)
-    if not screenshot:
-        return
 
-    media = SirenMedia(
-        media_type=SirenMediaType.SATELLITE_IMAGE,
-        mimetype='image/png',
-        kilobytes=(len(screenshot) / 1024),
-        location_id=location_id,
-    )
+def capture_settings(media_type: SirenMediaType) -> CaptureSettings:
+    namespace = CAPTURE_CONFIG_NAMESPACES[media_type]
+    config = current_app.config.get_namespace(namespace)
 
-    save_result = storage.save(screenshot, 'png', 'image/png')
-    if save_result:
-        media.filename = save_result.filesystem_key
-        media.filesystem_uri = save_result.filesystem_uri
+    unknown = sorted(set(config) - set(CaptureSettings._fields))
+    if unknown:
+        raise RuntimeError(f'unknown capture setting(s): {", ".join(namespace + key.upper() for key in unknown)}')
 
-    db.session.add(media)
-    db.session.commit()
+    if config.get('clip') is not None:
+        config['clip'] = tuple(config['clip'])
 
+    settings = CaptureSettings(**config)
+    if settings.format not in CAPTURE_FORMATS:
+        raise RuntimeError(f'{namespace}FORMAT must be one of {", ".join(CAPTURE_FORMATS)}')
+    return settings
 
-@rq.job
-def capture_streetview_image(location_id: int, coordinates: StreetCoordinates) -> None:
-    http_path = '?lat={lat}&lng={lng}&heading={heading}&pitch={pitch}&zoom={zoom}'.format(
+
+def _http_path(request: CaptureRequest) -> str:
+    coordinates = request.coordinates
+    if request.media_type == SirenMediaType.SATELLITE_IMAGE:
+        return 'sat?lat={lat}&lng={lng}&zoom={zoom}'.format(
+            lat=coordinates.latitude,
+            lng=coordinates.longitude,
+            zoom=coordinates.zoom,
+        )
+
+    return '?lat={lat}&lng={lng}&heading={heading}&pitch={pitch}&zoom={zoom}'.format(
         lat=coordinates.latitude,
         lng=coordinates.longitude,
         heading=coordinates.heading,
         pitch=coordinates.pitch,
         zoom=coordinates.zoom,
     )
-    log.info(f'capturing screenshot for {location_id}')
-    screenshot = _capture_image(http_path)
-    if not screenshot:
-        return
 
+
+def _capture_images(http_paths: List[str], settings: CaptureSettings) -> List[Optional[bytes]]:
+    bin_dir = current_app.config.get('BIN_DIR')
+    if not bin_dir:
+        log.error('_capture_images failed: missing BIN_DIR')
+        return [None] * len(http_paths)
+
+    geo_dir = current_app.config.get('GEO_BUILD_DIR')
+    if not geo_dir:
+        log.error('_capture_images failed: missing GEO_BUILD_DIR')
+        return [None] * len(http_paths)
+
+    netloc = geo_server.netloc(geo_dir, host=current_app.config.get('IMAGING_SERVER_HOST', '127.0.0.1'))
+
+    with chrome_pool.browser(bin_dir=bin_dir) as chrome:
+        screenshots = chrome.capture_screenshots([
+            f'http://{netloc}/{http_path}'
+            for http_path in http_paths
+        ], settings)
+        log.debug(f'captured {len(screenshots)} screenshot(s)')
+
+    return screenshots
+
+
+def _save_media(
+    request: CaptureRequest,
+    data: bytes,
+    file_extension: str,
+    mimetype: str,
+    width: Optional[int],
+    height: Optional[int],
+    key: Optional[str] = None,
+    variant_of: Optional[SirenMedia] = None,
+) -> SirenMedia:
     media = SirenMedia(
-        media_type=SirenMediaType.STREET_IMAGE,
-        mimetype='image/png',
-        kilobytes=(len(screenshot) / 1024),
-        location_id=location_id,
+        media_type=request.media_type,
+        mimetype=mimetype,
+        kilobytes=(len(data) / 1024),
+        width=width,
+        height=height,
+        capture_key=key,
+        location_id=request.location_id,
+        variant_of=variant_of,
     )
 
-    save_result = storage.save(screenshot, 'png', 'image/png')
+    save_result = storage.save(data, file_extension, mimetype)
     if save_result:
         media.filename = save_result.filesystem_key
         media.filesystem_uri = save_result.filesystem_uri
 
     db.session.add(media)
+    return media
+
+
+def _save_screenshot(
+    request: CaptureRequest,
+    screenshot: bytes,
+    key: str,
+    settings: CaptureSettings,
+) -> SirenMedia:
+    capture_format = settings.capture_format
+    width, height = image_size(screenshot) or (None, None)
+    media = _save_media(
+        request,
+        screenshot,
+        capture_format.file_extension,
+        capture_format.mimetype,
+        width,
+        height,
+        key=key,
+    )
+
+    for variant in make_variants(
+        screenshot,
+        formats=current_app.config.get('IMAGING_VARIANT_FORMATS', ('webp',)),
+        sizes=current_app.config.get('IMAGING_THUMBNAIL_SIZES', (200, 400)),
+    ):
+        _save_media(
+            request,
+            variant.data,
+            variant.file_extension,
+            variant.mimetype,
+            variant.width,
+            variant.height,
+            variant_of=media,
+        )
+
+    return media
+
+
+@rq.job
+def capture_images(requests: List[CaptureRequest]) -> int:
+    '''
+    Captures a batch of images, up to IMAGING_CAPTURE_TABS at a time in
+    tabs of the same browser, and returns how many were saved.
+
+    Images that were captured before, for this or any other location, are
+    reused instead of being rendered again.
+    '''
+    tabs = max(1, current_app.config.get('IMAGING_CAPTURE_TABS', 4))
+    saved = 0
+
+    settings = {media_type: capture_settings(media_type) for media_type in CAPTURE_CONFIG_NAMESPACES}
+
+    requests = [CaptureRequest(*request) for request in requests]
+    pending: Dict[str, List[CaptureRequest]] = {}
+    for request, is_superseded in zip(requests, superseded(requests)):
+        if is_superseded:
+            log.info(f'skipping superseded capture for {request.location_id}')
+            continue
+        key = capture_key(request.media_type, request.coordinates, settings[request.media_type])
+        pending.setdefault(key, []).append(request)
+
+    for key, cached in find_captures(pending).items():
+        for request in pending.pop(key):
+            log.debug(f'reusing capture {cached.id} for {request.location_id}')
+            reuse_capture(request.location_id, cached)
+            saved += 1
     db.session.commit()
+
+    # Tabs of a browser share their capture settings, so every kind of
+    # image is captured separately.
+    for media_type, media_settings in settings.items():
+        keys = [key for key, key_requests in pending.items() if key_requests[0].media_type == media_type]
+        for start in range(0, len(keys), tabs):
+            chunk = keys[start:start + tabs]
+            log.info(f'capturing screenshots for {", ".join(str(pending[key][0].location_id) for key in chunk)}')
+
+            screenshots = _capture_images([_http_path(pending[key][0]) for key in chunk], media_settings)
+            for key, screenshot in zip(chunk, screenshots):
+                if not screenshot:
+                    continue
+
+                first, *duplicates = pending[key]
+                media = _save_screenshot(first, screenshot, key, media_settings)
+                for request in duplicates:
+                    reuse_capture(request.location_id, media)
+                saved += 1 + len(duplicates)
+
+            db.session.commit()
+
+    return saved
+
+
+@rq.job
+def capture_satellite_image(location_id: int, coordinates: SatelliteCoordinates) -> None:
+    capture_images([CaptureRequest(location_id, SirenMediaType.SATELLITE_IMAGE, coordinates)])
+
+
+@rq.job
+def capture_streetview_image(location_id: int, coordinates: StreetCoordinates) -> None:
+    capture_images([CaptureRequest(location_id, SirenMediaType.STREET_IMAGE, coordinates)])
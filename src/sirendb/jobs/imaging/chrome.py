@@ -1,39 +1,221 @@
+import atexit
 import base64
+from contextlib import contextmanager
 import logging
+import os
 import sys
+import threading
 import time
-from typing import Optional
+from typing import (
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 from flask import current_app
+from rq.worker import SimpleWorker
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver import (
     Chrome as ChromeDriver,
     ChromeOptions,
 )
+from werkzeug.utils import import_string
 
 log = logging.getLogger('sirendb.imaging.chrome')
 
+# The geo app sets window.sirendbReady once every tile is rendered, or
+# window.sirendbError when rendering failed, and dispatches a
+# sirendb:ready event on window either way. Pages announce that they will
+# by setting window.sirendbReady = false before the load event.
+#
+# Pages that never set the flags are ready once they are loaded and no
+# resource finished loading for the quiet period given as the first
+# argument, in milliseconds.
+WAIT_UNTIL_READY = '''
+const quietPeriod = arguments[0];
+const done = arguments[arguments.length - 1];
+let finished = false;
+const finish = (error) => {
+    if (!finished) {
+        finished = true;
+        done(error);
+    }
+};
+const settle = () => {
+    if (window.sirendbError) {
+        finish(String(window.sirendbError));
+        return true;
+    }
+    if (window.sirendbReady) {
+        finish(null);
+        return true;
+    }
+    return false;
+};
+if (!settle()) {
+    window.addEventListener('sirendb:ready', settle);
+}
+if (!finished && window.sirendbReady === undefined && window.sirendbError === undefined) {
+    let lastActivity = performance.now();
+    new PerformanceObserver(() => {
+        lastActivity = performance.now();
+    }).observe({type: 'resource', buffered: true});
+    const waitForIdle = () => {
+        if (finished) {
+            return;
+        }
+        if (document.readyState === 'complete' && performance.now() - lastActivity >= quietPeriod) {
+            finish(null);
+            return;
+        }
+        setTimeout(waitForIdle, 50);
+    };
+    waitForIdle();
+}
+'''
+
+
+class CaptureFormat(NamedTuple):
+    file_extension: str
+    mimetype: str
+    lossy: bool
+
+
+CAPTURE_FORMATS = {
+    'png': CaptureFormat('png', 'image/png', False),
+    'jpeg': CaptureFormat('jpg', 'image/jpeg', True),
+    'webp': CaptureFormat('webp', 'image/webp', True),
+}
+
+
+class CaptureSettings(NamedTuple):
+    '''
+    How a page is captured. The viewport is width by height CSS pixels,
+    rendered at device_scale_factor device pixels per CSS pixel. clip is
+    the (x, y, width, height) of the part of the viewport to capture, the
+    whole viewport is captured when it is None. quality only applies to
+    the lossy formats.
+    '''
+    format: str = 'png'
+    quality: Optional[int] = None
+    width: int = 1080
+    height: int = 1080
+    device_scale_factor: float = 1.0
+    clip: Optional[Tuple[float, float, float, float]] = None
+
+    @property
+    def capture_format(self) -> CaptureFormat:
+        return CAPTURE_FORMATS[self.format]
+
+    def screenshot_params(self) -> dict:
+        params = {'format': self.format}
+        if self.quality is not None and self.capture_format.lossy:
+            params['quality'] = self.quality
+        if self.clip is not None:
+            x, y, width, height = self.clip
+            params['clip'] = {'x': x, 'y': y, 'width': width, 'height': height, 'scale': 1}
+        return params
+
 
 class Chrome:
     def __init__(self, bin_dir: str):
         self._bin_dir = bin_dir
         self._driver = None
+        self.captures = 0
+
+    def capture_screenshot(self, url: str, settings: CaptureSettings = CaptureSettings()) -> Optional[bytes]:
+        return self.capture_screenshots([url], settings)[0]
 
-    def capture_screenshot(self, url: str) -> Optional[bytes]:
+    def capture_screenshots(
+        self,
+        urls: List[str],
+        settings: CaptureSettings = CaptureSettings(),
+    ) -> List[Optional[bytes]]:
+        '''
+        Captures every url in a tab of its own. Every tab is loaded before
+        waiting on any of them, so the pages render at the same time.
+        '''
         if not self._driver:  # pragma: nocover
-            return None
+            return [None] * len(urls)
 
-        self._driver.get(url)
+        handles = self._tabs(len(urls))
+        for handle, url in zip(handles, urls):
+            self.captures += 1
+            self._driver.switch_to.window(handle)
+            self._driver.execute_cdp_cmd('Emulation.setDeviceMetricsOverride', {
+                'width': settings.width,
+                'height': settings.height,
+                'deviceScaleFactor': settings.device_scale_factor,
+                'mobile': False,
+            })
+            self._driver.get(url)
 
-        # FIXME Wait til it's loaded
-        if not current_app.testing or current_app.config.get('USE_REAL_NGINX'):
-            time.sleep(3)
+        deadline = time.monotonic() + current_app.config.get('IMAGING_READY_TIMEOUT', 15)
+        screenshots = []
+        for handle in handles:
+            self._driver.switch_to.window(handle)
+            if not self._wait_until_ready(max(0.1, deadline - time.monotonic())):
+                screenshots.append(None)
+                continue
 
-        log.debug('taking screenshot...')
-        response = self._driver.execute_cdp_cmd('Page.captureScreenshot', {})
+            log.debug('taking screenshot...')
+            response = self._driver.execute_cdp_cmd('Page.captureScreenshot', settings.screenshot_params())
+            screenshots.append(base64.b64decode(response['data']))
 
-        return base64.b64decode(response['data'])
+        return screenshots
 
-    def __enter__(self):
+    def _tabs(self, count: int) -> List[str]:
+        '''
+        Returns the handles of count tabs, opening new ones as needed.
+        Tabs stay open for the next captures.
+        '''
+        handles = self._driver.window_handles
+        for _ in range(count - len(handles)):
+            self._driver.execute_script('window.open("about:blank");')
+        if len(handles) < count:
+            handles = self._driver.window_handles
+        return handles[:count]
+
+    def _wait_until_ready(self, timeout: float) -> bool:
+        started_at = time.monotonic()
+        self._driver.set_script_timeout(timeout)
+        try:
+            error = self._driver.execute_async_script(
+                WAIT_UNTIL_READY,
+                current_app.config.get('IMAGING_NETWORK_IDLE_MS', 500),
+            )
+        except TimeoutException:
+            log.error(f'geo app did not render within {timeout}s')
+            return False
+
+        if error:
+            log.error(f'geo app failed to render: {error}')
+            return False
+
+        log.debug(f'geo app rendered in {time.monotonic() - started_at:.3f}s')
+        return True
+
+    def is_healthy(self) -> bool:
+        if not self._driver:
+            return False
+
+        try:
+            self._driver.execute_cdp_cmd('Browser.getVersion', {})
+        except Exception:
+            log.exception('chrome failed its health check')
+            return False
+        return True
+
+    def dump_console_log(self) -> None:
+        # dump console log to stdout, will be shown when test fails
+        for entry in self._driver.get_log('browser'):
+            sys.stderr.write('[browser console] ')
+            sys.stderr.write(repr(entry))
+            sys.stderr.write("\n")
+
+    def start(self) -> None:
         options = ChromeOptions()
         options.add_argument('disable-gpu')
         options.add_argument('disable-dev-shm-usage')
@@ -46,17 +228,150 @@ class Chrome:
             executable_path=f'{self._bin_dir}/chromedriver',
         )
 
-        return self
+    def stop(self) -> None:
+        if not self._driver:
+            return
 
-    def __exit__(self, *args, **kwargs):
-        # dump console log to stdout, will be shown when test fails
-        for entry in self._driver.get_log('browser'):
-            sys.stderr.write('[browser console] ')
-            sys.stderr.write(repr(entry))
-            sys.stderr.write("\n")
+        try:
+            self.dump_console_log()
+        except Exception:
+            pass
 
         # Teardown Selenium.
         try:
             self._driver.quit()
         except Exception:
             pass
+        self._driver = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.stop()
+
+
+def pooling_enabled() -> bool:
+    '''
+    Tells whether browsers may outlive the job that started them.
+
+    rq's default Worker runs every job in a forked work horse that leaves
+    with os._exit, skipping atexit, so a browser kept around would be
+    orphaned. Only workers running jobs in their own process, configured
+    with RQ_WORKER_CLASS = 'rq.worker.SimpleWorker', keep them. That is
+    what flask imaging-worker runs.
+    '''
+    worker_class = current_app.config.get('RQ_WORKER_CLASS', 'rq.Worker')
+    if isinstance(worker_class, str):
+        worker_class = import_string(worker_class)
+    return issubclass(worker_class, SimpleWorker)
+
+
+class ChromePool:
+    '''
+    Chrome instances used by the capture jobs of a worker process, up to
+    IMAGING_CHROME_POOL_SIZE of them at a time.
+
+    Browsers are quit once their job is done unless pooling_enabled, in
+    which case they are kept for the next jobs. Idle browsers are health
+    checked before being handed out. A browser is replaced after
+    IMAGING_CHROME_MAX_CAPTURES captures or when a capture fails. Browsers
+    inherited through fork belong to the parent process and are never
+    reused.
+    '''
+    def __init__(self):
+        self._pid = os.getpid()
+        self._condition = threading.Condition()
+        self._idle: List[Chrome] = []
+        self._started = 0
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._condition = threading.Condition()
+            self._idle = []
+            self._started = 0
+
+    def _acquire(self, bin_dir: str) -> Chrome:
+        size = current_app.config.get('IMAGING_CHROME_POOL_SIZE', 1)
+        timeout = current_app.config.get('IMAGING_CHROME_POOL_TIMEOUT', 60)
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self._condition:
+                self._check_pid()
+                while not self._idle and self._started >= size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RuntimeError(f'no chrome became available within {timeout}s')
+                    self._condition.wait(remaining)
+
+                chrome = self._idle.pop() if self._idle else None
+                if chrome is None:
+                    self._started += 1
+
+            if chrome is None:
+                chrome = Chrome(bin_dir=bin_dir)
+                try:
+                    log.debug('starting chrome...')
+                    chrome.start()
+                except Exception:
+                    self._discard(chrome)
+                    raise
+                return chrome
+
+            if chrome.is_healthy():
+                return chrome
+            self._discard(chrome)
+
+    def _release(self, chrome: Chrome) -> None:
+        if not pooling_enabled():
+            self._discard(chrome)
+            return
+
+        try:
+            chrome.dump_console_log()
+        except Exception:
+            self._discard(chrome)
+            return
+
+        if chrome.captures >= current_app.config.get('IMAGING_CHROME_MAX_CAPTURES', 100):
+            log.debug(f'recycling chrome after {chrome.captures} captures')
+            self._discard(chrome)
+            return
+
+        with self._condition:
+            self._idle.append(chrome)
+            self._condition.notify()
+
+    def _discard(self, chrome: Chrome) -> None:
+        chrome.stop()
+        with self._condition:
+            self._started -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def browser(self, bin_dir: str) -> Iterator[Chrome]:
+        chrome = self._acquire(bin_dir)
+        try:
+            yield chrome
+        except BaseException:
+            # The browser may have crashed, never reuse it.
+            self._discard(chrome)
+            raise
+        self._release(chrome)
+
+    def close(self) -> None:
+        with self._condition:
+            if self._pid != os.getpid():
+                return
+            idle, self._idle = self._idle, []
+            self._started -= len(idle)
+
+        for chrome in idle:
+            chrome.stop()
+
+
+chrome_pool = ChromePool()
+atexit.register(chrome_pool.close)
@@ -0,0 +1,65 @@
+import hashlib
+import logging
+from typing import Sequence
+
+from rq.job import (
+    Job,
+    JobStatus,
+)
+from rq.queue import Queue
+
+from sirendb.core.redis import redis
+
+from .cache import coordinates_key
+from .capture import (
+    LATEST_CAPTURE_TTL,
+    CaptureRequest,
+    capture_images,
+    latest_capture_key,
+)
+
+log = logging.getLogger('sirendb.imaging.enqueue')
+
+PENDING_STATUSES = (
+    JobStatus.QUEUED,
+    JobStatus.STARTED,
+    JobStatus.DEFERRED,
+    JobStatus.SCHEDULED,
+)
+
+
+def capture_job_id(requests: Sequence[CaptureRequest]) -> str:
+    identities = sorted(
+        f'{request.location_id}:{request.media_type.name}:{coordinates_key(request.media_type, request.coordinates)}'
+        for request in requests
+    )
+    return 'capture_images:' + hashlib.sha256('|'.join(identities).encode('utf-8')).hexdigest()[:32]
+
+
+def enqueue_captures(queue: Queue, requests: Sequence[CaptureRequest], **kwargs) -> Job:
+    '''
+    Enqueues capture_images for the requests unless the same captures are
+    already queued or running, in which case that job is returned instead.
+
+    The requests supersede any earlier request for the same kinds of images
+    of the same locations; capture_images skips superseded requests.
+    '''
+    requests = [CaptureRequest(*request) for request in requests]
+    job_id = capture_job_id(requests)
+
+    with redis.lock(f'lock:{job_id}', timeout=30, blocking_timeout=10):
+        with redis.pipeline() as pipeline:
+            for request in requests:
+                pipeline.set(
+                    latest_capture_key(request),
+                    coordinates_key(request.media_type, request.coordinates),
+                    ex=LATEST_CAPTURE_TTL,
+                )
+            pipeline.execute()
+
+        job = queue.fetch_job(job_id)
+        if job is not None and job.get_status() in PENDING_STATUSES:
+            log.debug(f'{job_id} is already {job.get_status()}')
+            return job
+
+        return queue.enqueue(capture_images, args=(requests,), job_id=job_id, **kwargs)
@@ -0,0 +1,109 @@
+import atexit
+from functools import (
+    lru_cache,
+    partial,
+)
+import hashlib
+from http.server import (
+    SimpleHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+import logging
+import os
+import threading
+from typing import Optional
+
+log = logging.getLogger('sirendb.imaging.static')
+
+
+@lru_cache(maxsize=8)
+def _hash_file(path: str, mtime_ns: int) -> str:
+    with open(path, 'rb') as fp:
+        return hashlib.sha256(fp.read()).hexdigest()
+
+
+def geo_build_version(geo_dir: Optional[str]) -> str:
+    '''
+    Identifies the geo app build. Builds reference their bundles by content
+    hash from index.html, so a new build always changes index.html.
+    '''
+    if not geo_dir:
+        return ''
+
+    path = os.path.join(geo_dir, 'index.html')
+    try:
+        return _hash_file(path, os.stat(path).st_mtime_ns)
+    except OSError:
+        return ''
+
+
+class GeoAppRequestHandler(SimpleHTTPRequestHandler):
+    '''
+    Serves the geo app build, answering every path that is not a file in
+    the build with index.html for the app's own routing.
+    '''
+    def send_head(self):
+        if not os.path.isfile(self.translate_path(self.path)):
+            self.path = '/index.html'
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        log.debug(format % args)
+
+
+class StaticServer:
+    '''
+    Threaded HTTP server serving the geo app to Chrome from within the
+    worker process.
+
+    The server is started on first use, bound to a port picked by the
+    operating system, and kept running until the process exits.
+    '''
+    def __init__(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._geo_dir: Optional[str] = None
+
+    def netloc(self, geo_dir: str, host: str = '127.0.0.1') -> str:
+        with self._lock:
+            if self._pid != os.getpid():
+                # The serving thread did not survive the fork.
+                self._pid = os.getpid()
+                self._server = None
+
+            if self._server is not None and (self._geo_dir, self._server.server_address[0]) != (geo_dir, host):
+                self._stop()
+
+            if self._server is None:
+                self._start(geo_dir, host)
+
+            bound_host, port = self._server.server_address[:2]
+            return f'{bound_host}:{port}'
+
+    def _start(self, geo_dir: str, host: str) -> None:
+        handler = partial(GeoAppRequestHandler, directory=geo_dir)
+        server = ThreadingHTTPServer((host, 0), handler)
+        server.daemon_threads = True
+
+        thread = threading.Thread(target=server.serve_forever, name='sirendb-geo-app', daemon=True)
+        thread.start()
+
+        self._server = server
+        self._geo_dir = geo_dir
+        log.debug(f'serving {geo_dir} on {server.server_address[0]}:{server.server_address[1]}')
+
+    def _stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._geo_dir = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._server is not None and self._pid == os.getpid():
+                self._stop()
+
+
+geo_server = StaticServer()
+atexit.register(geo_server.close)
@@ -0,0 +1,100 @@
+import io
+import logging
+from typing import (
+    List,
+    NamedTuple,
+    Sequence,
+)
+
+from PIL import (
+    Image,
+    UnidentifiedImageError,
+)
+
+log = logging.getLogger('sirendb.imaging.variants')
+
+try:
+    import pillow_avif  # noqa: F401
+except ImportError:  # pragma: nocover
+    AVIF_SUPPORTED = False
+else:  # pragma: nocover
+    AVIF_SUPPORTED = True
+
+
+class ImageFormat(NamedTuple):
+    pillow_format: str
+    file_extension: str
+    mimetype: str
+    options: dict
+
+
+IMAGE_FORMATS = {
+    'webp': ImageFormat('WEBP', 'webp', 'image/webp', {'quality': 80, 'method': 4}),
+    'avif': ImageFormat('AVIF', 'avif', 'image/avif', {'quality': 60}),
+}
+
+
+class ImageVariant(NamedTuple):
+    data: bytes
+    file_extension: str
+    mimetype: str
+    width: int
+    height: int
+
+
+def image_size(data: bytes):
+    '''
+    Returns the (width, height) of an image, or None if it can not be read.
+    '''
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            return image.size
+    except (UnidentifiedImageError, OSError):
+        return None
+
+
+def make_variants(data: bytes, formats: Sequence[str], sizes: Sequence[int]) -> List[ImageVariant]:
+    '''
+    Transcodes an image to every format, once at full size and once for
+    every thumbnail size no larger than the image. Thumbnails keep the
+    aspect ratio, sizes being the length of the longest side.
+    '''
+    formats = [
+        name for name in formats
+        if name in IMAGE_FORMATS and (name != 'avif' or AVIF_SUPPORTED)
+    ]
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except (UnidentifiedImageError, OSError):
+        log.exception('unable to read image, no variants made')
+        return []
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+    longest = max(image.size)
+    scaled = [image]
+    for size in sorted(set(sizes), reverse=True):
+        if size >= longest:
+            continue
+        thumbnail = image.copy()
+        thumbnail.thumbnail((size, size), Image.LANCZOS)
+        scaled.append(thumbnail)
+
+    variants = []
+    for name in formats:
+        image_format = IMAGE_FORMATS[name]
+        for scaled_image in scaled:
+            fp = io.BytesIO()
+            scaled_image.save(fp, image_format.pillow_format, **image_format.options)
+            variants.append(ImageVariant(
+                data=fp.getvalue(),
+                file_extension=image_format.file_extension,
+                mimetype=image_format.mimetype,
+                width=scaled_image.width,
+                height=scaled_image.height,
+            ))
+
+    return variants
@@ -0,0 +1,243 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+from logging import getLogger
+import threading
+import time
+from typing import (
+    List,
+    Optional,
+)
+
+from flask import current_app
+import numpy as np
+import sqlalchemy as sa
+
+from sirendb.core.db import db
+from sirendb.core.redis import redis
+from sirendb.models.siren import Siren
+from sirendb.models.siren_location import SirenLocation
+
+from .clusters import (
+    build_clusters,
+    unpack_clusters,
+)
+from .grid import (
+    GridIndex,
+    Neighbor,
+)
+
+log = getLogger('sirendb.lib.spatial')
+
+# Rows committed by transactions that started before the last refresh
+# carry slightly older timestamps, so every refresh looks back this far.
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+CLUSTERS_KEY = 'siren_clusters:{zoom}'
+CLUSTERS_BUILT_KEY = 'siren_clusters:built'
+
+
+def _changed_locations(since: Optional[datetime]):
+    '''
+    Returns the current location of every siren changed since the given
+    time, or of every siren. The location columns are None for sirens
+    without a current location, such as the ones whose only location was
+    just deleted.
+    '''
+    query = sa.select(
+        Siren.id,
+        SirenLocation.id,
+        SirenLocation.satellite_latitude,
+        SirenLocation.satellite_longitude,
+        SirenLocation.removal_timestamp,
+        sa.func.greatest(
+            Siren.created_timestamp,
+            Siren.updated_timestamp,
+            SirenLocation.created_timestamp,
+            SirenLocation.updated_timestamp,
+        ),
+    ).outerjoin(
+        SirenLocation, Siren.current_location_id == SirenLocation.id
+    )
+    if since is not None:
+        # Changing a siren's current location updates the siren as well.
+        query = query.where(sa.or_(
+            Siren.created_timestamp > since,
+            Siren.updated_timestamp > since,
+            SirenLocation.created_timestamp > since,
+            SirenLocation.updated_timestamp > since,
+        ))
+    return db.session.execute(query).all()
+
+
+class SpatialIndex:
+    '''
+    In-process nearest neighbour index over the current siren locations.
+
+    The index is built from the current location of every siren with
+    satellite coordinates that was not removed, and brought up to date
+    with the sirens and locations created or updated since, at most every
+    SPATIAL_INDEX_REFRESH_INTERVAL seconds. Searches always run against a
+    complete snapshot, a refresh swaps the snapshot out once the new one
+    is ready.
+    '''
+    def __init__(self):
+        self.grid: Optional[GridIndex] = None
+        self.refreshed_at = 0.0
+        self.rebuilt_at = 0.0
+        self.last_change: Optional[datetime] = None
+        self.refresh_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.grid = None
+        self.last_change = None
+
+        if app.config.get('SPATIAL_INDEX_PRELOAD', True):
+            with app.app_context():
+                try:
+                    self.refresh(full=True)
+                except sa.exc.SQLAlchemyError:
+                    # The database may not be migrated yet, the first search
+                    # builds the index instead.
+                    log.warning('could not preload the spatial index', exc_info=True)
+
+    def _build(self, rows, grid: Optional[GridIndex]) -> GridIndex:
+        cell_degrees = current_app.config.get('SPATIAL_INDEX_CELL_DEGREES', 0.25)
+
+        changed_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        rows = [
+            row for row in rows
+            if row[1] is not None and row[2] is not None and row[3] is not None and row[4] is None
+        ]
+
+        siren_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        location_ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+        latitudes = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+        longitudes = np.fromiter((row[3] for row in rows), dtype=np.float64, count=len(rows))
+
+        if grid is not None:
+            # Replace the locations of the changed sirens, indexed or not.
+            keep = ~np.isin(grid.siren_ids, changed_ids)
+            location_ids = np.concatenate([grid.location_ids[keep], location_ids])
+            siren_ids = np.concatenate([grid.siren_ids[keep], siren_ids])
+            latitudes = np.concatenate([grid.latitudes[keep], latitudes])
+            longitudes = np.concatenate([grid.longitudes[keep], longitudes])
+
+        return GridIndex(location_ids, siren_ids, latitudes, longitudes, cell_degrees=cell_degrees)
+
+    def refresh(self, full: bool = False) -> None:
+        '''
+        Brings the index up to date. A full refresh rebuilds it from scratch,
+        which is also the only way deleted sirens are dropped.
+        '''
+        full = full or self.grid is None or self.last_change is None
+        requested_at = time.monotonic()
+        if not self.refresh_lock.acquire(blocking=full):
+            # Someone else is already refreshing, the current snapshot will do.
+            return
+
+        try:
+            if full and self.rebuilt_at >= requested_at:
+                # Rebuilt while waiting for the lock.
+                return
+
+            started_at = time.monotonic()
+            since = None if full else self.last_change - REFRESH_OVERLAP
+            rows = _changed_locations(since)
+
+            if full or rows:
+                self.grid = self._build(rows, None if full else self.grid)
+
+            changes = [row[5] for row in rows if row[5] is not None]
+            if self.last_change is not None and not full:
+                changes.append(self.last_change)
+            if changes:
+                self.last_change = max(changes)
+
+            now = time.monotonic()
+            self.refreshed_at = now
+            if full:
+                self.rebuilt_at = now
+
+            log.debug(
+                f'refreshed spatial index with {len(rows)} siren(s) '
+                f'in {now - started_at:.3f}s, {len(self.grid)} indexed'
+            )
+        finally:
+            self.refresh_lock.release()
+
+    def nearest(self, latitude: float, longitude: float, k: int) -> List[Neighbor]:
+        now = time.monotonic()
+        if self.grid is None or now - self.rebuilt_at >= current_app.config.get('SPATIAL_INDEX_REBUILD_INTERVAL', 3600):
+            self.refresh(full=True)
+        elif now - self.refreshed_at >= current_app.config.get('SPATIAL_INDEX_REFRESH_INTERVAL', 60):
+            self.refresh()
+
+        return self.grid.nearest(latitude, longitude, k)
+
+
+spatial_index = SpatialIndex()
+
+
+def cluster_max_zoom() -> int:
+    return current_app.config.get('SIREN_CLUSTER_MAX_ZOOM', 12)
+
+
+def store_clusters() -> None:
+    '''
+    Precomputes the clusters of the current siren locations for every zoom
+    level and replaces the stored ones in a single transaction.
+
+    Every zoom level is a redis hash of packed clusters keyed by tile.
+    '''
+    started_at = time.monotonic()
+    max_zoom = cluster_max_zoom()
+
+    rows = db.session.execute(
+        sa.select(
+            SirenLocation.satellite_latitude,
+            SirenLocation.satellite_longitude,
+        )
+        .join(Siren, Siren.current_location_id == SirenLocation.id)
+        .where(
+            SirenLocation.satellite_latitude.isnot(None),
+            SirenLocation.satellite_longitude.isnot(None),
+        )
+    ).all()
+    latitudes = np.fromiter((row[0] for row in rows), dtype=np.float64, count=len(rows))
+    longitudes = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+
+    zooms = build_clusters(latitudes, longitudes, max_zoom)
+
+    with redis.pipeline(transaction=True) as pipeline:
+        # Drop zoom levels above a lowered SIREN_CLUSTER_MAX_ZOOM as well.
+        for key in redis.scan_iter(CLUSTERS_KEY.format(zoom='*')):
+            if key.decode() != CLUSTERS_BUILT_KEY:
+                pipeline.delete(key)
+
+        for zoom, tiles in zooms.items():
+            if tiles:
+                pipeline.hset(CLUSTERS_KEY.format(zoom=zoom), mapping={
+                    f'{x}:{y}': data
+                    for (x, y), data in tiles.items()
+                })
+        pipeline.set(CLUSTERS_BUILT_KEY, max_zoom)
+        pipeline.execute()
+
+    log.debug(f'stored clusters of {len(rows)} location(s) in {time.monotonic() - started_at:.3f}s')
+
+
+def tile_clusters(zoom: int, x: int, y: int) -> Optional[np.ndarray]:
+    '''
+    Returns the clusters within a tile, or None when they were never built
+    for this zoom level.
+    '''
+    with redis.pipeline(transaction=False) as pipeline:
+        pipeline.get(CLUSTERS_BUILT_KEY)
+        pipeline.hget(CLUSTERS_KEY.format(zoom=zoom), f'{x}:{y}')
+        built_max_zoom, data = pipeline.execute()
+
+    if built_max_zoom is None or int(built_max_zoom) < zoom:
+        return None
+    return unpack_clusters(data or b'')
@@ -0,0 +1,103 @@
+import math
+from typing import (
+    Dict,
+    Iterator,
+    Tuple,
+)
+
+import numpy as np
+
+# Clusters are cells of a grid over every 256px map tile.
+CELLS_PER_TILE = 4
+
+# Web mercator can not represent the poles.
+MAX_LATITUDE = 85.05112878
+
+CLUSTER_DTYPE = np.dtype([
+    ('latitude', '<f4'),
+    ('longitude', '<f4'),
+    ('count', '<u4'),
+])
+
+
+def mercator(latitudes: np.ndarray, longitudes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Projects coordinates on to the unit square, (0, 0) being the
+    north-west corner of the map.
+    '''
+    latitudes = np.radians(np.clip(latitudes, -MAX_LATITUDE, MAX_LATITUDE))
+    x = (np.asarray(longitudes, dtype=np.float64) + 180) / 360
+    y = (1 - np.log(np.tan(latitudes) + 1 / np.cos(latitudes)) / math.pi) / 2
+    return np.clip(x, 0, 1 - 1e-12), np.clip(y, 0, 1 - 1e-12)
+
+
+def cluster_zoom(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    zoom: int,
+) -> Iterator[Tuple[Tuple[int, int], np.ndarray]]:
+    '''
+    Groups the coordinates in to clusters for one zoom level.
+
+    Yields every tile holding at least one cluster along with its clusters,
+    each being the centroid and the number of coordinates within a cell.
+    '''
+    if not len(latitudes):
+        return
+
+    tiles = 2 ** zoom
+    cells = tiles * CELLS_PER_TILE
+
+    x, y = mercator(latitudes, longitudes)
+    cell_x = (x * cells).astype(np.int64)
+    cell_y = (y * cells).astype(np.int64)
+
+    keys, inverse, counts = np.unique(cell_y * cells + cell_x, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+
+    clusters = np.empty(len(keys), dtype=CLUSTER_DTYPE)
+    clusters['latitude'] = np.bincount(inverse, weights=latitudes) / counts
+    clusters['longitude'] = np.bincount(inverse, weights=longitudes) / counts
+    clusters['count'] = counts
+
+    # Keys are ordered by cell row first, order them by tile instead.
+    tile_x = (keys % cells) // CELLS_PER_TILE
+    tile_y = (keys // cells) // CELLS_PER_TILE
+    tile_keys = tile_y * tiles + tile_x
+    order = np.argsort(tile_keys, kind='stable')
+    tile_keys = tile_keys[order]
+    clusters = clusters[order]
+
+    unique_tiles, starts = np.unique(tile_keys, return_index=True)
+    stops = np.append(starts[1:], len(tile_keys))
+    for tile_key, start, stop in zip(unique_tiles, starts, stops):
+        yield (int(tile_key % tiles), int(tile_key // tiles)), clusters[start:stop]
+
+
+def pack_clusters(clusters: np.ndarray) -> bytes:
+    return clusters.astype(CLUSTER_DTYPE, copy=False).tobytes()
+
+
+def unpack_clusters(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=CLUSTER_DTYPE)
+
+
+def build_clusters(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    max_zoom: int,
+) -> Dict[int, Dict[Tuple[int, int], bytes]]:
+    '''
+    Precomputes the packed clusters of every tile for zoom levels 0 up to
+    and including max_zoom.
+    '''
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+
+    return {
+        zoom: {
+            tile: pack_clusters(clusters)
+            for tile, clusters in cluster_zoom(latitudes, longitudes, zoom)
+        }
+        for zoom in range(max_zoom + 1)
+    }
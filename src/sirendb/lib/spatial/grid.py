@@ -0,0 +1,200 @@
+import math
+from typing import (
+    List,
+    NamedTuple,
+)
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+class Neighbor(NamedTuple):
+    location_id: int
+    siren_id: int
+    kilometers: float
+
+
+def haversine_km(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    latitude = math.radians(latitude)
+    longitude = math.radians(longitude)
+    latitudes = np.radians(latitudes)
+    longitudes = np.radians(longitudes)
+
+    a = (
+        np.sin((latitudes - latitude) / 2) ** 2 +
+        math.cos(latitude) * np.cos(latitudes) * np.sin((longitudes - longitude) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(1.0, a)))
+
+
+class GridIndex:
+    '''
+    Immutable equirectangular grid over a set of coordinates.
+
+    Points are sorted by the cell they fall in so every row of cells is
+    a handful of contiguous slices found with a binary search. Nearest
+    neighbour searches walk rings of cells outwards from the queried
+    point until no unvisited cell can be closer than what was found.
+    '''
+    def __init__(
+        self,
+        location_ids: np.ndarray,
+        siren_ids: np.ndarray,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        cell_degrees: float = 0.25,
+    ):
+        self.cell_degrees = cell_degrees
+        self.rows = int(math.ceil(180 / cell_degrees))
+        self.columns = int(math.ceil(360 / cell_degrees))
+
+        keys = self._cell_keys(latitudes, longitudes)
+        order = np.argsort(keys, kind='stable')
+
+        self.keys = keys[order]
+        self.location_ids = np.asarray(location_ids, dtype=np.int64)[order]
+        self.siren_ids = np.asarray(siren_ids, dtype=np.int64)[order]
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)[order]
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)[order]
+
+    def __len__(self) -> int:
+        return len(self.location_ids)
+
+    def _cell_row(self, latitudes):
+        rows = np.floor((np.asarray(latitudes) + 90) / self.cell_degrees).astype(np.int64)
+        return np.clip(rows, 0, self.rows - 1)
+
+    def _cell_column(self, longitudes):
+        columns = np.floor((np.asarray(longitudes) + 180) / self.cell_degrees).astype(np.int64)
+        return np.clip(columns, 0, self.columns - 1)
+
+    def _cell_keys(self, latitudes, longitudes) -> np.ndarray:
+        return self._cell_row(latitudes) * self.columns + self._cell_column(longitudes)
+
+    def _ring(self, row: int, column: int, radius: int) -> np.ndarray:
+        '''
+        Returns the indexes of every point in the cells exactly radius
+        cells away from (row, column).
+        '''
+        first_keys = []
+        last_keys = []
+
+        for ring_row in range(max(0, row - radius), min(self.rows - 1, row + radius) + 1):
+            if abs(ring_row - row) == radius:
+                spans = [(column - radius, column + radius)]
+            else:
+                spans = [(column - radius, column - radius), (column + radius, column + radius)]
+
+            for first, last in spans:
+                if last - first + 1 >= self.columns:
+                    first, last = 0, self.columns - 1
+                first %= self.columns
+                last %= self.columns
+
+                # Spans crossing the antimeridian are split in two.
+                if first <= last:
+                    ranges = [(first, last)]
+                else:
+                    ranges = [(first, self.columns - 1), (0, last)]
+
+                for first_column, last_column in ranges:
+                    first_keys.append(ring_row * self.columns + first_column)
+                    last_keys.append(ring_row * self.columns + last_column)
+
+        if not first_keys:
+            return np.empty(0, dtype=np.int64)
+
+        starts = np.searchsorted(self.keys, first_keys, side='left')
+        stops = np.searchsorted(self.keys, last_keys, side='right')
+        return np.concatenate([
+            np.arange(start, stop)
+            for start, stop in zip(starts, stops)
+            if stop > start
+        ] or [np.empty(0, dtype=np.int64)])
+
+    def _unvisited_bound_km(self, latitude: float, longitude: float, row: int, column: int, radius: int) -> float:
+        '''
+        Lower bound for the distance to any point outside of the cells
+        within radius of (row, column).
+        '''
+        bounds = []
+
+        south = -90 + (row - radius) * self.cell_degrees
+        north = -90 + (row + radius + 1) * self.cell_degrees
+        if row - radius > 0:
+            bounds.append(math.radians(latitude - south) * EARTH_RADIUS_KM)
+        if row + radius < self.rows - 1:
+            bounds.append(math.radians(north - latitude) * EARTH_RADIUS_KM)
+
+        if 2 * radius + 1 < self.columns:
+            west = -180 + (column - radius) * self.cell_degrees
+            east = -180 + (column + radius + 1) * self.cell_degrees
+            longitude_delta = math.radians(min(longitude - west, east - longitude))
+            # Degrees of longitude are the shortest on the edge of these
+            # rows closest to a pole.
+            widest = max(abs(max(south, -90)), abs(min(north, 90)))
+            cos_latitude = max(0.0, math.cos(math.radians(widest)))
+            bounds.append(
+                2 * EARTH_RADIUS_KM * math.asin(min(1.0, cos_latitude * math.sin(min(longitude_delta, math.pi) / 2)))
+            )
+
+        return min(bounds) if bounds else math.inf
+
+    def nearest(self, latitude: float, longitude: float, k: int) -> List[Neighbor]:
+        '''
+        Returns up to k points closest to the given coordinates, at most one
+        per siren, closest first.
+        '''
+        if k <= 0 or not len(self):
+            return []
+
+        row = int(self._cell_row(latitude))
+        column = int(self._cell_column(longitude))
+        max_radius = max(self.rows, self.columns // 2 + 1)
+
+        candidates = []
+        candidate_count = 0
+        for radius in range(max_radius + 1):
+            # Past this point walking the grid costs more than measuring
+            # the distance to every point.
+            if (2 * radius + 1) ** 2 > len(self):
+                break
+
+            ring = self._ring(row, column, radius)
+            if len(ring):
+                candidates.append(ring)
+                candidate_count += len(ring)
+
+            if candidate_count < k:
+                continue
+
+            bound = self._unvisited_bound_km(latitude, longitude, row, column, radius)
+
+            # Rings wrapping around the globe may visit a cell twice.
+            indexes = np.unique(np.concatenate(candidates))
+            neighbors = self._closest(latitude, longitude, indexes, k)
+            if bound == math.inf or (len(neighbors) == k and neighbors[-1].kilometers <= bound):
+                return neighbors
+
+        return self._closest(latitude, longitude, np.arange(len(self)), k)
+
+    def _closest(self, latitude: float, longitude: float, indexes: np.ndarray, k: int) -> List[Neighbor]:
+        distances = haversine_km(latitude, longitude, self.latitudes[indexes], self.longitudes[indexes])
+        order = np.argsort(distances, kind='stable')
+        indexes = indexes[order]
+        distances = distances[order]
+
+        # Keep the closest location of every siren.
+        _, first = np.unique(self.siren_ids[indexes], return_index=True)
+        first.sort()
+        first = first[:k]
+
+        return [
+            Neighbor(
+                location_id=int(self.location_ids[indexes[position]]),
+                siren_id=int(self.siren_ids[indexes[position]]),
+                kilometers=float(distances[position]),
+            )
+            for position in first
+        ]
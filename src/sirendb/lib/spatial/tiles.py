@@ -0,0 +1,165 @@
+import math
+from typing import (
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+from flask import current_app
+import numpy as np
+import sqlalchemy as sa
+
+from sirendb.core.redis import redis
+from sirendb.models.siren_location import SirenLocation
+
+from .clusters import (
+    MAX_LATITUDE,
+    mercator,
+)
+
+TILE_HEADER_DTYPE = np.dtype('<u4')
+
+TILE_KEY = 'siren_tile:{zoom}:{x}:{y}'
+
+# Cache keys to drop once again after the transaction that changed their
+# locations commits, in case a request cached the old tile in between.
+STALE_TILES = 'sirendb.stale_tiles'
+
+
+def tile_max_zoom() -> int:
+    return current_app.config.get('SIREN_TILE_MAX_ZOOM', 14)
+
+
+def tile_bounds(zoom: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    '''
+    Returns the (west, south, east, north) edges of a web mercator tile.
+
+    The first and last rows of tiles extend to the poles, holding whatever
+    web mercator can not represent.
+    '''
+    tiles = 2 ** zoom
+
+    def latitude(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / tiles))))
+
+    west = x / tiles * 360 - 180
+    east = (x + 1) / tiles * 360 - 180
+    north = 90.0 if y == 0 else min(MAX_LATITUDE, latitude(y))
+    south = -90.0 if y == tiles - 1 else max(-MAX_LATITUDE, latitude(y + 1))
+    return west, south, east, north
+
+
+def point_tiles(latitudes: np.ndarray, longitudes: np.ndarray, zoom: int) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Returns the x and y of the tile every coordinate falls in.
+    '''
+    tiles = 2 ** zoom
+    x, y = mercator(latitudes, longitudes)
+    return (x * tiles).astype(np.int64), (y * tiles).astype(np.int64)
+
+
+def tiles_containing(latitude: float, longitude: float, max_zoom: int) -> Iterator[Tuple[int, int, int]]:
+    '''
+    Yields the (zoom, x, y) of the tile holding a coordinate for every zoom
+    level up to and including max_zoom.
+    '''
+    latitudes = np.array([latitude], dtype=np.float64)
+    longitudes = np.array([longitude], dtype=np.float64)
+    for zoom in range(max_zoom + 1):
+        x, y = point_tiles(latitudes, longitudes, zoom)
+        yield zoom, int(x[0]), int(y[0])
+
+
+def pack_tile(
+    location_ids: np.ndarray,
+    siren_ids: np.ndarray,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+) -> bytes:
+    '''
+    Packs the locations of a tile column by column, all little-endian:
+    a uint32 count followed by the float32 latitudes, float32 longitudes,
+    uint32 location ids and uint32 siren ids.
+    '''
+    count = len(location_ids)
+    return b''.join((
+        np.array([count], dtype=TILE_HEADER_DTYPE).tobytes(),
+        np.asarray(latitudes, dtype='<f4').tobytes(),
+        np.asarray(longitudes, dtype='<f4').tobytes(),
+        np.asarray(location_ids, dtype='<u4').tobytes(),
+        np.asarray(siren_ids, dtype='<u4').tobytes(),
+    ))
+
+
+def unpack_tile(data: bytes) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Reverses pack_tile, returning (location_ids, siren_ids, latitudes, longitudes).
+    '''
+    count = int(np.frombuffer(data, dtype=TILE_HEADER_DTYPE, count=1)[0])
+    offset = TILE_HEADER_DTYPE.itemsize
+    columns = []
+    for dtype in ('<f4', '<f4', '<u4', '<u4'):
+        columns.append(np.frombuffer(data, dtype=dtype, count=count, offset=offset))
+        offset += count * 4
+    latitudes, longitudes, location_ids, siren_ids = columns
+    return location_ids, siren_ids, latitudes, longitudes
+
+
+def _invalidate(target: SirenLocation, coordinates: Iterable[Tuple[Optional[float], Optional[float]]]) -> None:
+    max_zoom = tile_max_zoom()
+    keys = {
+        TILE_KEY.format(zoom=zoom, x=x, y=y)
+        for latitude, longitude in coordinates
+        if latitude is not None and longitude is not None
+        for zoom, x, y in tiles_containing(latitude, longitude, max_zoom)
+    }
+    if not keys:
+        return
+
+    redis.delete(*keys)
+    session = sa.orm.object_session(target)
+    if session is not None:
+        session.info.setdefault(STALE_TILES, set()).update(keys)
+
+
+def _previous(state, key: str):
+    history = state.attrs[key].history
+    return history.deleted[0] if history.deleted else getattr(state.object, key)
+
+
+@sa.event.listens_for(SirenLocation, 'after_insert')
+def _location_inserted(mapper, connection, target: SirenLocation):
+    _invalidate(target, [(target.satellite_latitude, target.satellite_longitude)])
+
+
+@sa.event.listens_for(SirenLocation, 'after_update')
+def _location_updated(mapper, connection, target: SirenLocation):
+    state = sa.inspect(target)
+    if not any(
+        state.attrs[key].history.has_changes()
+        for key in ('satellite_latitude', 'satellite_longitude', 'removal_timestamp', 'siren_id')
+    ):
+        return
+
+    _invalidate(target, [
+        (_previous(state, 'satellite_latitude'), _previous(state, 'satellite_longitude')),
+        (target.satellite_latitude, target.satellite_longitude),
+    ])
+
+
+@sa.event.listens_for(SirenLocation, 'after_delete')
+def _location_deleted(mapper, connection, target: SirenLocation):
+    _invalidate(target, [(target.satellite_latitude, target.satellite_longitude)])
+
+
+@sa.event.listens_for(sa.orm.Session, 'after_commit')
+def _session_committed(session):
+    keys = session.info.pop(STALE_TILES, None)
+    if keys:
+        redis.delete(*keys)
+
+
+@sa.event.listens_for(sa.orm.Session, 'after_rollback')
+def _session_rolled_back(session):
+    session.info.pop(STALE_TILES, None)
@@ -1,5 +1,9 @@
+import io
 import secrets
-from typing import Optional
+from typing import (
+    BinaryIO,
+    Optional,
+)
 
 from sirendb.core.redis import redis
 
@@ -24,5 +28,21 @@ class StorageBase:
     def get(self, key: str) -> Optional[bytes]:
         pass
 
+    def path(self, key: str) -> Optional[str]:
+        '''
+        Returns the local path of the file, for backends keeping their files
+        on the filesystem, so they can be sent without being read first.
+        '''
+        return None
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        '''
+        Returns a binary file object reading the file.
+        '''
+        data = self.get(key)
+        if data is None:
+            return None
+        return io.BytesIO(data)
+
     def delete(self, key: str) -> bool:
         pass
@@ -1,5 +1,8 @@
 from pathlib import Path
-from typing import Optional
+from typing import (
+    BinaryIO,
+    Optional,
+)
 
 from .base import StorageBase
 from .results import SaveResult
@@ -10,14 +13,36 @@ class FilesystemBackend(StorageBase):
         self._path = config.get('path', '')
         super().__init__(config)
 
+    def path(self, filesystem_uri: str) -> Optional[str]:
+        return filesystem_uri.removeprefix('filesystem://') or None
+
     def get(self, filesystem_uri: str) -> Optional[bytes]:
-        filesystem_path = filesystem_uri.removeprefix('filesystem://')
+        filesystem_path = self.path(filesystem_uri)
         if filesystem_path:
             with open(filesystem_path, 'br') as fp:
                 data = fp.read()
             return data
         return None
 
+    def open(self, filesystem_uri: str) -> Optional[BinaryIO]:
+        filesystem_path = self.path(filesystem_uri)
+        if not filesystem_path:
+            return None
+        try:
+            return Path(filesystem_path).open('br')
+        except FileNotFoundError:
+            return None
+
+    def delete(self, filesystem_uri: str) -> bool:
+        filesystem_path = self.path(filesystem_uri)
+        if not filesystem_path:
+            return False
+        try:
+            Path(filesystem_path).unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
     def save(self, data: bytes, file_extension: str, mime_type: str) -> Optional[SaveResult]:
         filesystem_key = self.generate_key()
         filename = f'{filesystem_key}.{file_extension}'
@@ -17,3 +17,6 @@ class TestingBackend(StorageBase):
             filesystem_key=filesystem_key,
             filesystem_uri=filesystem_uri,
         )
+
+    def delete(self, filesystem_uri: str) -> bool:
+        return filesystem_uri.startswith('testing://')
@@ -0,0 +1,49 @@
+"""trigram indexes for string filters
+
+Revision ID: 57a3625fdbf9
+Revises: 35e4646ce6e3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '57a3625fdbf9'
+down_revision = '35e4646ce6e3'
+branch_labels = None
+depends_on = None
+
+# Every string column exposed through a generated Filter type.
+TRIGRAM_COLUMNS = (
+    ('siren_manufacturers', 'info'),
+    ('siren_manufacturers', 'name'),
+    ('siren_models', 'info'),
+    ('siren_models', 'name'),
+    ('siren_models', 'revision'),
+    ('siren_systems', 'city'),
+    ('siren_systems', 'country'),
+    ('siren_systems', 'county'),
+    ('siren_systems', 'name'),
+    ('siren_systems', 'postal_code'),
+    ('siren_systems', 'siren_wiki_url'),
+    ('siren_systems', 'state'),
+)
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    for table_name, column_name in TRIGRAM_COLUMNS:
+        op.create_index(
+            f'ix_{table_name}_{column_name}_trgm',
+            table_name,
+            [column_name],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column_name: 'gin_trgm_ops'},
+        )
+
+
+def downgrade():
+    for table_name, column_name in reversed(TRIGRAM_COLUMNS):
+        op.drop_index(f'ix_{table_name}_{column_name}_trgm', table_name=table_name)
@@ -0,0 +1,29 @@
+"""spatial index for siren locations
+
+Revision ID: 6e02b4c1f9d8
+Revises: d83b5f0e6a21
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '6e02b4c1f9d8'
+down_revision = 'd83b5f0e6a21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_siren_locations_satellite_point',
+        'siren_locations',
+        [sa.text('point(satellite_longitude, satellite_latitude)')],
+        unique=False,
+        postgresql_using='gist',
+    )
+
+
+def downgrade():
+    op.drop_index('ix_siren_locations_satellite_point', table_name='siren_locations')
@@ -0,0 +1,43 @@
+"""siren location sort indexes
+
+Revision ID: e4d7a1b9c2f5
+Revises: c71f2a9e4b60
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e4d7a1b9c2f5'
+down_revision = 'c71f2a9e4b60'
+branch_labels = None
+depends_on = None
+
+# Every siren_locations column the sirenLocations field sorts by.
+SORTED_COLUMNS = (
+    'satellite_latitude',
+    'satellite_longitude',
+    'satellite_zoom',
+    'street_latitude',
+    'street_longitude',
+    'street_heading',
+    'street_pitch',
+    'street_zoom',
+    'installation_timestamp',
+    'removal_timestamp',
+)
+
+
+def upgrade():
+    for column_name in SORTED_COLUMNS:
+        op.create_index(
+            f'ix_siren_locations_{column_name}_id',
+            'siren_locations',
+            [column_name, 'id'],
+            unique=False,
+        )
+
+
+def downgrade():
+    for column_name in reversed(SORTED_COLUMNS):
+        op.drop_index(f'ix_siren_locations_{column_name}_id', table_name='siren_locations')
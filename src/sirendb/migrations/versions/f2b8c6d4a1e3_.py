@@ -0,0 +1,31 @@
+"""delete siren media variants along with their original
+
+Revision ID: f2b8c6d4a1e3
+Revises: e4d7a1b9c2f5
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f2b8c6d4a1e3'
+down_revision = 'e4d7a1b9c2f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_constraint('siren_media_variant_of_id_fkey', 'siren_media', type_='foreignkey')
+    op.create_foreign_key(
+        'siren_media_variant_of_id_fkey',
+        'siren_media',
+        'siren_media',
+        ['variant_of_id'],
+        ['id'],
+        ondelete='CASCADE',
+    )
+
+
+def downgrade():
+    op.drop_constraint('siren_media_variant_of_id_fkey', 'siren_media', type_='foreignkey')
+    op.create_foreign_key('siren_media_variant_of_id_fkey', 'siren_media', 'siren_media', ['variant_of_id'], ['id'])
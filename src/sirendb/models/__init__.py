@@ -5,3 +5,7 @@ from . import siren_location
 from . import siren_media
 from . import siren
 from . import user
+
+# Registers the listeners dropping the cached tiles of changed locations,
+# whichever part of the code changes them.
+from sirendb.lib.spatial import tiles  # noqa
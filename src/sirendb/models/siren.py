@@ -1,3 +1,9 @@
+from typing import (
+    Iterable,
+    Optional,
+)
+
+import sqlalchemy as sa
 from sqlalchemy.sql import func
 
 from sirendb.core.db import db
@@ -23,6 +29,7 @@ class Siren(db.Model):
     model_id = db.Column(
         db.Integer,
         db.ForeignKey('siren_models.id'),
+        index=True,
         nullable=False,
         doc=(
             "Identifies the model's primary key from the database."
@@ -41,6 +48,7 @@ class Siren(db.Model):
     )
     created_by_id = db.Column(
         db.ForeignKey('users.id'),
+        index=True,
         nullable=False,
         doc='id of the user who created this entry.',
     )
@@ -52,9 +60,24 @@ class Siren(db.Model):
     )
     updated_by_id = db.Column(
         db.ForeignKey('users.id'),
+        index=True,
         default=None,
         doc='id of the last user who updated this entry.'
     )
+    current_location_id = db.Column(
+        db.Integer,
+        db.ForeignKey(
+            'siren_locations.id',
+            use_alter=True,
+            name='sirens_current_location_id_fkey',
+        ),
+        index=True,
+        default=None,
+        doc=(
+            "Identifies the primary key of the siren's current location. "
+            'This is maintained whenever a location is written.'
+        )
+    )
     model = db.relationship(
         'SirenModel',
         foreign_keys=[model_id],
@@ -63,6 +86,7 @@ class Siren(db.Model):
     )
     locations = db.relationship(
         'SirenLocation',
+        foreign_keys=[SirenLocation.siren_id],
         lazy='dynamic',
     )
     created_by = db.relationship(
@@ -77,3 +101,73 @@ class Siren(db.Model):
         uselist=False,
         doc='The user who last updated this siren entry.',
     )
+
+
+# The most recently installed location is the siren's current location.
+CURRENT_LOCATION_ORDER = (
+    SirenLocation.installation_timestamp.desc(),
+    SirenLocation.created_timestamp.desc(),
+    SirenLocation.id.desc(),
+)
+
+
+def update_current_locations(siren_ids: Optional[Iterable[int]] = None) -> sa.sql.Update:
+    '''
+    Builds an UPDATE pointing sirens.current_location_id at each siren's
+    current location. Every siren is updated when siren_ids is None.
+    '''
+    sirens = Siren.__table__
+    current_location = sa.select(
+        SirenLocation.id
+    ).where(
+        SirenLocation.siren_id == sirens.c.id
+    ).order_by(
+        *CURRENT_LOCATION_ORDER
+    ).limit(1).scalar_subquery()
+
+    statement = sa.update(sirens).values(
+        current_location_id=current_location,
+    ).where(
+        sirens.c.current_location_id.is_distinct_from(current_location)
+    )
+    if siren_ids is not None:
+        statement = statement.where(sirens.c.id.in_(list(siren_ids)))
+    return statement
+
+
+@sa.event.listens_for(SirenLocation, 'after_insert')
+def _location_inserted(mapper, connection, target: SirenLocation):
+    connection.execute(update_current_locations([target.siren_id]))
+
+
+@sa.event.listens_for(SirenLocation, 'after_update')
+def _location_updated(mapper, connection, target: SirenLocation):
+    state = sa.inspect(target)
+    if not any(
+        state.attrs[key].history.has_changes()
+        for key in ('siren_id', 'installation_timestamp', 'created_timestamp')
+    ):
+        return
+
+    # Moving a location to another siren changes both sirens.
+    siren_ids = {target.siren_id}
+    siren_ids.update(state.attrs.siren_id.history.deleted)
+    siren_ids.discard(None)
+    connection.execute(update_current_locations(siren_ids))
+
+
+@sa.event.listens_for(SirenLocation, 'before_delete')
+def _location_deleting(mapper, connection, target: SirenLocation):
+    sirens = Siren.__table__
+    connection.execute(
+        sa.update(sirens).values(
+            current_location_id=None,
+        ).where(
+            sirens.c.current_location_id == target.id
+        )
+    )
+
+
+@sa.event.listens_for(SirenLocation, 'after_delete')
+def _location_deleted(mapper, connection, target: SirenLocation):
+    connection.execute(update_current_locations([target.siren_id]))
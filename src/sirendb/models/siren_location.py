@@ -33,6 +33,7 @@ class SirenLocation(db.Model):
     )
     created_by_id = db.Column(
         db.ForeignKey('users.id'),
+        index=True,
         nullable=False,
         doc='id of the user who created this entry.',
     )
@@ -44,18 +45,28 @@ class SirenLocation(db.Model):
     )
     updated_by_id = db.Column(
         db.ForeignKey('users.id'),
+        index=True,
         default=None,
         doc='id of the last user who updated this entry.'
     )
-    satellite_latitude = db.Column(
-        DOUBLE_PRECISION,
-        default=None,
-        doc="The location's satellite view latitude."
-    )
-    satellite_longitude = db.Column(
-        DOUBLE_PRECISION,
-        default=None,
-        doc="The location's satellite view longitude."
+    # The previous coordinates are loaded when they are changed, even if
+    # they were never loaded before, to find the map tiles the location is
+    # moved out of.
+    satellite_latitude = db.column_property(
+        db.Column(
+            DOUBLE_PRECISION,
+            default=None,
+            doc="The location's satellite view latitude."
+        ),
+        active_history=True,
+    )
+    satellite_longitude = db.column_property(
+        db.Column(
+            DOUBLE_PRECISION,
+            default=None,
+            doc="The location's satellite view longitude."
+        ),
+        active_history=True,
     )
     satellite_zoom = db.Column(
         DOUBLE_PRECISION,
@@ -89,11 +100,13 @@ class SirenLocation(db.Model):
     )
     siren_id = db.Column(
         db.ForeignKey('sirens.id'),
+        index=True,
         nullable=False,
         doc="Identifies the siren's primary key from the database."
     )
     system_id = db.Column(
         db.ForeignKey('siren_systems.id'),
+        index=True,
         default=None,
         doc="Identifies the system's primary key from the database."
     )
@@ -125,9 +138,10 @@ class SirenLocation(db.Model):
     )
     media = db.relationship(
         'SirenMedia',
+        primaryjoin='and_(SirenLocation.id == SirenMedia.location_id, SirenMedia.variant_of_id.is_(None))',
         uselist=True,
         back_populates='location',
-        doc='media associated with this location.',
+        doc='media associated with this location, without their variants.',
     )
     created_by = db.relationship(
         'User',
@@ -173,6 +187,31 @@ class SirenLocation(db.Model):
             return None
 
 
+# Spatial index over the satellite coordinates for map searches.
+db.Index(
+    'ix_siren_locations_satellite_point',
+    func.point(SirenLocation.satellite_longitude, SirenLocation.satellite_latitude),
+    postgresql_using='gist',
+)
+
+# Paginated fields sort by a column and then by id, so these B-tree
+# indexes serve both the sorts and the filters on each column.
+SORTED_COLUMNS = (
+    'satellite_latitude',
+    'satellite_longitude',
+    'satellite_zoom',
+    'street_latitude',
+    'street_longitude',
+    'street_heading',
+    'street_pitch',
+    'street_zoom',
+    'installation_timestamp',
+    'removal_timestamp',
+)
+for _name in SORTED_COLUMNS:
+    db.Index(f'ix_siren_locations_{_name}_id', SirenLocation.__table__.c[_name], SirenLocation.__table__.c.id)
+
+
 class SatelliteCoordinates(NamedTuple):
     latitude: float
     longitude: float
@@ -27,6 +27,7 @@ class SirenManufacturer(db.Model):
     )
     created_by_id = db.Column(
         db.ForeignKey('users.id'),
+        index=True,
         nullable=False,
         doc='id of the user who created this entry.',
     )
@@ -40,6 +41,7 @@ class SirenManufacturer(db.Model):
     )
     updated_by_id = db.Column(
         db.ForeignKey('users.id'),
+        index=True,
         default=None,
         doc='id of the last user who updated this entry.'
     )
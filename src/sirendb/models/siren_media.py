@@ -39,6 +39,7 @@ class SirenMedia(db.Model):
     )
     filename = db.Column(
         db.String,
+        index=True,
         default=None,
         doc='The name of the file.'
     )
@@ -54,14 +55,44 @@ class SirenMedia(db.Model):
     )
     location_id = db.Column(
         db.ForeignKey('siren_locations.id'),
+        index=True,
         nullable=False,
         doc="Identifies the siren location's primary key from the database."
     )
     filesystem_uri = db.Column(
         db.String,
+        index=True,
         nullable=False,
         doc='Identifies the location within the internal filesystem.'
     )
+    width = db.Column(
+        db.Integer,
+        default=None,
+        doc='Width in pixels of this media, if it is an image.'
+    )
+    height = db.Column(
+        db.Integer,
+        default=None,
+        doc='Height in pixels of this media, if it is an image.'
+    )
+    variant_of_id = db.Column(
+        db.ForeignKey('siren_media.id', ondelete='CASCADE'),
+        index=True,
+        default=None,
+        doc=(
+            'id of the media this media was derived from, such as a thumbnail '
+            'or a transcoded copy. This is null for the original media.'
+        )
+    )
+    capture_key = db.Column(
+        db.String,
+        index=True,
+        default=None,
+        doc=(
+            'Hash of what was captured to produce this media, media with the same '
+            'capture key share their files.'
+        )
+    )
     created_timestamp = db.Column(
         db.DateTime,
         nullable=False,
@@ -70,6 +101,7 @@ class SirenMedia(db.Model):
     )
     created_by_id = db.Column(
         db.ForeignKey('users.id'),
+        index=True,
         default=None,
         doc=(
             'id of the user who created this entry. '
@@ -83,6 +115,23 @@ class SirenMedia(db.Model):
         back_populates='media',
         doc='The location associated with this media.',
     )
+    variant_of = db.relationship(
+        'SirenMedia',
+        foreign_keys=[variant_of_id],
+        remote_side=[id],
+        uselist=False,
+        back_populates='variants',
+        doc='The media this media was derived from.',
+    )
+    variants = db.relationship(
+        'SirenMedia',
+        foreign_keys=[variant_of_id],
+        uselist=True,
+        back_populates='variant_of',
+        # Variants are deleted one by one so their files are released.
+        cascade='all, delete-orphan',
+        doc='Thumbnails and transcoded copies of this media.',
+    )
     created_by = db.relationship(
         'User',
         foreign_keys=[created_by_id],
@@ -29,6 +29,7 @@ class SirenModel(db.Model):
     )
     created_by_id = db.Column(
         db.ForeignKey('users.id'),
+        index=True,
         nullable=False,
         doc='id of the user who created this entry.',
     )
@@ -42,6 +43,7 @@ class SirenModel(db.Model):
     )
     updated_by_id = db.Column(
         db.ForeignKey('users.id'),
+        index=True,
         default=None,
         doc='id of the last user who updated this entry.'
     )
@@ -52,6 +54,7 @@ class SirenModel(db.Model):
     )
     manufacturer_id = db.Column(
         db.ForeignKey('siren_manufacturers.id'),
+        index=True,
         default=None,
         doc="Identifies the manufacturer's primary key from the database."
     )
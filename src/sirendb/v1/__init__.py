@@ -2,4 +2,5 @@ from . import auth
 from . import media
 from . import mutations
 from . import queries
+from . import tiles
 from . import types
@@ -1,6 +1,8 @@
-import io
+import os
+from typing import Optional
+from urllib.parse import quote
 
-from flask import Blueprint, abort, send_file
+from flask import Blueprint, abort, current_app, request, send_file
 from flask_login import login_required
 
 from sirendb.models.siren_media import SirenMedia
@@ -9,6 +11,30 @@ from sirendb.lib.storage import storage
 bp = Blueprint('media', __name__)
 
 
+def pick_variant(media: SirenMedia, size: Optional[int], format_: Optional[str]) -> SirenMedia:
+    '''
+    Picks the media or one of its variants: the smallest one in the format
+    whose longest side is at least size pixels, or the largest one.
+    '''
+    media = media.variant_of or media
+    candidates = [media, *media.variants]
+    if format_:
+        candidates = [
+            candidate for candidate in candidates
+            if candidate.mimetype == f'image/{format_}'
+        ] or candidates
+
+    def longest_side(candidate: SirenMedia) -> int:
+        return max(candidate.width or 0, candidate.height or 0)
+
+    if size:
+        large_enough = [candidate for candidate in candidates if longest_side(candidate) >= size]
+        if large_enough:
+            return min(large_enough, key=lambda candidate: (longest_side(candidate), candidate.kilobytes))
+
+    return max(candidates, key=lambda candidate: (longest_side(candidate), -candidate.kilobytes))
+
+
 @bp.route('/media/<string:filename>')
 @login_required
 def get_media(filename: str):
@@ -19,17 +45,46 @@ def get_media(filename: str):
     if not media:
         return abort(404, description='file not found')
 
-    data = storage.get(media.filesystem_uri)
-    if data:
-        fp = io.BytesIO()
-        fp.write(data)
-        fp.seek(0)
+    size = request.args.get('size', type=int)
+    format_ = request.args.get('format')
+    if size or format_:
+        media = pick_variant(media, size, format_)
 
+    if not media.filesystem_uri:
+        return abort(404, description='file not found')
+
+    path = storage.path(media.filesystem_uri)
+    if path:
+        if not os.path.isfile(path):
+            return abort(404, description='file not found')
+
+        # Leave the transfer, ranges included, to nginx serving the
+        # storage directory from an internal location at this prefix.
+        accel_prefix = current_app.config.get('MEDIA_ACCEL_REDIRECT_PREFIX')
+        if accel_prefix:
+            response = current_app.response_class(mimetype=media.mimetype)
+            response.headers['X-Accel-Redirect'] = f'{accel_prefix.rstrip("/")}/{quote(os.path.basename(path))}'
+            response.headers.set('Content-Disposition', 'attachment', filename=media.filename)
+            return response
+
+        # Streamed from disk, or handed to the web server when
+        # USE_X_SENDFILE is set, with Range and conditional requests.
         return send_file(
-            fp,
+            path,
             as_attachment=True,
             attachment_filename=media.filename,
             mimetype=media.mimetype,
+            conditional=True,
         )
-    else:
+
+    fp = storage.open(media.filesystem_uri)
+    if fp is None:
         return abort(404, description='file not found')
+
+    return send_file(
+        fp,
+        as_attachment=True,
+        attachment_filename=media.filename,
+        mimetype=media.mimetype,
+        conditional=True,
+    )
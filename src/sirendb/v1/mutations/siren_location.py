@@ -11,12 +11,14 @@ from sirendb.core.strawberry import (
     GraphQLField,
     GraphQLType,
 )
+from sirendb.jobs.clustering import enqueue_rebuild_clusters
 from sirendb.jobs.imaging import (
-    capture_satellite_image,
-    capture_streetview_image,
+    CaptureRequest,
+    enqueue_captures,
 )
 from sirendb.models.siren import Siren
 from sirendb.models.siren_location import SirenLocation
+from sirendb.models.siren_media import SirenMediaType
 from sirendb.models.siren_system import SirenSystem
 
 from ..types.siren_location import SirenLocationNode
@@ -96,21 +98,29 @@ class Mutation(GraphQLField):
 
         location_id = int(siren_location.id)
 
-        queue = rq.get_queue('imaging_for_api')
-
+        requests = []
         if siren_location.satellite_coordinates:
-            queue.enqueue(capture_satellite_image, args=(
-                siren_location.id,
+            requests.append(CaptureRequest(
+                location_id,
+                SirenMediaType.SATELLITE_IMAGE,
                 siren_location.satellite_coordinates,
-            ), job_timeout=300, description='capture satellite image')
-
-        # TODO: why does this keep expiring?
-        siren_location = SirenLocation.query.get(location_id)
+            ))
         if siren_location.street_coordinates:
-            queue.enqueue(capture_streetview_image, args=(
-                siren_location.id,
+            requests.append(CaptureRequest(
+                location_id,
+                SirenMediaType.STREET_IMAGE,
                 siren_location.street_coordinates,
-            ), job_timeout=300, description='capture streetview image')
+            ))
+
+        if requests:
+            enqueue_captures(
+                rq.get_queue('imaging_for_api'),
+                requests,
+                job_timeout=300,
+                description='capture location images',
+            )
+
+        enqueue_rebuild_clusters()
 
         siren_location = SirenLocation.query.get(location_id)
         return Output(
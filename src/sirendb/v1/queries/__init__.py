@@ -1,3 +1,5 @@
+from . import nearest_sirens
+from . import siren_clusters
 from . import siren_locations
 from . import siren_manufacturer
 from . import siren_models
@@ -0,0 +1,54 @@
+from typing import List
+
+from graphql.error.graphql_error import GraphQLError
+import strawberry
+from strawberry.ast import ast_from_info
+from strawberry.types.info import Info
+
+from sirendb.core.strawberry import GraphQLField
+from sirendb.lib.spatial import spatial_index
+from sirendb.models.siren_location import SirenLocation
+
+from ..types.siren_location import SirenLocationNode
+
+MAX_NEAREST_SIRENS = 100
+
+
+class Query(GraphQLField):
+    __endpoints__ = ('/api/v1/graphql',)
+
+    @strawberry.field(description=(
+        'Current locations of the sirens closest to a point, closest first. '
+        f'k may not exceed {MAX_NEAREST_SIRENS}.'
+    ))
+    def nearest_sirens(self, info: Info, lat: float, lng: float, k: int = 10) -> List[SirenLocationNode]:
+        if not -90 <= lat <= 90:
+            raise GraphQLError('lat must be between -90 and 90')
+        if not -180 <= lng <= 180:
+            raise GraphQLError('lng must be between -180 and 180')
+        if not 0 < k <= MAX_NEAREST_SIRENS:
+            raise GraphQLError(f'k must be between 1 and {MAX_NEAREST_SIRENS}')
+
+        neighbors = spatial_index.nearest(lat, lng, k)
+        if not neighbors:
+            return []
+
+        locations = {
+            location.id: location
+            for location in SirenLocation.query.filter(
+                SirenLocation.id.in_([neighbor.location_id for neighbor in neighbors])
+            )
+        }
+        # The index may be a little behind, skip anything deleted since.
+        rows = [
+            locations[neighbor.location_id]
+            for neighbor in neighbors
+            if neighbor.location_id in locations
+        ]
+
+        ast = ast_from_info(info)
+        return SirenLocationNode.from_sqlalchemy_model(
+            rows,
+            info,
+            request_document=ast.document_python_names[0][1],
+        )
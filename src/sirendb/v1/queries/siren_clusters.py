@@ -0,0 +1,45 @@
+from typing import List
+
+from graphql.error.graphql_error import GraphQLError
+import strawberry
+from strawberry.types.info import Info
+
+from sirendb.core.strawberry import GraphQLField
+from sirendb.jobs.clustering import enqueue_rebuild_clusters
+from sirendb.lib.spatial import (
+    cluster_max_zoom,
+    tile_clusters,
+)
+
+from ..types.siren_cluster import SirenCluster
+
+
+class Query(GraphQLField):
+    __endpoints__ = ('/api/v1/graphql',)
+
+    @strawberry.field(description=(
+        'Clusters of the current siren locations within a web mercator map tile. '
+        'Clusters are refreshed shortly after siren locations change, and are empty until first built.'
+    ))
+    def siren_clusters(self, info: Info, zoom: int, x: int, y: int) -> List[SirenCluster]:
+        max_zoom = cluster_max_zoom()
+        if not 0 <= zoom <= max_zoom:
+            raise GraphQLError(f'zoom must be between 0 and {max_zoom}')
+        if not 0 <= x < 2 ** zoom or not 0 <= y < 2 ** zoom:
+            raise GraphQLError(f'x and y must be between 0 and {2 ** zoom - 1} at zoom {zoom}')
+
+        # Clustering every location is too slow for a request, so clusters
+        # that were never built come back empty until the rebuild is done.
+        clusters = tile_clusters(zoom, x, y)
+        if clusters is None:
+            enqueue_rebuild_clusters()
+            return []
+
+        return [
+            SirenCluster(
+                latitude=float(cluster['latitude']),
+                longitude=float(cluster['longitude']),
+                count=int(cluster['count']),
+            )
+            for cluster in clusters
+        ]
@@ -10,6 +10,10 @@ from sirendb.core.strawberry.field import SortingEnum
 from sirendb.core.strawberry.paginate import Paginate, paginated_field
 from sirendb.models.siren_location import SirenLocation
 
+from ..types.geo import (
+    geo_predicate,
+    GeoSearch,
+)
 from ..types.siren_location import SirenLocationNode
 
 
@@ -20,16 +24,19 @@ class Query(GraphQLField):
     @paginated_field(node=SirenLocationNode)
     def siren_locations(
         self,
-        # Custom search
-        # geolocation: Optional[Tuple[float, float]],
-
         # Provided by paginated_field
         info: Info,
         paginate: Optional[Paginate] = None,
         sort: Optional[SortingEnum] = None,
         filter: Optional[Any] = None,
+
+        # Custom search
+        geo: Optional[GeoSearch] = None,
     ):
         '''
         Return siren locations.
         '''
-        return SirenLocation.query
+        query = SirenLocation.query
+        if geo is not None:
+            query = query.filter(geo_predicate(geo))
+        return query
@@ -3,13 +3,19 @@ from typing import (
     Optional,
 )
 
+import sqlalchemy as sa
 from strawberry.types.info import Info
 
 from sirendb.core.strawberry import GraphQLField
 from sirendb.core.strawberry.field import SortingEnum
 from sirendb.core.strawberry.paginate import Paginate, paginated_field
 from sirendb.models.siren import Siren
+from sirendb.models.siren_location import SirenLocation
 
+from ..types.geo import (
+    geo_predicate,
+    GeoSearch,
+)
 from ..types.siren import SirenNode
 
 
@@ -19,16 +25,22 @@ class Query(GraphQLField):
     @paginated_field(node=SirenNode)
     def sirens(
         self,
-        # Custom search
-        # geolocation: Optional[Tuple[float, float]],
-
         # Provided by paginated_field
         info: Info,
         paginate: Optional[Paginate] = None,
         sort: Optional[SortingEnum] = None,
         filter: Optional[Any] = None,
+
+        # Custom search
+        geo: Optional[GeoSearch] = None,
     ):
         '''
         Allows you to search through the list of sirens known to SirenDB.
         '''
-        return Siren.query
+        query = Siren.query
+        if geo is not None:
+            # Sirens are located by their current location.
+            query = query.filter(Siren.current_location_id.in_(
+                sa.select(SirenLocation.id).where(geo_predicate(geo))
+            ))
+        return query
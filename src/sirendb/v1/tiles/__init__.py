@@ -0,0 +1,76 @@
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    current_app,
+)
+from flask_login import login_required
+import numpy as np
+import sqlalchemy as sa
+
+from sirendb.core.db import db
+from sirendb.core.redis import redis
+from sirendb.lib.spatial.tiles import (
+    TILE_KEY,
+    pack_tile,
+    point_tiles,
+    tile_bounds,
+    tile_max_zoom,
+)
+from sirendb.models.siren_location import SirenLocation
+from sirendb.v1.types.geo import (
+    BoundingBox,
+    GeoSearch,
+    geo_predicate,
+)
+
+bp = Blueprint('tiles', __name__)
+
+TILE_MIMETYPE = 'application/octet-stream'
+
+
+def _build_tile(zoom: int, x: int, y: int) -> bytes:
+    west, south, east, north = tile_bounds(zoom, x, y)
+    rows = db.session.execute(
+        sa.select(
+            SirenLocation.id,
+            SirenLocation.siren_id,
+            SirenLocation.satellite_latitude,
+            SirenLocation.satellite_longitude,
+        ).where(
+            geo_predicate(GeoSearch(bbox=BoundingBox(south=south, west=west, north=north, east=east))),
+            SirenLocation.removal_timestamp.is_(None),
+        ).order_by(
+            SirenLocation.id
+        )
+    ).all()
+
+    location_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    siren_ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+    latitudes = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+    longitudes = np.fromiter((row[3] for row in rows), dtype=np.float64, count=len(rows))
+
+    # Locations on the edge of the box belong to a single tile.
+    tile_x, tile_y = point_tiles(latitudes, longitudes, zoom)
+    keep = (tile_x == x) & (tile_y == y)
+
+    return pack_tile(location_ids[keep], siren_ids[keep], latitudes[keep], longitudes[keep])
+
+
+@bp.route('/tiles/<int:zoom>/<int:x>/<int:y>.bin')
+@login_required
+def get_tile(zoom: int, x: int, y: int):
+    '''
+    Serves the installed siren locations within a web mercator tile,
+    packed as described by sirendb.lib.spatial.tiles.pack_tile.
+    '''
+    if not 0 <= zoom <= tile_max_zoom() or not 0 <= x < 2 ** zoom or not 0 <= y < 2 ** zoom:
+        return abort(404, description='tile not found')
+
+    key = TILE_KEY.format(zoom=zoom, x=x, y=y)
+    data = redis.get(key)
+    if data is None:
+        data = _build_tile(zoom, x, y)
+        redis.set(key, data, ex=current_app.config.get('SIREN_TILE_TTL', 86400))
+
+    return Response(data, mimetype=TILE_MIMETYPE)
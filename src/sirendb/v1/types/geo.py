@@ -0,0 +1,134 @@
+import math
+from typing import Optional
+
+from graphql.error.graphql_error import GraphQLError
+import sqlalchemy as sa
+import strawberry
+
+from sirendb.models.siren_location import SirenLocation
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LATITUDE = 111.32
+
+
+@strawberry.input(description='An area between two latitudes and two longitudes.')
+class BoundingBox:
+    south: float
+    west: float
+    north: float
+    east: float
+
+
+@strawberry.input(description='A circle around a point.')
+class Radius:
+    latitude: float
+    longitude: float
+    kilometers: float
+
+
+@strawberry.input(description=(
+    'Only include items located within an area. Specify exactly one of bbox or radius. '
+    'A bbox whose west edge is east of its east edge wraps around the antimeridian.'
+))
+class GeoSearch:
+    bbox: Optional[BoundingBox] = None
+    radius: Optional[Radius] = None
+
+
+def _check_latitude(latitude: float):
+    if not -90 <= latitude <= 90:
+        raise GraphQLError('latitude must be between -90 and 90')
+
+
+def _check_longitude(longitude: float):
+    if not -180 <= longitude <= 180:
+        raise GraphQLError('longitude must be between -180 and 180')
+
+
+def satellite_point():
+    '''
+    The location's satellite coordinates as a PostgreSQL point, this must
+    match the expression of the ix_siren_locations_satellite_point index.
+    '''
+    return sa.func.point(SirenLocation.satellite_longitude, SirenLocation.satellite_latitude)
+
+
+def _within_box(west: float, south: float, east: float, north: float):
+    point = satellite_point()
+
+    def box(west_, east_):
+        return point.op('<@')(sa.func.box(sa.func.point(west_, south), sa.func.point(east_, north)))
+
+    if west <= east:
+        return box(west, east)
+    return sa.or_(box(west, 180.0), box(-180.0, east))
+
+
+def _distance_km(latitude: float, longitude: float):
+    '''
+    Great-circle distance between the location and a point (haversine).
+    '''
+    location_latitude = sa.func.radians(SirenLocation.satellite_latitude)
+    location_longitude = sa.func.radians(SirenLocation.satellite_longitude)
+    latitude = math.radians(latitude)
+    longitude = math.radians(longitude)
+
+    a = (
+        sa.func.power(sa.func.sin((location_latitude - latitude) / 2), 2) +
+        sa.func.cos(location_latitude) * math.cos(latitude) *
+        sa.func.power(sa.func.sin((location_longitude - longitude) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * sa.func.asin(sa.func.sqrt(sa.func.least(1.0, a)))
+
+
+def _within_radius(latitude: float, longitude: float, kilometers: float):
+    # Narrow the search down to the enclosing box first, which the index
+    # can answer, then only compute distances for what is left.
+    latitude_delta = kilometers / KM_PER_DEGREE_LATITUDE
+    south = max(-90.0, latitude - latitude_delta)
+    north = min(90.0, latitude + latitude_delta)
+
+    cos_latitude = math.cos(math.radians(max(abs(south), abs(north))))
+    if north == 90.0 or south == -90.0 or cos_latitude <= 0:
+        west, east = -180.0, 180.0
+    else:
+        longitude_delta = kilometers / (KM_PER_DEGREE_LATITUDE * cos_latitude)
+        if longitude_delta >= 180:
+            west, east = -180.0, 180.0
+        else:
+            west = longitude - longitude_delta
+            east = longitude + longitude_delta
+            if west < -180:
+                west += 360
+            if east > 180:
+                east -= 360
+
+    return sa.and_(
+        _within_box(west, south, east, north),
+        _distance_km(latitude, longitude) <= kilometers,
+    )
+
+
+def geo_predicate(search: GeoSearch):
+    '''
+    Builds the filter for SirenLocation rows within the searched area.
+    '''
+    if (search.bbox is None) == (search.radius is None):
+        raise GraphQLError('geo expects exactly one of bbox or radius')
+
+    if search.bbox is not None:
+        bbox = search.bbox
+        for latitude in (bbox.south, bbox.north):
+            _check_latitude(latitude)
+        for longitude in (bbox.west, bbox.east):
+            _check_longitude(longitude)
+        if bbox.south > bbox.north:
+            raise GraphQLError('bbox south may not be north of bbox north')
+        return _within_box(bbox.west, bbox.south, bbox.east, bbox.north)
+
+    radius = search.radius
+    _check_latitude(radius.latitude)
+    _check_longitude(radius.longitude)
+    if radius.kilometers <= 0:
+        raise GraphQLError('radius kilometers must be greater than 0')
+    return _within_radius(radius.latitude, radius.longitude, radius.kilometers)
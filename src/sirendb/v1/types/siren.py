@@ -1,16 +1,62 @@
 from typing import List
 
+import sqlalchemy as sa
 import strawberry
 
+from sirendb.core.db import db
 from sirendb.core.strawberry import GraphQLType
-from sirendb.core.strawberry.type_ import _resolve_sqlalchemy_result
-from sirendb.models.siren import Siren
+from sirendb.core.strawberry.loader import batch_load
+from sirendb.core.strawberry.type_ import (
+    _resolve_sqlalchemy_result,
+    compile_plan,
+)
+from sirendb.models.siren import (
+    CURRENT_LOCATION_ORDER,
+    Siren,
+)
 from sirendb.models.siren_location import SirenLocation
 from sirendb.utils.debug import ASSERT
 
 from .siren_location import SirenLocationNode
 
 
+def _current_locations(sirens: List[Siren]) -> List[SirenLocation]:
+    location_ids = {siren.current_location_id for siren in sirens}
+    location_ids.discard(None)
+    if not location_ids:
+        return [None] * len(sirens)
+
+    locations = SirenLocation.query.filter(
+        SirenLocation.id.in_(location_ids)
+    ).all()
+
+    by_id = {location.id: location for location in locations}
+    return [by_id.get(siren.current_location_id) for siren in sirens]
+
+
+def _previous_locations(sirens: List[Siren]) -> List[List[SirenLocation]]:
+    position = sa.func.row_number().over(
+        partition_by=SirenLocation.siren_id,
+        order_by=CURRENT_LOCATION_ORDER,
+    ).label('position')
+    ranked = db.session.query(SirenLocation, position).filter(
+        SirenLocation.siren_id.in_({siren.id for siren in sirens})
+    ).subquery()
+    location = sa.orm.aliased(SirenLocation, ranked)
+
+    locations = db.session.query(location).filter(
+        ranked.c.position > 1
+    ).order_by(
+        ranked.c.siren_id,
+        ranked.c.position,
+    ).all()
+
+    by_siren = {}
+    for previous_location in locations:
+        by_siren.setdefault(previous_location.siren_id, []).append(previous_location)
+    return [by_siren.get(siren.id, []) for siren in sirens]
+
+
 class SirenNode(GraphQLType):
     class Meta:
         name = 'Siren'
@@ -20,11 +66,15 @@ class SirenNode(GraphQLType):
             'active',
             'model',
             'model_id',
+            'current_location_id',
             'created_timestamp',
             'updated_timestamp',
             'created_by',
             'updated_by',
         )
+        resolver_columns = {
+            'current_location': ('current_location_id',),
+        }
 
     previous_locations: List[SirenLocationNode] = strawberry.field(
         description=(
@@ -34,11 +84,8 @@ class SirenNode(GraphQLType):
 
     @staticmethod
     def resolve_previous_locations(cls, type_info, row, request_document) -> List[SirenLocationNode]:
-        locations = row.locations.order_by(
-            SirenLocation.installation_timestamp.desc(),
-            SirenLocation.created_timestamp.desc(),
-            SirenLocation.id.desc(),
-        ).offset(1).all()
+        selection = compile_plan(cls, request_document).selection
+        locations = batch_load('previous_locations', row, _previous_locations, selection)
 
         rv = [
             _resolve_sqlalchemy_result(
@@ -59,11 +106,8 @@ class SirenNode(GraphQLType):
 
     @staticmethod
     def resolve_current_location(cls, type_info, row, request_document) -> SirenLocationNode:
-        location = row.locations.order_by(
-            SirenLocation.installation_timestamp.desc(),
-            SirenLocation.created_timestamp.desc(),
-            SirenLocation.id.desc(),
-        ).first()
+        selection = compile_plan(cls, request_document).selection
+        location = batch_load('current_location', row, _current_locations, selection)
 
         rv = _resolve_sqlalchemy_result(
             cls=cls,
@@ -0,0 +1,8 @@
+import strawberry
+
+
+@strawberry.type(description='Sirens close to each other on a map tile, drawn as a single marker.')
+class SirenCluster:
+    latitude: float = strawberry.field(description='Latitude of the centroid of the clustered sirens.')
+    longitude: float = strawberry.field(description='Longitude of the centroid of the clustered sirens.')
+    count: int = strawberry.field(description='Number of clustered sirens.')
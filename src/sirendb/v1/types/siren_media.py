@@ -16,6 +16,9 @@ class SirenMediaNode(GraphQLType):
             'media_type',
             'mimetype',
             'kilobytes',
+            'width',
+            'height',
+            'variants',
             'location_id',
             'location',
             'created_timestamp',
@@ -23,7 +26,10 @@ class SirenMediaNode(GraphQLType):
         )
 
     download_url: Optional[str] = strawberry.field(
-        description='Network location of this media.',
+        description=(
+            'Network location of this media. Append size=<pixels> and/or format=webp to get '
+            'the smallest variant at least that large in that format, when one exists.'
+        ),
     )  # type: ignore
 
     @staticmethod
@@ -9,11 +9,13 @@ from flask_cors import CORS
 from flask_migrate import Migrate
 import yaml
 
+from sirendb.cli import commands
 from sirendb.core.auth import login_manager
 from sirendb.core.db import db
 from sirendb.core.redis import redis
 from sirendb.core.rq import rq
 from sirendb.core.strawberry import GraphQLSchema
+from sirendb.lib.spatial import spatial_index
 from sirendb.lib.storage import storage
 import sirendb.v1  # noqa
 
@@ -62,8 +64,13 @@ def _create_app(config: dict = None):
 
     rq.init_app(app)
     storage.init_app(app)
+    spatial_index.init_app(app)
 
     GraphQLSchema.init_app(app)
     app.register_blueprint(sirendb.v1.media.bp)
+    app.register_blueprint(sirendb.v1.tiles.bp)
+
+    for command in commands:
+        app.cli.add_command(command)
 
     return app
@@ -0,0 +1,84 @@
+from sirendb.models.siren import Siren
+from sirendb.models.siren_location import SirenLocation
+from sirendb.models.siren_media import (
+    SirenMedia,
+    SirenMediaType,
+)
+from sirendb.models.siren_model import SirenModel
+
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.jobs.imaging.fixtures',
+    'tests.v1.auth.fixtures',
+)
+
+
+def test_recapture_missing_media(app, user_client, db):
+    from sirendb.cli import recapture_missing_media
+
+    user, _ = user_client
+
+    siren_model = SirenModel(name='3T22A', created_by_id=user.id)
+    db.session.add(siren_model)
+    db.session.commit()
+
+    siren = Siren(model_id=siren_model.id, created_by_id=user.id)
+    db.session.add(siren)
+    db.session.commit()
+
+    location = SirenLocation(
+        siren_id=siren.id,
+        created_by_id=user.id,
+        satellite_latitude=33.9379329,
+        satellite_longitude=-117.275838,
+        satellite_zoom=17.0,
+        street_latitude=33.9379329,
+        street_longitude=-117.275838,
+        street_heading=93,
+        street_pitch=43.145,
+        street_zoom=1.0,
+    )
+    # Nothing to capture without coordinates.
+    bare_location = SirenLocation(siren_id=siren.id, created_by_id=user.id)
+    db.session.add_all([location, bare_location])
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(recapture_missing_media, ['--batch-size', '1'])
+    assert result.exit_code == 0
+    assert result.output == 'enqueued 2 capture(s) in 2 job(s)\n'
+
+    media_types = {
+        media.media_type
+        for media in SirenMedia.query.filter_by(location_id=location.id)
+    }
+    assert media_types == {SirenMediaType.SATELLITE_IMAGE, SirenMediaType.STREET_IMAGE}
+
+    result = app.test_cli_runner().invoke(recapture_missing_media)
+    assert result.exit_code == 0
+    assert result.output == 'enqueued 0 capture(s) in 0 job(s)\n'
+
+
+def test_imaging_worker_keeps_browsers(app, client, monkeypatch):
+    from sirendb.cli import imaging_worker
+    from sirendb.core.rq import rq
+    from sirendb.jobs.imaging.chrome import pooling_enabled
+
+    # The command configures the whole app, restore it afterwards.
+    monkeypatch.setitem(app.config, 'RQ_WORKER_CLASS', app.config['RQ_WORKER_CLASS'])
+    monkeypatch.setattr(rq, 'worker_class', rq.worker_class)
+
+    workers = []
+
+    class FakeWorker:
+        def __init__(self, queues):
+            self.queues = queues
+
+        def work(self, burst):
+            workers.append((self.queues, rq.worker_class, burst, pooling_enabled()))
+
+    monkeypatch.setattr(rq, 'get_worker', lambda *queues: FakeWorker(queues))
+    assert not pooling_enabled()
+
+    result = app.test_cli_runner().invoke(imaging_worker, ['--burst'])
+    assert result.exit_code == 0, result.output
+    assert workers == [(('imaging_for_api', 'imaging_bulk'), 'rq.worker.SimpleWorker', True, True)]
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from sirendb.models.siren import Siren
+from sirendb.models.siren_location import SirenLocation
+from sirendb.models.siren_model import SirenModel
+
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.v1.auth.fixtures',
+)
+
+
+def test_backfill_current_locations(app, user_client, db):
+    from sirendb.cli import backfill_current_locations
+
+    user, _ = user_client
+
+    siren_model = SirenModel(name='3T22A', created_by_id=user.id)
+    db.session.add(siren_model)
+    db.session.commit()
+
+    siren = Siren(model_id=siren_model.id, created_by_id=user.id)
+    db.session.add(siren)
+    db.session.commit()
+
+    old_location = SirenLocation(
+        siren_id=siren.id,
+        created_by_id=user.id,
+        installation_timestamp=datetime(2020, 1, 1),
+    )
+    new_location = SirenLocation(
+        siren_id=siren.id,
+        created_by_id=user.id,
+        installation_timestamp=datetime(2021, 1, 1),
+    )
+    db.session.add_all([new_location, old_location])
+    db.session.commit()
+    assert Siren.query.get(siren.id).current_location_id == new_location.id
+
+    Siren.query.filter_by(id=siren.id).update({'current_location_id': None})
+    db.session.commit()
+    assert Siren.query.get(siren.id).current_location_id is None
+
+    result = app.test_cli_runner().invoke(backfill_current_locations)
+    assert result.exit_code == 0
+    assert result.output == 'updated 1 siren(s)\n'
+
+    db.session.expire_all()
+    assert Siren.query.get(siren.id).current_location_id == new_location.id
@@ -1,6 +1,8 @@
+from contextlib import contextmanager
 from typing import Any, Optional
 
 import pytest
+import sqlalchemy as sa
 import strawberry
 from strawberry.types.info import Info
 
@@ -125,6 +127,20 @@ class Query(GraphQLField):
         return ExampleTable.query
 
 
+@contextmanager
+def count_statements(db):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sa.event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        sa.event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
 @pytest.fixture
 def introspection_graphql_query():
     # From GraphiQL
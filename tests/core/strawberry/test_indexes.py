@@ -0,0 +1,62 @@
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.core.strawberry.fixtures',
+)
+
+
+def test_uncovered_columns(client, db):
+    from sirendb.core.strawberry.indexes import uncovered_columns
+
+    with db.engine.connect() as connection:
+        columns = {
+            (column.table, column.column): column.usages
+            for column in uncovered_columns(connection)
+        }
+
+    # Primary keys, foreign keys and sort indexes are covered.
+    assert ('test_table_1', 'id') not in columns
+    assert ('test_table_1', 'email') not in columns
+    assert ('siren_locations', 'siren_id') not in columns
+    assert ('siren_locations', 'installation_timestamp') not in columns
+
+    # Booleans are never reported.
+    assert ('siren_systems', 'in_service') not in columns
+
+    assert columns[('siren_systems', 'city')] == (
+        'siren_systems sort',
+        'siren_systems filter',
+    )
+
+    with db.engine.connect() as connection:
+        allowed = uncovered_columns(connection, allowed=('siren_systems.*',))
+    assert ('siren_systems', 'city') not in {
+        (column.table, column.column) for column in allowed
+    }
+
+
+def test_only_btree_indexes_cover_sorts(client, db):
+    from sirendb.core.strawberry.indexes import uncovered_columns
+
+    with db.engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            # Hash indexes find rows like trigram indexes do, but can't order them.
+            connection.execute(
+                'CREATE INDEX ix_siren_systems_city_hash ON siren_systems USING hash (city)'
+            )
+            columns = {
+                (column.table, column.column): column.usages
+                for column in uncovered_columns(connection)
+            }
+        finally:
+            transaction.rollback()
+
+    assert columns[('siren_systems', 'city')] == ('siren_systems sort',)
+
+
+def test_check_indexes_command(app, client, db):
+    from sirendb.cli import check_indexes
+
+    result = app.test_cli_runner().invoke(check_indexes)
+    assert result.exit_code == 0, result.output
+    assert 'every sortable and filterable column is indexed' in result.output
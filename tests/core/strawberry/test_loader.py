@@ -0,0 +1,96 @@
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.core.strawberry.fixtures',
+)
+
+
+QUERY = '''
+query getAllTables($paginate: Paginate) {
+  allTables(paginate: $paginate) {
+    count
+    items {
+      id
+      books {
+        name
+      }
+    }
+  }
+}
+'''
+
+
+def _add_table(db, books: int):
+    from .fixtures import (
+        Book,
+        ExampleTable,
+    )
+
+    table = ExampleTable(name='test 123')
+    db.session.add(table)
+    db.session.commit()
+
+    for index in range(books):
+        db.session.add(Book(name=f'Book{index}', table_id=table.id))
+    db.session.commit()
+
+
+def test_relationships_are_batch_loaded(client, db):
+    from .fixtures import count_statements
+
+    _add_table(db, books=2)
+
+    with count_statements(db) as single_page:
+        response = client.post(
+            '/api/v1/test-graphql',
+            json={'query': QUERY, 'variables': {'paginate': {'first': 10}}},
+        )
+    assert response.status_code == 200
+    assert response.json['data']['allTables']['items'][0]['books'] == [
+        {'name': 'Book0'},
+        {'name': 'Book1'},
+    ]
+
+    for _ in range(4):
+        _add_table(db, books=3)
+
+    with count_statements(db) as large_page:
+        response = client.post(
+            '/api/v1/test-graphql',
+            json={'query': QUERY, 'variables': {'paginate': {'first': 10}}},
+        )
+    assert response.status_code == 200
+    items = response.json['data']['allTables']['items']
+    assert len(items) == 5
+    assert [len(item['books']) for item in items] == [2, 3, 3, 3, 3]
+
+    # Loading more rows must not issue more queries.
+    assert len(large_page) == len(single_page)
+
+
+def test_batched_rows_are_primed_at_once(client, db):
+    from sirendb.core.strawberry.loader import (
+        batch_load,
+        RelationshipLoader,
+    )
+
+    from .fixtures import (
+        count_statements,
+        ExampleTable,
+    )
+
+    for _ in range(3):
+        _add_table(db, books=2)
+
+    tables = ExampleTable.query.all()
+    loader = RelationshipLoader()
+    loader.prime_selection(tables, {})
+
+    # Resolvers hand over rows fetched through batch_load, their selection
+    # is loaded for the whole batch instead of one row at a time.
+    with count_statements(db) as statements, loader.activate():
+        for table in tables:
+            assert batch_load('itself', table, lambda rows: rows, {'books': {'name': None}}) is table
+        books = [[book.name for book in table.books] for table in tables]
+
+    assert len(statements) == 1
+    assert books == [['Book0', 'Book1']] * 3
@@ -1,3 +1,7 @@
+import base64
+
+from sirendb.core.strawberry.cursor import encode_cursor
+
 pytest_plugins = (
     'tests.fixtures',
     'tests.core.strawberry.fixtures',
@@ -42,7 +46,7 @@ query getAllTables($paginate: Paginate, $sort: ExampleTableSortEnum, $filter: Ex
                 'count': 1,
                 'pageInfo': {
                     'hasNext': False,
-                    'lastCursor': '1',
+                    'lastCursor': encode_cursor('ID_ASC', row1.id, row1.id),
                 },
                 'items': [{
                     'directField': 'this is from the resolver',
@@ -52,3 +56,245 @@ query getAllTables($paginate: Paginate, $sort: ExampleTableSortEnum, $filter: Ex
             }
         }
     }
+
+
+def test_query_only_loads_requested_columns(client, db):
+    from .fixtures import (
+        Book,
+        count_statements,
+        ExampleTable,
+    )
+
+    row1 = ExampleTable(
+        name='test 123',
+        email='test email',
+    )
+    db.session.add(row1)
+    db.session.commit()
+
+    db.session.add(Book(name='Book1', table_id=row1.id))
+    db.session.commit()
+
+    with count_statements(db) as statements:
+        response = client.post(
+            '/api/v1/test-graphql',
+            json={
+                'query': '''
+query getAllTables {
+  allTables {
+    items {
+      id
+      books {
+        name
+      }
+    }
+  }
+}
+'''
+            }
+        )
+    assert response.status_code == 200
+    assert response.json == {
+        'data': {
+            'allTables': {
+                'items': [{
+                    'id': row1.id,
+                    'books': [{
+                        'name': 'Book1',
+                    }],
+                }]
+            }
+        }
+    }
+
+    selects = [
+        statement
+        for statement in statements
+        if statement.lstrip().startswith('SELECT') and 'count(*)' not in statement
+    ]
+    # One query for the page and one for the books.
+    assert len(selects) == 2
+    assert 'test_table_1.email' not in selects[0]
+
+
+CURSOR_QUERY = '''
+query getAllTables($paginate: Paginate, $sort: ExampleTableSortEnum) {
+  allTables(paginate: $paginate, sort: $sort) {
+    pageInfo {
+      firstCursor
+      lastCursor
+    }
+    items {
+      id
+    }
+  }
+}
+'''
+
+
+def test_keyset_pagination(client, db):
+    from .fixtures import ExampleTable
+
+    rows = [ExampleTable(name=f'table {index}') for index in range(5)]
+    db.session.add_all(rows)
+    db.session.commit()
+    ids = sorted(row.id for row in rows)
+
+    def fetch(paginate, sort='ID_ASC'):
+        response = client.post(
+            '/api/v1/test-graphql',
+            json={
+                'query': CURSOR_QUERY,
+                'variables': {'paginate': paginate, 'sort': sort},
+            }
+        )
+        assert response.status_code == 200
+        page = response.json['data']['allTables']
+        return [item['id'] for item in page['items']], page['pageInfo']
+
+    items, page_info = fetch({'first': 2})
+    assert items == ids[:2]
+    assert page_info['lastCursor'] == encode_cursor('ID_ASC', ids[1], ids[1])
+
+    items, page_info = fetch({'first': 2, 'after': page_info['lastCursor']})
+    assert items == ids[2:4]
+
+    items, _ = fetch({'last': 2, 'before': page_info['firstCursor']})
+    assert items == ids[:2]
+
+    items, _ = fetch({'last': 2})
+    assert items == ids[3:]
+
+    items, page_info = fetch({'first': 2}, sort='ID_DESC')
+    assert items == [ids[4], ids[3]]
+
+    items, _ = fetch({'first': 2, 'after': page_info['lastCursor']}, sort='ID_DESC')
+    assert items == [ids[2], ids[1]]
+
+    response = client.post(
+        '/api/v1/test-graphql',
+        json={
+            'query': CURSOR_QUERY,
+            'variables': {'paginate': {'first': 2, 'after': page_info['lastCursor']}, 'sort': 'ID_ASC'},
+        }
+    )
+    assert response.json['errors'][0]['message'] == 'cursor was created for a different sort order'
+
+    # Crafted cursors are rejected before they reach the database.
+    for payload in ('["ID_ASC","abc","abc"]', '["ID_ASC",1,null]', '["ID_ASC",true,1]', '["ID_ASC",1,4294967296]'):
+        response = client.post(
+            '/api/v1/test-graphql',
+            json={
+                'query': CURSOR_QUERY,
+                'variables': {
+                    'paginate': {'first': 2, 'after': base64.urlsafe_b64encode(payload.encode()).decode()},
+                    'sort': 'ID_ASC',
+                },
+            }
+        )
+        assert response.status_code == 200
+        assert response.json['errors'][0]['message'] == 'invalid cursor'
+
+
+def test_total_count_is_lazy(app, client, db, monkeypatch):
+    from .fixtures import (
+        count_statements,
+        ExampleTable,
+    )
+
+    db.session.add_all([ExampleTable(name=f'table {index}') for index in range(3)])
+    db.session.commit()
+
+    def fetch(selection):
+        with count_statements(db) as statements:
+            response = client.post(
+                '/api/v1/test-graphql',
+                json={'query': 'query { allTables { %s } }' % selection},
+            )
+        assert response.status_code == 200
+        counts = [statement for statement in statements if 'count(*)' in statement]
+        return response.json['data']['allTables'], counts
+
+    page, counts = fetch('items { id }')
+    assert len(page['items']) == 3
+    assert counts == []
+
+    page, counts = fetch('totalCount')
+    assert page == {'totalCount': 3}
+    assert len(counts) == 1
+
+    # The count is computed by the page query itself.
+    page, counts = fetch('totalCount pageInfo { hasNext } items { id }')
+    assert page['totalCount'] == 3
+    assert page['pageInfo'] == {'hasNext': False}
+    assert len(counts) == 1
+    assert 'OVER ()' in counts[0]
+
+    page, counts = fetch('pageInfo { hasNext } items { id }')
+    assert page['pageInfo'] == {'hasNext': False}
+    assert counts == []
+
+    monkeypatch.setitem(app.config, 'PAGINATE_TOTAL_COUNT', 'cached')
+    page, counts = fetch('totalCount')
+    assert page == {'totalCount': 3}
+    assert len(counts) == 1
+
+    page, counts = fetch('totalCount')
+    assert page == {'totalCount': 3}
+    assert counts == []
+
+
+def test_filter_operators(client, db):
+    from .fixtures import ExampleTable
+
+    rows = [
+        ExampleTable(name=f'test {index}', email=f'{prefix}@example.com')
+        for index, prefix in enumerate(('alice', 'alex', 'bob', 'carol'))
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+
+    query = '''
+query getAllTables($filter: ExampleTableFilter) {
+  allTables(filter: $filter) {
+    items {
+      id
+    }
+  }
+}
+'''
+
+    def filtered_ids(filter_):
+        response = client.post(
+            '/api/v1/test-graphql',
+            json={
+                'query': query,
+                'variables': {
+                    'filter': filter_,
+                },
+            }
+        )
+        assert response.status_code == 200
+        assert 'errors' not in response.json, response.json
+        return [item['id'] for item in response.json['data']['allTables']['items']]
+
+    ids = [row.id for row in rows]
+
+    assert filtered_ids({'id_gt': ids[1]}) == ids[2:]
+    assert filtered_ids({'id_lt': ids[1]}) == ids[:1]
+    assert filtered_ids({'id_in': [ids[0], ids[3]]}) == [ids[0], ids[3]]
+    assert filtered_ids({'id_between': [ids[1], ids[2]]}) == ids[1:3]
+    assert filtered_ids({'email_prefix': 'al'}) == ids[:2]
+    assert filtered_ids({'email_prefix': 'al', 'id_gt': ids[0]}) == ids[1:2]
+
+    response = client.post(
+        '/api/v1/test-graphql',
+        json={
+            'query': query,
+            'variables': {
+                'filter': {'id_between': [ids[0]]},
+            },
+        }
+    )
+    assert response.status_code == 200
+    assert response.json['errors'][0]['message'] == 'id_between expects exactly two values'
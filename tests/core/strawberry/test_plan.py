@@ -0,0 +1,74 @@
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.core.strawberry.fixtures',
+)
+
+
+def test_plans_are_cached_by_selection(client):
+    from sirendb.core.strawberry.type_ import compile_plan
+
+    from .fixtures import ExampleTableNode
+
+    plan = compile_plan(ExampleTableNode, ['id', 'books', ['name']])
+    assert compile_plan(ExampleTableNode, ['id', 'books', ['name']]) is plan
+    assert compile_plan(ExampleTableNode, ['id']) is not plan
+
+    attributes = [step.attribute for step in plan.column_steps]
+    assert 'books' in attributes
+    assert 'email' not in attributes
+    assert plan.selection == {'id': None, 'books': {'name': None}}
+
+    # Sub-selections listed after the field's name or paired with it
+    # compile to the same child plan.
+    books_step, = [step for step in plan.column_steps if step.attribute == 'books']
+    paired_plan = compile_plan(ExampleTableNode, ['id', ['books', ['name']]])
+    paired_books_step, = [step for step in paired_plan.column_steps if step.attribute == 'books']
+    assert books_step.child_plan is not None
+    assert books_step.child_plan is paired_books_step.child_plan
+
+
+def test_records_match_dataclasses(client, db, monkeypatch):
+    from sirendb.core.strawberry.type_ import (
+        _compile_plan,
+        compile_plan,
+    )
+
+    from .fixtures import (
+        Book,
+        BookNode,
+        ExampleTable,
+        ExampleTableNode,
+    )
+
+    row = ExampleTable(name='test 123', email='test email')
+    db.session.add(row)
+    db.session.commit()
+    db.session.add(Book(name='test book', table_id=row.id))
+    db.session.commit()
+
+    document = ['id', 'email', 'books', ['name']]
+    dataclass_plan = compile_plan(ExampleTableNode, document)
+    assert not dataclass_plan.records
+    instance = dataclass_plan.resolve(row)
+
+    # Plans are cached with the mode of their type.
+    monkeypatch.setattr(ExampleTableNode.Meta, 'records', True, raising=False)
+    _compile_plan.cache_clear()
+    try:
+        plan = compile_plan(ExampleTableNode, document)
+        record = plan.resolve(row)
+    finally:
+        monkeypatch.undo()
+        _compile_plan.cache_clear()
+
+    assert plan.records
+    assert isinstance(record, ExampleTableNode)
+    assert record == instance
+    assert record.email == 'test email'
+
+    # Child plans follow the Meta of their own type, BookNode never opted in.
+    books_step, = [step for step in plan.column_steps if step.attribute == 'books']
+    assert books_step.child_plan is not None
+    assert not books_step.child_plan.records
+    assert isinstance(record.books[0], BookNode)
+    assert record.books == instance.books
@@ -1,3 +1,5 @@
+from sirendb.core.strawberry.cursor import encode_cursor
+
 pytest_plugins = (
     'tests.fixtures',
     'tests.core.strawberry.fixtures',
@@ -52,7 +54,7 @@ query getAllTables($paginate: Paginate, $sort: ExampleTableSortEnum, $filter: Ex
                 'count': 1,
                 'pageInfo': {
                     'hasNext': False,
-                    'lastCursor': str(row1.id),
+                    'lastCursor': encode_cursor('ID_ASC', row1.id, row1.id),
                 },
                 'items': [{
                     'books': [{
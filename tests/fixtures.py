@@ -37,6 +37,7 @@ def app():
             'SECRET_KEY': secrets.token_hex(24),
             'RQ_ASYNC': False,
             'RQ_CONNECTION_CLASS': 'fakeredis.FakeRedis',
+            'SPATIAL_INDEX_PRELOAD': False,
             'TESTING': True,
             'BIN_DIR': '/app/bin',
             'GEO_BUILD_DIR': '/app/geo/build',
@@ -47,7 +48,6 @@ def app():
 
             # 'BIN_DIR': '/home/static/projects/sirendb/bin',
             # 'GEO_BUILD_DIR': '/home/static/projects/sirendb/geoapp/build',
-            # 'USE_REAL_NGINX': True,
             # 'USE_REAL_CHROME': True,
 
 
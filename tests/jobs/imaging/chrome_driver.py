@@ -5,26 +5,54 @@ from typing import (
     Any,
     Dict,
     List,
+    Tuple,
 )
 
 
+class FakeSwitchTo:
+    def __init__(self, driver: FakeChromeDriver):
+        self._driver = driver
+
+    def window(self, handle: str) -> None:
+        assert handle in self._driver.window_handles
+        self._driver.current_window_handle = handle
+
+
 class FakeChromeDriver:
     def __init__(self, *args, **kwargs):
-        pass
+        self.window_handles = ['tab-0']
+        self.current_window_handle = 'tab-0'
+        self.switch_to = FakeSwitchTo(self)
+        self.urls: Dict[str, str] = {}
+        self.cdp_commands: List[Tuple[str, str, dict]] = []
+        self.quit_called = False
+        self.async_script_args: List[tuple] = []
 
     def execute_cdp_cmd(self, cmd_name: str, options: dict) -> dict:
+        self.cdp_commands.append((self.current_window_handle, cmd_name, options))
         return {
             'data': base64.b64encode(b'data'),
         }
 
     def get(self, url: str) -> None:
+        self.urls[self.current_window_handle] = url
+
+    def execute_script(self, script: str, *args) -> Any:
+        if script.startswith('window.open('):
+            self.window_handles.append(f'tab-{len(self.window_handles)}')
+
+    def set_script_timeout(self, time_to_wait: float) -> None:
         pass
 
+    def execute_async_script(self, script: str, *args) -> Any:
+        self.async_script_args.append(args)
+        return None
+
     def get_log(self, log_name: str) -> List[Dict[str, Any]]:
         return []
 
     def quit(self) -> None:
-        pass
+        self.quit_called = True
 
     def __enter__(self, *args, **kwargs) -> FakeChromeDriver:
         return self
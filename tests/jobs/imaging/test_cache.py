@@ -0,0 +1,125 @@
+from sirendb.jobs.imaging import capture
+from sirendb.jobs.imaging.cache import RELEASED_FILES
+from sirendb.jobs.imaging.capture import (
+    CaptureRequest,
+    capture_images,
+)
+from sirendb.models.siren import Siren
+from sirendb.models.siren_location import (
+    SatelliteCoordinates,
+    SirenLocation,
+)
+from sirendb.models.siren_media import (
+    SirenMedia,
+    SirenMediaType,
+)
+from sirendb.models.siren_model import SirenModel
+
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.jobs.imaging.fixtures',
+    'tests.v1.auth.fixtures',
+)
+
+
+def test_captures_are_reused(app, user_client, db, monkeypatch):
+    user, _ = user_client
+
+    rendered = []
+
+    def capture_images_(http_paths, settings):
+        rendered.extend(http_paths)
+        return [b'data'] * len(http_paths)
+
+    monkeypatch.setattr(capture, '_capture_images', capture_images_)
+
+    siren_model = SirenModel(name='3T22A', created_by_id=user.id)
+    db.session.add(siren_model)
+    db.session.commit()
+
+    siren = Siren(model_id=siren_model.id, created_by_id=user.id)
+    db.session.add(siren)
+    db.session.commit()
+
+    locations = [SirenLocation(siren_id=siren.id, created_by_id=user.id) for _ in range(3)]
+    db.session.add_all(locations)
+    db.session.commit()
+
+    def request(location, latitude):
+        coordinates = SatelliteCoordinates(latitude=latitude, longitude=-117.275838, zoom=17.0)
+        return CaptureRequest(location.id, SirenMediaType.SATELLITE_IMAGE, coordinates)
+
+    # Near-duplicates within a batch are rendered once.
+    assert capture_images([
+        request(locations[0], 33.9379329),
+        request(locations[1], 33.93793291),
+    ]) == 2
+    assert len(rendered) == 1
+
+    # Later batches reuse earlier captures.
+    assert capture_images([request(locations[2], 33.9379329)]) == 1
+    assert len(rendered) == 1
+
+    media = SirenMedia.query.order_by(SirenMedia.id).all()
+    assert [item.location_id for item in media] == [location.id for location in locations]
+    assert len({item.filesystem_uri for item in media}) == 1
+
+    # The file is only released along with the last media using it.
+    for item in media[:2]:
+        db.session.delete(item)
+    db.session.flush()
+    assert not db.session.info.get(RELEASED_FILES)
+
+    db.session.delete(media[2])
+    db.session.flush()
+    assert db.session.info[RELEASED_FILES] == {media[2].filesystem_uri}
+
+
+def test_variants_are_deleted_with_their_original(app, user_client, db):
+    user, _ = user_client
+
+    siren_model = SirenModel(name='3T22A', created_by_id=user.id)
+    db.session.add(siren_model)
+    db.session.commit()
+
+    siren = Siren(model_id=siren_model.id, created_by_id=user.id)
+    db.session.add(siren)
+    db.session.commit()
+
+    location = SirenLocation(siren_id=siren.id, created_by_id=user.id)
+    db.session.add(location)
+    db.session.commit()
+
+    def media(filesystem_uri, **kwargs):
+        return SirenMedia(
+            media_type=SirenMediaType.SATELLITE_IMAGE,
+            filesystem_uri=filesystem_uri,
+            mimetype='image/webp',
+            kilobytes=1,
+            location_id=location.id,
+            **kwargs,
+        )
+
+    original = media('testing:///images/original.png', variants=[
+        media('testing:///images/small.webp'),
+        media('testing:///images/shared.webp'),
+    ])
+    # Another capture's variant shares one of the files.
+    other = media('testing:///images/other.png', variants=[
+        media('testing:///images/shared.webp'),
+    ])
+    db.session.add_all([original, other])
+    db.session.commit()
+
+    db.session.delete(original)
+    db.session.flush()
+
+    remaining = SirenMedia.query.order_by(SirenMedia.id).all()
+    assert [item.filesystem_uri for item in remaining] == [
+        'testing:///images/other.png',
+        'testing:///images/shared.webp',
+    ]
+    assert db.session.info[RELEASED_FILES] == {
+        'testing:///images/original.png',
+        'testing:///images/small.webp',
+    }
@@ -0,0 +1,38 @@
+import pytest
+
+from sirendb.jobs.imaging.capture import capture_settings
+from sirendb.jobs.imaging.chrome import CaptureSettings
+from sirendb.models.siren_media import SirenMediaType
+
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.jobs.imaging.fixtures',
+)
+
+
+def test_capture_settings(app, monkeypatch):
+    assert capture_settings(SirenMediaType.SATELLITE_IMAGE) == CaptureSettings()
+
+    monkeypatch.setitem(app.config, 'IMAGING_STREET_CAPTURE_FORMAT', 'jpeg')
+    monkeypatch.setitem(app.config, 'IMAGING_STREET_CAPTURE_QUALITY', 80)
+    monkeypatch.setitem(app.config, 'IMAGING_STREET_CAPTURE_WIDTH', 1280)
+    monkeypatch.setitem(app.config, 'IMAGING_STREET_CAPTURE_HEIGHT', 720)
+    monkeypatch.setitem(app.config, 'IMAGING_STREET_CAPTURE_CLIP', [0, 0, 1280, 640])
+
+    settings = capture_settings(SirenMediaType.STREET_IMAGE)
+    assert settings == CaptureSettings(format='jpeg', quality=80, width=1280, height=720, clip=(0, 0, 1280, 640))
+    assert settings.capture_format.mimetype == 'image/jpeg'
+
+    # Other kinds of images keep their own settings.
+    assert capture_settings(SirenMediaType.SATELLITE_IMAGE) == CaptureSettings()
+
+
+def test_invalid_capture_settings(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'IMAGING_SATELLITE_CAPTURE_FORMAT', 'gif')
+    with pytest.raises(RuntimeError, match='IMAGING_SATELLITE_CAPTURE_FORMAT must be one of png, jpeg, webp'):
+        capture_settings(SirenMediaType.SATELLITE_IMAGE)
+
+    monkeypatch.setitem(app.config, 'IMAGING_SATELLITE_CAPTURE_FORMAT', 'png')
+    monkeypatch.setitem(app.config, 'IMAGING_SATELLITE_CAPTURE_DPI', 300)
+    with pytest.raises(RuntimeError, match='IMAGING_SATELLITE_CAPTURE_DPI'):
+        capture_settings(SirenMediaType.SATELLITE_IMAGE)
@@ -0,0 +1,218 @@
+import time
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from sirendb.jobs.imaging import chrome
+from sirendb.jobs.imaging.chrome import (
+    CaptureSettings,
+    ChromePool,
+)
+from sirendb.jobs.imaging.static import StaticServer
+
+from .chrome_driver import FakeChromeDriver
+
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.jobs.imaging.fixtures',
+)
+
+
+class CrashingChromeDriver(FakeChromeDriver):
+    def get(self, url: str) -> None:
+        raise RuntimeError('chrome crashed')
+
+
+class SlowChromeDriver(FakeChromeDriver):
+    def execute_async_script(self, script: str, *args):
+        raise TimeoutException()
+
+
+class FailingChromeDriver(FakeChromeDriver):
+    def execute_async_script(self, script: str, *args):
+        return 'tiles failed to load'
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    started = []
+
+    def start_driver(*args, **kwargs):
+        driver = started_class[0](*args, **kwargs)
+        started.append(driver)
+        return driver
+
+    started_class = [FakeChromeDriver]
+    monkeypatch.setattr(chrome, 'ChromeDriver', start_driver)
+    yield started, started_class
+
+
+@pytest.fixture
+def pooled(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'RQ_WORKER_CLASS', 'rq.worker.SimpleWorker')
+
+
+def test_browsers_are_quit_by_default(app, drivers):
+    started, _ = drivers
+    pool = ChromePool()
+
+    # Forked work horses never run atexit, so nothing may outlive the job.
+    for _ in range(2):
+        with pool.browser(bin_dir='/app/bin') as browser:
+            assert browser.capture_screenshot('http://localhost/') == b'data'
+    assert len(started) == 2
+    assert all(driver.quit_called for driver in started)
+
+    pool.close()
+
+
+def test_browsers_are_reused(app, monkeypatch, drivers, pooled):
+    started, _ = drivers
+    monkeypatch.setitem(app.config, 'IMAGING_CHROME_MAX_CAPTURES', 3)
+    pool = ChromePool()
+
+    for _ in range(3):
+        with pool.browser(bin_dir='/app/bin') as browser:
+            assert browser.capture_screenshot('http://localhost/') == b'data'
+    assert len(started) == 1
+    assert not started[0].quit_called
+
+    # Recycled after 3 captures.
+    with pool.browser(bin_dir='/app/bin') as browser:
+        browser.capture_screenshot('http://localhost/')
+    assert len(started) == 2
+
+    pool.close()
+
+
+def test_crashed_browsers_are_replaced(app, drivers):
+    started, started_class = drivers
+    pool = ChromePool()
+
+    started_class[0] = CrashingChromeDriver
+    with pytest.raises(RuntimeError):
+        with pool.browser(bin_dir='/app/bin') as browser:
+            browser.capture_screenshot('http://localhost/')
+
+    started_class[0] = FakeChromeDriver
+    with pool.browser(bin_dir='/app/bin') as browser:
+        assert browser.capture_screenshot('http://localhost/') == b'data'
+    assert len(started) == 2
+
+    pool.close()
+
+
+def test_pool_size(app, monkeypatch, drivers):
+    monkeypatch.setitem(app.config, 'IMAGING_CHROME_POOL_SIZE', 1)
+    monkeypatch.setitem(app.config, 'IMAGING_CHROME_POOL_TIMEOUT', 0.1)
+    pool = ChromePool()
+
+    with pool.browser(bin_dir='/app/bin'):
+        with pytest.raises(RuntimeError, match='no chrome became available'):
+            with pool.browser(bin_dir='/app/bin'):
+                pass
+
+    pool.close()
+
+
+@pytest.mark.parametrize('driver_class', [SlowChromeDriver, FailingChromeDriver])
+def test_unrendered_pages_are_not_captured(app, drivers, pooled, driver_class):
+    started, started_class = drivers
+    pool = ChromePool()
+
+    started_class[0] = driver_class
+    with pool.browser(bin_dir='/app/bin') as browser:
+        assert browser.capture_screenshot('http://localhost/') is None
+
+    # The browser itself is fine.
+    with pool.browser(bin_dir='/app/bin') as browser:
+        browser.capture_screenshot('http://localhost/')
+    assert len(started) == 1
+
+    pool.close()
+
+
+def test_capture_screenshots_in_tabs(app, drivers):
+    started, _ = drivers
+    pool = ChromePool()
+
+    urls = [f'http://localhost/?lat={latitude}' for latitude in range(3)]
+    with pool.browser(bin_dir='/app/bin') as browser:
+        assert browser.capture_screenshots(urls) == [b'data'] * 3
+        assert browser.captures == 3
+
+    driver, = started
+    assert driver.window_handles == ['tab-0', 'tab-1', 'tab-2']
+    assert sorted(driver.urls.values()) == urls
+
+    pool.close()
+
+
+def test_capture_settings(app, drivers):
+    started, _ = drivers
+    pool = ChromePool()
+
+    settings = CaptureSettings(format='jpeg', quality=85, width=640, height=480, device_scale_factor=2.0)
+    with pool.browser(bin_dir='/app/bin') as browser:
+        browser.capture_screenshot('http://localhost/', settings)
+
+    driver, = started
+    assert driver.cdp_commands == [
+        ('tab-0', 'Emulation.setDeviceMetricsOverride', {
+            'width': 640,
+            'height': 480,
+            'deviceScaleFactor': 2.0,
+            'mobile': False,
+        }),
+        ('tab-0', 'Page.captureScreenshot', {'format': 'jpeg', 'quality': 85}),
+    ]
+
+    pool.close()
+
+
+def test_screenshot_params():
+    assert CaptureSettings().screenshot_params() == {'format': 'png'}
+
+    # Lossless formats have no quality.
+    assert CaptureSettings(quality=50).screenshot_params() == {'format': 'png'}
+
+    assert CaptureSettings(format='webp', quality=70, clip=(10, 20, 300, 200)).screenshot_params() == {
+        'format': 'webp',
+        'quality': 70,
+        'clip': {'x': 10, 'y': 20, 'width': 300, 'height': 200, 'scale': 1},
+    }
+
+
+def test_pages_without_ready_flags_wait_for_network_idle(app, drivers, monkeypatch):
+    started, _ = drivers
+    monkeypatch.setitem(app.config, 'IMAGING_NETWORK_IDLE_MS', 250)
+    pool = ChromePool()
+
+    with pool.browser(bin_dir='/app/bin') as browser:
+        assert browser.capture_screenshot('http://localhost/') == b'data'
+
+    driver, = started
+    assert driver.async_script_args == [(250,)]
+    assert 'window.sirendbReady === undefined' in chrome.WAIT_UNTIL_READY
+
+    pool.close()
+
+
+def test_real_chrome_captures_pages_without_ready_flags(app, monkeypatch, tmp_path):
+    if not app.config.get('USE_REAL_CHROME'):
+        pytest.skip('needs USE_REAL_CHROME')
+
+    monkeypatch.setitem(app.config, 'IMAGING_READY_TIMEOUT', 10)
+    (tmp_path / 'index.html').write_text('<html><body>no ready flags</body></html>')
+
+    server = StaticServer()
+    pool = ChromePool()
+    try:
+        netloc = server.netloc(str(tmp_path))
+        started_at = time.monotonic()
+        with pool.browser(bin_dir=app.config['BIN_DIR']) as browser:
+            assert browser.capture_screenshot(f'http://{netloc}/')
+        assert time.monotonic() - started_at < 10
+    finally:
+        pool.close()
+        server.close()
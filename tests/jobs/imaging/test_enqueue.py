@@ -0,0 +1,53 @@
+from fakeredis import FakeRedis
+from rq.queue import Queue
+
+from sirendb.jobs.imaging import capture
+from sirendb.jobs.imaging.capture import (
+    CaptureRequest,
+    capture_images,
+)
+from sirendb.jobs.imaging.enqueue import enqueue_captures
+from sirendb.models.siren_location import SatelliteCoordinates
+from sirendb.models.siren_media import SirenMediaType
+
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.jobs.imaging.fixtures',
+)
+
+
+def _request(latitude: float) -> CaptureRequest:
+    coordinates = SatelliteCoordinates(latitude=latitude, longitude=-117.275838, zoom=17.0)
+    return CaptureRequest(1, SirenMediaType.SATELLITE_IMAGE, coordinates)
+
+
+def test_duplicates_are_absorbed(app):
+    queue = Queue('imaging_test', connection=FakeRedis())
+
+    job = enqueue_captures(queue, [_request(33.9379329)])
+    assert enqueue_captures(queue, [_request(33.9379329)]).id == job.id
+    assert enqueue_captures(queue, [_request(33.93793291)]).id == job.id
+    assert queue.count == 1
+
+    assert enqueue_captures(queue, [_request(34.0)]).id != job.id
+    assert queue.count == 2
+
+
+def test_superseded_captures_are_skipped(app, db, monkeypatch):
+    rendered = []
+
+    def capture_images_(http_paths, settings):
+        rendered.extend(http_paths)
+        return [None] * len(http_paths)
+
+    monkeypatch.setattr(capture, '_capture_images', capture_images_)
+    queue = Queue('imaging_test', connection=FakeRedis())
+
+    enqueue_captures(queue, [_request(33.9379329)])
+    enqueue_captures(queue, [_request(34.0)])
+
+    capture_images([_request(33.9379329)])
+    assert rendered == []
+
+    capture_images([_request(34.0)])
+    assert rendered == ['sat?lat=34.0&lng=-117.275838&zoom=17.0']
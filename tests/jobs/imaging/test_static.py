@@ -0,0 +1,23 @@
+from urllib.request import urlopen
+
+from sirendb.jobs.imaging.static import StaticServer
+
+
+def test_serves_geo_app(tmp_path):
+    (tmp_path / 'index.html').write_text('<html>geo</html>')
+    (tmp_path / 'static').mkdir()
+    (tmp_path / 'static' / 'main.js').write_text('main()')
+
+    server = StaticServer()
+    try:
+        netloc = server.netloc(str(tmp_path))
+        assert server.netloc(str(tmp_path)) == netloc
+
+        with urlopen(f'http://{netloc}/static/main.js') as response:
+            assert response.read() == b'main()'
+
+        # Routes of the app itself are answered with index.html.
+        with urlopen(f'http://{netloc}/sat?lat=33.95&lng=-117.39&zoom=17') as response:
+            assert response.read() == b'<html>geo</html>'
+    finally:
+        server.close()
@@ -0,0 +1,34 @@
+import io
+
+from PIL import Image
+
+from sirendb.jobs.imaging.variants import (
+    image_size,
+    make_variants,
+)
+
+
+def _png(width: int, height: int) -> bytes:
+    fp = io.BytesIO()
+    Image.new('RGB', (width, height), (200, 30, 30)).save(fp, 'PNG')
+    return fp.getvalue()
+
+
+def test_make_variants():
+    screenshot = _png(1080, 540)
+    assert image_size(screenshot) == (1080, 540)
+
+    variants = make_variants(screenshot, formats=('webp',), sizes=(200, 400, 2000))
+    assert [(variant.mimetype, variant.width, variant.height) for variant in variants] == [
+        ('image/webp', 1080, 540),
+        ('image/webp', 400, 200),
+        ('image/webp', 200, 100),
+    ]
+    for variant in variants:
+        assert variant.file_extension == 'webp'
+        assert image_size(variant.data) == (variant.width, variant.height)
+
+
+def test_unreadable_images_have_no_variants():
+    assert image_size(b'data') is None
+    assert make_variants(b'data', formats=('webp',), sizes=(200,)) == []
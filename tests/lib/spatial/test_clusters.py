@@ -0,0 +1,52 @@
+import numpy as np
+
+from sirendb.lib.spatial.clusters import (
+    build_clusters,
+    cluster_zoom,
+    unpack_clusters,
+)
+
+
+def test_clusters_cover_every_point():
+    rng = np.random.default_rng(2)
+    count = 2000
+    latitudes = rng.uniform(-80, 80, count)
+    longitudes = rng.uniform(-180, 180, count)
+
+    zooms = build_clusters(latitudes, longitudes, max_zoom=6)
+    assert sorted(zooms) == list(range(7))
+
+    for zoom, tiles in zooms.items():
+        total = 0
+        for (x, y), data in tiles.items():
+            assert 0 <= x < 2 ** zoom
+            assert 0 <= y < 2 ** zoom
+            clusters = unpack_clusters(data)
+            assert len(clusters) <= 16
+            total += int(clusters['count'].sum())
+        assert total == count
+
+
+def test_cluster_centroids():
+    latitudes = np.array([33.95, 33.96, 40.71])
+    longitudes = np.array([-117.39, -117.40, -74.00])
+
+    tiles = dict(cluster_zoom(latitudes, longitudes, zoom=0))
+    assert list(tiles) == [(0, 0)]
+
+    clusters = sorted(tiles[(0, 0)].tolist(), key=lambda cluster: cluster[2])
+    assert len(clusters) == 2
+    assert np.allclose(clusters[0][:2], (40.71, -74.00))
+    assert clusters[0][2] == 1
+    assert np.allclose(clusters[1][:2], (33.955, -117.395))
+    assert clusters[1][2] == 2
+
+    # Far enough in, every siren is its own cluster.
+    tiles = dict(cluster_zoom(latitudes, longitudes, zoom=12))
+    assert len(tiles) == 2
+    assert sorted(len(clusters) for clusters in tiles.values()) == [1, 2]
+    assert all((clusters['count'] == 1).all() for clusters in tiles.values())
+
+
+def test_no_clusters():
+    assert build_clusters([], [], max_zoom=2) == {0: {}, 1: {}, 2: {}}
@@ -0,0 +1,51 @@
+import numpy as np
+
+from sirendb.lib.spatial.grid import (
+    GridIndex,
+    haversine_km,
+)
+
+
+def _brute_force(latitude, longitude, siren_ids, latitudes, longitudes, k):
+    distances = haversine_km(latitude, longitude, latitudes, longitudes)
+    closest = {}
+    for index in np.argsort(distances, kind='stable'):
+        closest.setdefault(int(siren_ids[index]), float(distances[index]))
+    return list(closest.values())[:k]
+
+
+def test_nearest_matches_brute_force():
+    rng = np.random.default_rng(1)
+    count = 5000
+    latitudes = rng.uniform(-90, 90, count)
+    longitudes = rng.uniform(-180, 180, count)
+    location_ids = np.arange(count)
+    siren_ids = location_ids // 2
+
+    grid = GridIndex(location_ids, siren_ids, latitudes, longitudes, cell_degrees=1.0)
+
+    for _ in range(50):
+        latitude = rng.uniform(-90, 90)
+        longitude = rng.uniform(-180, 180)
+        k = int(rng.integers(1, 20))
+
+        neighbors = grid.nearest(latitude, longitude, k)
+        expected = _brute_force(latitude, longitude, siren_ids, latitudes, longitudes, k)
+        assert np.allclose([neighbor.kilometers for neighbor in neighbors], expected)
+        assert len({neighbor.siren_id for neighbor in neighbors}) == len(neighbors)
+
+
+def test_nearest_across_the_antimeridian():
+    grid = GridIndex(
+        location_ids=np.array([1, 2, 3]),
+        siren_ids=np.array([1, 2, 3]),
+        latitudes=np.array([0.0, 0.0, 45.0]),
+        longitudes=np.array([179.9, 170.0, -179.9]),
+    )
+
+    assert [neighbor.location_id for neighbor in grid.nearest(0.0, -179.9, 3)] == [1, 2, 3]
+
+
+def test_nearest_empty():
+    grid = GridIndex(np.array([]), np.array([]), np.array([]), np.array([]))
+    assert grid.nearest(0.0, 0.0, 5) == []
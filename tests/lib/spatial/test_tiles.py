@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+import numpy as np
+
+from sirendb.lib.spatial.tiles import (
+    pack_tile,
+    point_tiles,
+    tile_bounds,
+    tiles_containing,
+    unpack_tile,
+)
+
+
+def test_tile_bounds_contain_their_points():
+    rng = np.random.default_rng(3)
+    latitudes = rng.uniform(-90, 90, 1000)
+    longitudes = rng.uniform(-180, 180, 1000)
+
+    for zoom in (0, 3, 9):
+        xs, ys = point_tiles(latitudes, longitudes, zoom)
+        for latitude, longitude, x, y in zip(latitudes, longitudes, xs, ys):
+            west, south, east, north = tile_bounds(zoom, int(x), int(y))
+            assert west <= longitude <= east
+            assert south <= latitude <= north
+
+
+def test_tiles_containing():
+    tiles = list(tiles_containing(33.9533, -117.3962, max_zoom=3))
+    assert tiles == [(0, 0, 0), (1, 0, 0), (2, 0, 1), (3, 1, 3)]
+
+
+def test_pack_tile_round_trip():
+    data = pack_tile([1, 2], [10, 20], [33.9533, 40.7128], [-117.3962, -74.0060])
+    assert len(data) == 4 + 2 * 16
+
+    location_ids, siren_ids, latitudes, longitudes = unpack_tile(data)
+    assert location_ids.tolist() == [1, 2]
+    assert siren_ids.tolist() == [10, 20]
+    assert np.allclose(latitudes, [33.9533, 40.7128])
+    assert np.allclose(longitudes, [-117.3962, -74.0060])
+
+    assert [len(column) for column in unpack_tile(pack_tile([], [], [], []))] == [0, 0, 0, 0]
+
+
+def test_tile_cache_listeners_are_registered_with_the_models():
+    # Writers such as jobs and commands never import the API.
+    script = (
+        'import sys\n'
+        'import sqlalchemy as sa\n'
+        'from sirendb.models.siren_location import SirenLocation\n'
+        'from sirendb.lib.spatial import tiles\n'
+        'assert "sirendb.v1" not in sys.modules\n'
+        'assert sa.event.contains(SirenLocation, "after_insert", tiles._location_inserted)\n'
+        'assert sa.event.contains(SirenLocation, "after_update", tiles._location_updated)\n'
+        'assert sa.event.contains(SirenLocation, "after_delete", tiles._location_deleted)\n'
+        'assert sa.event.contains(sa.orm.Session, "after_commit", tiles._session_committed)\n'
+    )
+    subprocess.run([sys.executable, '-c', script], check=True)
@@ -1,6 +1,7 @@
 import pytest
 
 from sirendb.models.siren import Siren
+from sirendb.models.siren_location import SirenLocation
 from sirendb.models.siren_manufacturer import SirenManufacturer
 from sirendb.models.siren_model import SirenModel
 from sirendb.models.siren_system import SirenSystem
@@ -153,3 +154,6 @@ def test_create_siren_location(app, user_client, db):
             }
         }
     }
+
+    location = SirenLocation.query.filter_by(siren_id=siren.id).one()
+    assert Siren.query.get(siren.id).current_location_id == location.id
@@ -0,0 +1,98 @@
+from sirendb.lib.spatial import spatial_index
+from sirendb.models.siren import Siren
+from sirendb.models.siren_location import SirenLocation
+from sirendb.models.siren_model import SirenModel
+
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.v1.auth.fixtures',
+)
+
+
+NEAREST_QUERY = '''
+query nearestSirens($lat: Float!, $lng: Float!, $k: Int) {
+  nearestSirens(lat: $lat, lng: $lng, k: $k) {
+    id
+    sirenId
+  }
+}
+'''
+
+
+def test_nearest_sirens(app, user_client, db):
+    user, client = user_client
+
+    siren_model = SirenModel(name='3T22A', created_by_id=user.id)
+    db.session.add(siren_model)
+    db.session.commit()
+
+    coordinates = [
+        (33.9533, -117.3962),
+        (34.0522, -118.2437),
+        (40.7128, -74.0060),
+    ]
+    locations = []
+    for latitude, longitude in coordinates:
+        siren = Siren(model_id=siren_model.id, created_by_id=user.id)
+        db.session.add(siren)
+        db.session.commit()
+
+        location = SirenLocation(
+            siren_id=siren.id,
+            created_by_id=user.id,
+            satellite_latitude=latitude,
+            satellite_longitude=longitude,
+            satellite_zoom=17.0,
+        )
+        db.session.add(location)
+        db.session.commit()
+        locations.append(location)
+
+    spatial_index.refresh(full=True)
+
+    def nearest(**variables):
+        response = client.post(
+            '/api/v1/graphql',
+            json={
+                'query': NEAREST_QUERY,
+                'variables': variables,
+            }
+        )
+        assert response.status_code == 200
+        if 'errors' in response.json:
+            return response.json['errors'][0]['message']
+        return [item['id'] for item in response.json['data']['nearestSirens']]
+
+    assert nearest(lat=33.95, lng=-117.39, k=2) == [locations[0].id, locations[1].id]
+    assert nearest(lat=40.0, lng=-75.0, k=1) == [locations[2].id]
+    assert nearest(lat=40.0, lng=-75.0, k=0) == 'k must be between 1 and 100'
+    assert nearest(lat=91.0, lng=-75.0) == 'lat must be between -90 and 90'
+
+    # Moving a siren is picked up by the next refresh.
+    locations[2].satellite_latitude = 33.9
+    locations[2].satellite_longitude = -117.4
+    db.session.commit()
+    spatial_index.refresh()
+
+    assert nearest(lat=33.9, lng=-117.4, k=1) == [locations[2].id]
+
+    # Only the current location of a siren is indexed.
+    moved = SirenLocation(
+        siren_id=locations[0].siren_id,
+        created_by_id=user.id,
+        satellite_latitude=47.6062,
+        satellite_longitude=-122.3321,
+        satellite_zoom=17.0,
+    )
+    db.session.add(moved)
+    db.session.commit()
+    spatial_index.refresh()
+
+    assert nearest(lat=33.95, lng=-117.39, k=3) == [locations[2].id, locations[1].id, moved.id]
+
+    # So is deleting it, the previous location becomes current again.
+    db.session.delete(moved)
+    db.session.commit()
+    spatial_index.refresh()
+
+    assert nearest(lat=33.95, lng=-117.39, k=1) == [locations[0].id]
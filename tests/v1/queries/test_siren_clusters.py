@@ -0,0 +1,117 @@
+import pytest
+
+from sirendb.core.redis import redis
+from sirendb.jobs.clustering import (
+    REBUILD_PENDING_KEY,
+    enqueue_rebuild_clusters,
+)
+from sirendb.lib.spatial import (
+    CLUSTERS_BUILT_KEY,
+    store_clusters,
+)
+from sirendb.models.siren import Siren
+from sirendb.models.siren_location import SirenLocation
+from sirendb.models.siren_model import SirenModel
+
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.v1.auth.fixtures',
+)
+
+
+CLUSTERS_QUERY = '''
+query sirenClusters($zoom: Int!, $x: Int!, $y: Int!) {
+  sirenClusters(zoom: $zoom, x: $x, y: $y) {
+    latitude
+    longitude
+    count
+  }
+}
+'''
+
+
+def _add_sirens(user, db):
+    siren_model = SirenModel(name='3T22A', created_by_id=user.id)
+    db.session.add(siren_model)
+    db.session.commit()
+
+    for latitude, longitude in [
+        (33.9533, -117.3962),
+        (33.9633, -117.4062),
+        (40.7128, -74.0060),
+    ]:
+        siren = Siren(model_id=siren_model.id, created_by_id=user.id)
+        db.session.add(siren)
+        db.session.commit()
+
+        db.session.add(SirenLocation(
+            siren_id=siren.id,
+            created_by_id=user.id,
+            satellite_latitude=latitude,
+            satellite_longitude=longitude,
+            satellite_zoom=17.0,
+        ))
+        db.session.commit()
+
+
+def _clusters(client, **variables):
+    response = client.post(
+        '/api/v1/graphql',
+        json={
+            'query': CLUSTERS_QUERY,
+            'variables': variables,
+        }
+    )
+    assert response.status_code == 200
+    if 'errors' in response.json:
+        return response.json['errors'][0]['message']
+    return sorted(
+        (item['count'], item['latitude'], item['longitude'])
+        for item in response.json['data']['sirenClusters']
+    )
+
+
+def test_siren_clusters(app, user_client, db):
+    user, client = user_client
+    _add_sirens(user, db)
+
+    store_clusters()
+
+    def clusters(**variables):
+        return _clusters(client, **variables)
+
+    (new_york, riverside) = clusters(zoom=0, x=0, y=0)
+    assert new_york[0] == 1
+    assert riverside[0] == 2
+    assert riverside[1] == pytest.approx(33.9583, abs=1e-4)
+    assert riverside[2] == pytest.approx(-117.4012, abs=1e-4)
+
+    # Only the western tile holds the Riverside sirens.
+    assert [cluster[0] for cluster in clusters(zoom=2, x=0, y=1)] == [2]
+    assert clusters(zoom=2, x=3, y=3) == []
+
+    assert clusters(zoom=0, x=1, y=0) == 'x and y must be between 0 and 0 at zoom 0'
+    assert clusters(zoom=13, x=0, y=0) == 'zoom must be between 0 and 12'
+
+
+def test_unbuilt_clusters_are_rebuilt_in_the_background(app, user_client, db):
+    user, client = user_client
+    _add_sirens(user, db)
+
+    # Nothing is clustered during the request itself, the rebuild job runs
+    # inline here since RQ_ASYNC is off.
+    assert _clusters(client, zoom=0, x=0, y=0) == []
+    assert redis.get(CLUSTERS_BUILT_KEY) is not None
+    assert [cluster[0] for cluster in _clusters(client, zoom=0, x=0, y=0)] == [1, 2]
+
+
+def test_pending_rebuilds_are_not_enqueued_twice(app, db):
+    redis.set(REBUILD_PENDING_KEY, 1)
+    assert enqueue_rebuild_clusters() is None
+    assert redis.get(CLUSTERS_BUILT_KEY) is None
+
+    # Starting a rebuild lets the next write enqueue another one.
+    redis.delete(REBUILD_PENDING_KEY)
+    assert enqueue_rebuild_clusters() is not None
+    assert redis.get(REBUILD_PENDING_KEY) is None
+    assert redis.get(CLUSTERS_BUILT_KEY) is not None
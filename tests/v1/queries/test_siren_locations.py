@@ -2,6 +2,7 @@ from datetime import datetime
 
 from freezegun import freeze_time
 
+from sirendb.core.strawberry.cursor import encode_cursor
 from sirendb.models.siren import Siren
 from sirendb.models.siren_location import SirenLocation
 from sirendb.models.siren_manufacturer import SirenManufacturer
@@ -140,7 +141,7 @@ def test_list_siren_locations(app, user_client, db):
                 'count': 1,
                 'pageInfo': {
                     'hasNext': False,
-                    'lastCursor': str(siren_location.id),
+                    'lastCursor': encode_cursor('ID_ASC', siren_location.id, siren_location.id),
                 },
                 'items': [{
                     'installationTimestamp': '2021-04-03T06:13:09.291212',
@@ -174,3 +175,78 @@ def test_list_siren_locations(app, user_client, db):
             }
         }
     }
+
+
+GEO_QUERY = '''
+query listLocations($geo: GeoSearch) {
+  sirenLocations(geo: $geo) {
+    items {
+      id
+    }
+  }
+}
+'''
+
+
+def test_geo_search(app, user_client, db):
+    user, client = user_client
+
+    siren_model = SirenModel(name='3T22A', created_by_id=user.id)
+    db.session.add(siren_model)
+    db.session.commit()
+
+    siren = Siren(model_id=siren_model.id, created_by_id=user.id)
+    db.session.add(siren)
+    db.session.commit()
+
+    coordinates = {
+        'riverside': (33.9533, -117.3962),
+        'los_angeles': (34.0522, -118.2437),
+        'new_york': (40.7128, -74.0060),
+        'fiji': (-17.7134, 178.0650),
+        'samoa': (-13.7590, -172.1046),
+    }
+    locations = {}
+    for name, (latitude, longitude) in coordinates.items():
+        locations[name] = SirenLocation(
+            siren_id=siren.id,
+            created_by_id=user.id,
+            satellite_latitude=latitude,
+            satellite_longitude=longitude,
+            satellite_zoom=17.0,
+        )
+    db.session.add_all(locations.values())
+    db.session.commit()
+
+    def search(geo):
+        response = client.post(
+            '/api/v1/graphql',
+            json={
+                'query': GEO_QUERY,
+                'variables': {'geo': geo},
+            }
+        )
+        assert response.status_code == 200
+        if 'errors' in response.json:
+            return response.json['errors'][0]['message']
+        return {
+            name
+            for item in response.json['data']['sirenLocations']['items']
+            for name, location in locations.items()
+            if location.id == item['id']
+        }
+
+    southern_california = {'south': 32.5, 'west': -120.0, 'north': 35.0, 'east': -116.0}
+    assert search({'bbox': southern_california}) == {'riverside', 'los_angeles'}
+
+    # Crosses the antimeridian.
+    pacific = {'south': -20.0, 'west': 170.0, 'north': -10.0, 'east': -170.0}
+    assert search({'bbox': pacific}) == {'fiji', 'samoa'}
+
+    # Riverside to Los Angeles is roughly 84km.
+    riverside = {'latitude': 33.9533, 'longitude': -117.3962}
+    assert search({'radius': {**riverside, 'kilometers': 50}}) == {'riverside'}
+    assert search({'radius': {**riverside, 'kilometers': 100}}) == {'riverside', 'los_angeles'}
+
+    assert search({}) == 'geo expects exactly one of bbox or radius'
+    assert search({'radius': {**riverside, 'kilometers': 0}}) == 'radius kilometers must be greater than 0'
@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from sirendb.core.strawberry.cursor import encode_cursor
 from sirendb.models.siren_manufacturer import SirenManufacturer
 
 pytest_plugins = (
@@ -47,7 +48,7 @@ def test_list_siren_manufacturer(app, user_client, db):
                 'count': 1,
                 'pageInfo': {
                     'hasNext': False,
-                    'lastCursor': str(siren_manufacturer.id),
+                    'lastCursor': encode_cursor('ID_ASC', siren_manufacturer.id, siren_manufacturer.id),
                 },
                 'items': [{
                     'name': 'Test Siren Manufacturer'
@@ -99,7 +100,7 @@ def test_list_siren_manufacturer(app, user_client, db):
                 'count': 1,
                 'pageInfo': {
                     'hasNext': False,
-                    'lastCursor': str(siren_manufacturer.id),
+                    'lastCursor': encode_cursor('ID_ASC', siren_manufacturer.id, siren_manufacturer.id),
                 },
                 'items': [{
                     'name': 'Test Siren Manufacturer'
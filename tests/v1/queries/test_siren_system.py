@@ -1,3 +1,4 @@
+from sirendb.core.strawberry.cursor import encode_cursor
 from sirendb.models.siren_system import SirenSystem
 
 pytest_plugins = (
@@ -44,7 +45,7 @@ def test_list_siren_system(app, user_client, db):
                 'count': 1,
                 'pageInfo': {
                     'hasNext': False,
-                    'lastCursor': str(siren_system.id),
+                    'lastCursor': encode_cursor('ID_ASC', siren_system.id, siren_system.id),
                 },
                 'items': [{
                     'name': 'Test Siren System'
@@ -96,7 +97,7 @@ def test_list_siren_system(app, user_client, db):
                 'count': 1,
                 'pageInfo': {
                     'hasNext': False,
-                    'lastCursor': str(siren_system.id),
+                    'lastCursor': encode_cursor('ID_ASC', siren_system.id, siren_system.id),
                 },
                 'items': [{
                     'name': 'Test Siren System'
@@ -131,3 +132,32 @@ def test_list_siren_system(app, user_client, db):
             }
         }
     }
+
+    response = client.post(
+        '/api/v1/graphql',
+        json={
+            'query': LIST_QUERY,
+            'operationName': 'listSystems',
+            'variables': {
+                'sort': 'ID_ASC',
+                'filter': {
+                    'name': '*siren*'
+                }
+            }
+        }
+    )
+    assert response.status_code == 200
+    assert response.json == {
+        'data': {
+            'sirenSystems': {
+                'count': 1,
+                'pageInfo': {
+                    'hasNext': False,
+                    'lastCursor': encode_cursor('ID_ASC', siren_system.id, siren_system.id),
+                },
+                'items': [{
+                    'name': 'Test Siren System'
+                }]
+            }
+        }
+    }
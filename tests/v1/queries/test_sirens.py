@@ -1,5 +1,10 @@
+from sirendb.core.strawberry.cursor import encode_cursor
 from sirendb.models.siren import Siren
 from sirendb.models.siren_location import SirenLocation
+from sirendb.models.siren_media import (
+    SirenMedia,
+    SirenMediaType,
+)
 from sirendb.models.siren_model import SirenModel
 from sirendb.models.siren_system import SirenSystem
 
@@ -107,7 +112,7 @@ def test_list_siren(app, user_client, db):
                 'count': 1,
                 'pageInfo': {
                     'hasNext': False,
-                    'lastCursor': str(siren.id),
+                    'lastCursor': encode_cursor('ID_ASC', siren.id, siren.id),
                 },
                 'items': [{
                     'active': True,
@@ -175,7 +180,7 @@ def test_list_siren(app, user_client, db):
                 'count': 1,
                 'pageInfo': {
                     'hasNext': False,
-                    'lastCursor': str(siren.id),
+                    'lastCursor': encode_cursor('ID_ASC', siren.id, siren.id),
                 },
                 'items': [{
                     'active': True,
@@ -226,3 +231,159 @@ def test_list_siren(app, user_client, db):
             }
         }
     }
+
+
+LOCATIONS_QUERY = '''
+query listSirens {
+  sirens {
+    items {
+      id
+      currentLocation {
+        id
+        system {
+          name
+        }
+        media {
+          id
+        }
+      }
+      previousLocations {
+        id
+        media {
+          id
+        }
+      }
+    }
+  }
+}
+'''
+
+
+def test_locations_are_batched(app, user_client, db):
+    from datetime import datetime
+
+    from tests.core.strawberry.fixtures import count_statements
+
+    user, client = user_client
+
+    siren_model = SirenModel(name='3T22A', created_by_id=user.id)
+    db.session.add(siren_model)
+    db.session.commit()
+
+    def add_siren():
+        siren = Siren(created_by_id=user.id, model_id=siren_model.id, active=True)
+        db.session.add(siren)
+        db.session.commit()
+
+        # Every siren has a system of its own so none of them are cached.
+        system = SirenSystem(name=f'System {siren.id}', created_by_id=user.id)
+        db.session.add(system)
+        db.session.commit()
+
+        locations = [
+            SirenLocation(
+                siren_id=siren.id,
+                system_id=system.id,
+                created_by_id=user.id,
+                installation_timestamp=datetime(2020 + year, 1, 1),
+            )
+            for year in range(3)
+        ]
+        db.session.add_all(locations)
+        db.session.commit()
+
+        media = []
+        for location in locations:
+            original = SirenMedia(
+                media_type=SirenMediaType.SATELLITE_IMAGE,
+                filesystem_uri='filesystem://./images/original.png',
+                mimetype='image/png',
+                kilobytes=1,
+                location_id=location.id,
+            )
+            db.session.add(original)
+            db.session.commit()
+
+            # Variants are not media of the location itself.
+            db.session.add(SirenMedia(
+                media_type=SirenMediaType.SATELLITE_IMAGE,
+                filesystem_uri='filesystem://./images/variant.webp',
+                mimetype='image/webp',
+                kilobytes=1,
+                location_id=location.id,
+                variant_of_id=original.id,
+            ))
+            db.session.commit()
+            media.append(original)
+
+        return siren, system, locations, media
+
+    def list_sirens():
+        with count_statements(db) as statements:
+            response = client.post('/api/v1/graphql', json={'query': LOCATIONS_QUERY})
+        assert response.status_code == 200
+        selects = [statement for statement in statements if statement.lstrip().startswith('SELECT')]
+        location_selects = [statement for statement in selects if 'FROM siren_locations' in statement]
+        return response.json['data']['sirens']['items'], len(location_selects), len(selects)
+
+    sirens = [add_siren()]
+    _, single_siren_location_selects, single_siren_selects = list_sirens()
+
+    sirens.extend(add_siren() for _ in range(2))
+    items, location_selects, selects = list_sirens()
+
+    assert location_selects == single_siren_location_selects == 2
+    assert selects == single_siren_selects
+    assert items == [
+        {
+            'id': siren.id,
+            'currentLocation': {
+                'id': locations[2].id,
+                'system': {'name': system.name},
+                'media': [{'id': media[2].id}],
+            },
+            'previousLocations': [
+                {'id': locations[1].id, 'media': [{'id': media[1].id}]},
+                {'id': locations[0].id, 'media': [{'id': media[0].id}]},
+            ],
+        }
+        for siren, system, locations, media in sirens
+    ]
+
+
+def test_unselected_resolvers_do_not_query_per_siren(app, user_client, db):
+    from tests.core.strawberry.fixtures import count_statements
+
+    user, client = user_client
+
+    siren_model = SirenModel(name='3T22A', created_by_id=user.id)
+    db.session.add(siren_model)
+    db.session.commit()
+
+    def add_siren():
+        siren = Siren(created_by_id=user.id, model_id=siren_model.id, active=True)
+        db.session.add(siren)
+        db.session.commit()
+
+        location = SirenLocation(siren_id=siren.id, created_by_id=user.id)
+        db.session.add(location)
+        db.session.commit()
+        return siren
+
+    def list_sirens():
+        # currentLocation is resolved even though it is not selected, so the
+        # column it reads has to come with the page.
+        with count_statements(db) as statements:
+            response = client.post('/api/v1/graphql', json={'query': 'query { sirens { items { id } } }'})
+        assert response.status_code == 200
+        selects = [statement for statement in statements if statement.lstrip().startswith('SELECT')]
+        return response.json['data']['sirens']['items'], len(selects)
+
+    sirens = [add_siren()]
+    _, single_siren_selects = list_sirens()
+
+    sirens.extend(add_siren() for _ in range(4))
+    items, selects = list_sirens()
+
+    assert selects == single_siren_selects
+    assert items == [{'id': siren.id} for siren in sirens]
@@ -0,0 +1,100 @@
+import pytest
+
+from sirendb.lib.storage.filesystem import FilesystemBackend
+from sirendb.models.siren import Siren
+from sirendb.models.siren_location import SirenLocation
+from sirendb.models.siren_media import (
+    SirenMedia,
+    SirenMediaType,
+)
+from sirendb.models.siren_model import SirenModel
+from sirendb.v1 import media as media_module
+from sirendb.v1.media import pick_variant
+
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.v1.auth.fixtures',
+)
+
+
+@pytest.fixture
+def stored_media(user_client, db, monkeypatch, tmp_path):
+    user, _ = user_client
+
+    backend = FilesystemBackend({'path': str(tmp_path)})
+    monkeypatch.setattr(media_module, 'storage', backend)
+
+    siren_model = SirenModel(name='3T22A', created_by_id=user.id)
+    db.session.add(siren_model)
+    db.session.commit()
+
+    siren = Siren(model_id=siren_model.id, created_by_id=user.id)
+    db.session.add(siren)
+    db.session.commit()
+
+    location = SirenLocation(siren_id=siren.id, created_by_id=user.id)
+    db.session.add(location)
+    db.session.commit()
+
+    saved = backend.save(b'0123456789', 'png', 'image/png')
+    media = SirenMedia(
+        media_type=SirenMediaType.SATELLITE_IMAGE,
+        filename=saved.filesystem_key,
+        filesystem_uri=saved.filesystem_uri,
+        mimetype='image/png',
+        kilobytes=10 / 1024,
+        location_id=location.id,
+    )
+    db.session.add(media)
+    db.session.commit()
+
+    yield media
+
+
+def test_pick_variant(app):
+    original = SirenMedia(mimetype='image/png', width=1080, height=1080, kilobytes=900)
+    webp = SirenMedia(mimetype='image/webp', width=1080, height=1080, kilobytes=90, variant_of=original)
+    small = SirenMedia(mimetype='image/webp', width=200, height=200, kilobytes=8, variant_of=original)
+    medium = SirenMedia(mimetype='image/webp', width=400, height=400, kilobytes=25, variant_of=original)
+
+    assert pick_variant(original, 150, 'webp') is small
+    assert pick_variant(original, 200, None) is small
+    assert pick_variant(original, 300, 'webp') is medium
+    assert pick_variant(original, 2000, 'webp') is webp
+    assert pick_variant(original, None, 'webp') is webp
+    assert pick_variant(original, None, 'png') is original
+    assert pick_variant(small, 1000, 'avif') is webp
+
+
+def test_get_media(app, user_client, stored_media):
+    _, client = user_client
+
+    response = client.get(f'/media/{stored_media.filename}')
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert response.data == b'0123456789'
+
+    response = client.get(f'/media/{stored_media.filename}', headers={'Range': 'bytes=2-5'})
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == 'bytes 2-5/10'
+    assert response.data == b'2345'
+
+
+def test_get_media_accel_redirect(app, user_client, stored_media, monkeypatch):
+    _, client = user_client
+    monkeypatch.setitem(app.config, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+
+    response = client.get(f'/media/{stored_media.filename}')
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+    assert response.headers['X-Accel-Redirect'] == f'/protected-media/{stored_media.filename}.png'
+    assert response.data == b''
+
+
+def test_get_missing_media(app, user_client, stored_media):
+    _, client = user_client
+
+    media_module.storage.delete(stored_media.filesystem_uri)
+    assert client.get(f'/media/{stored_media.filename}').status_code == 404
+    assert client.get('/media/missing').status_code == 404
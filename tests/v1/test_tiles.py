@@ -0,0 +1,56 @@
+from sirendb.core.redis import redis
+from sirendb.lib.spatial.tiles import unpack_tile
+from sirendb.models.siren import Siren
+from sirendb.models.siren_location import SirenLocation
+from sirendb.models.siren_model import SirenModel
+
+pytest_plugins = (
+    'tests.fixtures',
+    'tests.v1.auth.fixtures',
+)
+
+
+def test_get_tile(app, user_client, db):
+    user, client = user_client
+
+    siren_model = SirenModel(name='3T22A', created_by_id=user.id)
+    db.session.add(siren_model)
+    db.session.commit()
+
+    siren = Siren(model_id=siren_model.id, created_by_id=user.id)
+    db.session.add(siren)
+    db.session.commit()
+
+    location = SirenLocation(
+        siren_id=siren.id,
+        created_by_id=user.id,
+        satellite_latitude=33.9533,
+        satellite_longitude=-117.3962,
+        satellite_zoom=17.0,
+    )
+    db.session.add(location)
+    db.session.commit()
+
+    def tile(zoom, x, y):
+        response = client.get(f'/tiles/{zoom}/{x}/{y}.bin')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/octet-stream'
+        location_ids, siren_ids, _, _ = unpack_tile(response.data)
+        return location_ids.tolist(), siren_ids.tolist()
+
+    assert tile(0, 0, 0) == ([location.id], [siren.id])
+    assert tile(3, 1, 3) == ([location.id], [siren.id])
+    assert tile(3, 2, 3) == ([], [])
+    assert redis.get('siren_tile:3:1:3') is not None
+
+    # Moving the location drops the cached tiles it moved between.
+    location.satellite_latitude = 40.7128
+    location.satellite_longitude = -74.0060
+    db.session.commit()
+    assert redis.get('siren_tile:3:1:3') is None
+
+    assert tile(3, 1, 3) == ([], [])
+    assert tile(3, 2, 3) == ([location.id], [siren.id])
+
+    assert client.get('/tiles/3/8/0.bin').status_code == 404
+    assert client.get('/tiles/15/0/0.bin').status_code == 404